@@ -1,10 +1,25 @@
 import streamlit as st
-import pandas as pd
 import datetime
-import re
 import os
-import base64
-from streamlit_gsheets import GSheetsConnection
+from synchronotron import profiling
+profiling.begin_trace()
+with profiling.startup("import pandas"): import pandas as pd
+with profiling.startup("import streamlit_gsheets"): from streamlit_gsheets import GSheetsConnection
+from synchronotron import assets, kin_engine, render, reverse
+from synchronotron.data import DataRegistry
+from synchronotron.contacts import ContactsRepository, ContactsConflict, GSheetsBackend, CONTACT_COLUMNS, DEFAULT_TTL
+from synchronotron.contact_index import ContactIndex
+from synchronotron.importer import import_contacts, prepare_contacts
+from synchronotron.blueprint import BlueprintStore
+from synchronotron.board import PARTICLE_WHITE_IMG, PARTICLE_BLACK_IMG
+from synchronotron.relationships import RELATIONS, RELATION_NAMES
+from synchronotron.core import (
+    calculate_kin_num, get_kin_details, calculate_relationship,
+    get_journey_earth_heaven, get_journey_warrior, get_telektonon_info, parse_date_safe
+)
+from synchronotron.constants import (
+    TONES_NAME, SEALS_NAME, SEAL_COLORS, MOON_NAMES, CASTLES_INFO
+)
 
 # ==========================================
 # 1. 系統設定與常數
@@ -15,401 +30,58 @@ st.set_page_config(
     layout="wide"
 )
 
-TONES_NAME = ["", "磁性", "月亮", "電力", "自我存在", "超頻", "韻律", "共鳴", "銀河星系", "太陽", "行星", "光譜", "水晶", "宇宙"]
-SEALS_NAME = ["", "紅龍", "白風", "藍夜", "黃種子", "紅蛇", "白世界橋", "藍手", "黃星星", "紅月", "白狗", "藍猴", "黃人", "紅天行者", "白巫師", "藍鷹", "黃戰士", "紅地球", "白鏡", "藍風暴", "黃太陽"]
-SEAL_COLORS = {
-    1: 'red', 2: 'white', 3: 'blue', 4: 'yellow',
-    5: 'red', 6: 'white', 7: 'blue', 8: 'yellow',
-    9: 'red', 10: 'white', 11: 'blue', 12: 'yellow',
-    13: 'red', 14: 'white', 15: 'blue', 16: 'yellow',
-    17: 'red', 18: 'white', 19: 'blue', 20: 'yellow'
-}
-
-MOON_NAMES = ["", "磁性之月", "月亮之月", "電力之月", "自我存在之月", "超頻之月", "韻律之月", "共鳴之月", "銀河星系之月", "太陽之月", "行星之月", "光譜之月", "水晶之月", "宇宙之月"]
-
-TONE_QUESTIONS = {
-    "磁性": "我的目的是什麼？", "月亮": "我的挑戰是什麼？", "電力": "我如何給予最佳的服務？",
-    "自我存在": "我該以什麼形式來服務他人？", "超頻": "我如何能讓自己獲得最佳的力量？",
-    "韻律": "我如何與他人擴大平等？", "共鳴": "我如何使我的服務與他人協調融合？",
-    "銀河星系": "我是否活出我所相信的？", "太陽": "我如何完成我的目的？",
-    "行星": "我如何完美我所做的？", "光譜": "我該如何釋放與放下？",
-    "水晶": "我如何全心的奉獻予所有的生命？", "宇宙": "我如何活在當下？"
-}
-
-HEPTAD_GATE_INFO = {
-    1: {"plasma": "Dali", "gate": "第 1 門", "name": "ALPHA-ALPHA", "bmu": 108, "pos": "V11:H2", "chakra": "頂輪", "sphere": "第1精神球體 (前意識)", "desc": "啟動前意識，儲存超感官資訊"},
-    2: {"plasma": "Seli", "gate": "第 2 門", "name": "ALPHA-BETA", "bmu": 291, "pos": "V11:H5", "chakra": "海底輪", "sphere": "第2精神球體 (潛意識)", "desc": "啟動潛意識，轉化被潛抑的資訊"},
-    3: {"plasma": "Gamma", "gate": "第 3 門", "name": "BETA-BETA", "bmu": 144, "pos": "V11:H17", "chakra": "眉心輪", "sphere": "第3精神球體 (清醒意識)", "desc": "啟動清醒意識，穩定認知反應"},
-    4: {"plasma": "Kali", "gate": "第 4 門", "name": "BETA-ALPHA", "bmu": 315, "pos": "V11:H4", "chakra": "臍輪", "sphere": "第4精神球體 (持續意識)", "desc": "啟動持續意識，轉化高我智慧"},
-    5: {"plasma": "Alpha", "gate": "第 5 門", "name": "High Electron", "bmu": 414, "pos": "V11:H14", "chakra": "喉輪", "sphere": "第5精神球體 (超意識)", "desc": "啟動超意識，接收心電感應程式"},
-    6: {"plasma": "Limi", "gate": "第 6 門", "name": "High Neutron", "bmu": 402, "pos": "V11:H8", "chakra": "太陽神經叢", "sphere": "第6精神球體 (閾下意識)", "desc": "啟動閾下意識，處理跨次元信號"},
-    7: {"plasma": "Silio", "gate": "第 7 門", "name": "Sirius B-52", "bmu": 441, "pos": "V11:H11", "chakra": "心輪", "sphere": "第7精神球體 (全息心智感知體)", "desc": "啟動 HMP 核心，連結 441 矩陣"}
-}
-
-CASTLES_INFO = {
-    "紅色東方啟動城堡": {"range": "Kin 1-52", "color_bg": "#FFCCCB", "court": "出生之庭", "theme": "啟動與開創", "desc": "適合發起新事物的起始開創課題。", "img": "assets/tokens/pyramid_red.png"},
-    "白色北方跨越城堡": {"range": "Kin 53-104", "color_bg": "#F0F3F4", "court": "死亡之庭", "theme": "跨越與淨化", "desc": "透過淨化與斷捨離，跨越舊有。", "img": "assets/tokens/pyramid_white.png"},
-    "藍色西方蛻變城堡": {"range": "Kin 105-156", "color_bg": "#D6EAF8", "court": "魔法之庭", "theme": "改變與轉化", "desc": "轉化能量，經歷如同蛇蛻皮般的重生。", "img": "assets/tokens/pyramid_blue.png"},
-    "黃色南方給予城堡": {"range": "Kin 157-208", "color_bg": "#FCF3CF", "court": "智能之庭", "theme": "收穫與給予", "desc": "享受成果，分享智慧。", "img": "assets/tokens/pyramid_yellow.png"},
-    "綠色中央魔法城堡": {"range": "Kin 209-260", "color_bg": "#D5F5E3", "court": "共時之庭", "theme": "共時與魔法", "desc": "協調人類與銀河意識。", "img": "assets/tokens/pyramid_green.png"}
-}
-
-# 行星軌道映射 (左GK / 右SP)
-TELEKTONON_MAP = {
-    1: {"planet": "海王星", "flow": "GK (吸入)", "circuit": "C2 記憶-本能", "pos": "左邊 (Left) - 軌道2"},
-    2: {"planet": "天王星", "flow": "GK (吸入)", "circuit": "C3 生物心電感應", "pos": "左邊 (Left) - 軌道3"},
-    3: {"planet": "土星", "flow": "GK (吸入)", "circuit": "C4 吸收智能", "pos": "左邊 (Left) - 軌道4"},
-    4: {"planet": "木星", "flow": "GK (吸入)", "circuit": "C5 內在原子", "pos": "左邊 (Left) - 軌道5"},
-    5: {"planet": "馬爾代克", "flow": "GK (吸入)", "circuit": "C5 內在原子", "pos": "左邊 (Left) - 軌道5 (內)"},
-    6: {"planet": "火星", "flow": "GK (吸入)", "circuit": "C4 吸收智能", "pos": "左邊 (Left) - 軌道4 (內)"},
-    7: {"planet": "地球", "flow": "GK (吸入)", "circuit": "C3 生物心電感應", "pos": "左邊 (Left) - 軌道3 (內)"},
-    8: {"planet": "金星", "flow": "GK (吸入)", "circuit": "C2 記憶-本能", "pos": "左邊 (Left) - 軌道2 (內)"},
-    9: {"planet": "水星", "flow": "GK (吸入)", "circuit": "C1 Alpha-Omega", "pos": "左邊 (Left) - 軌道1 (內)"},
-    10: {"planet": "水星", "flow": "SP (呼出)", "circuit": "C1 Alpha-Omega", "pos": "右邊 (Right) - 軌道1 (內)"},
-    11: {"planet": "金星", "flow": "SP (呼出)", "circuit": "C2 記憶-本能", "pos": "右邊 (Right) - 軌道2 (內)"},
-    12: {"planet": "地球", "flow": "SP (呼出)", "circuit": "C3 生物心電感應", "pos": "右邊 (Right) - 軌道3 (內)"},
-    13: {"planet": "火星", "flow": "SP (呼出)", "circuit": "C4 吸收智能", "pos": "右邊 (Right) - 軌道4 (內)"},
-    14: {"planet": "馬爾代克", "flow": "SP (呼出)", "circuit": "C5 內在原子", "pos": "右邊 (Right) - 軌道5 (內)"},
-    15: {"planet": "木星", "flow": "SP (呼出)", "circuit": "C5 內在原子", "pos": "右邊 (Right) - 軌道5"},
-    16: {"planet": "土星", "flow": "SP (呼出)", "circuit": "C4 吸收智能", "pos": "右邊 (Right) - 軌道4"},
-    17: {"planet": "天王星", "flow": "SP (呼出)", "circuit": "C3 生物心電感應", "pos": "右邊 (Right) - 軌道3"},
-    18: {"planet": "海王星", "flow": "SP (呼出)", "circuit": "C2 記憶-本能", "pos": "右邊 (Right) - 軌道2"},
-    19: {"planet": "冥王星", "flow": "SP (呼出)", "circuit": "C1 Alpha-Omega", "pos": "右邊 (Right) - 軌道1"},
-    20: {"planet": "冥王星", "flow": "GK (吸入)", "circuit": "C1 Alpha-Omega", "pos": "左邊 (Left) - 軌道1 (0/20)"}
-}
-
-WARRIOR_JOURNEY = {
-    7: "神性之源 (意志)", 8: "靈性 (呼吸)", 9: "豐盛 (夢想)", 10: "開花 (覺察)",
-    11: "生命力 (本能)", 12: "死亡 (機會)", 13: "完成 (療癒)", 14: "藝術 (美麗)",
-    15: "淨化 (也就是)", 16: "愛 (忠誠)", 17: "魔法 (遊戲)", 18: "自由意志 (智慧)",
-    19: "預言 (覺醒)", 20: "永恆 (接受)", 21: "自生 (能量)", 22: "開悟 (宇宙之火)"
-}
-
-EARTH_JOURNEY = {
-    1: "建立銀河業力流 (GK) - 實踐之塔底部", 2: "建立銀河業力流 (GK) - 實踐之塔中部", 3: "建立銀河業力流 (GK) - 實踐之塔頂部",
-    4: "建立太陽預言流 (SP) - 智慧之塔底部", 5: "建立太陽預言流 (SP) - 智慧之塔中部", 6: "建立太陽預言流 (SP) - 智慧之塔頂部"
-}
-
-HEAVEN_JOURNEY = {
-    23: "情人重聚日 - 國王與皇后相遇",
-    24: "拆除太陽預言流 (SP) - 智慧之塔頂部", 25: "拆除太陽預言流 (SP) - 智慧之塔中部", 26: "拆除太陽預言流 (SP) - 智慧之塔底部",
-    27: "拆除銀河業力流 (GK) - 實踐之塔頂部", 28: "拆除銀河業力流 (GK) - 實踐之塔中部"
-}
-
 # ==========================================
 # 2. 資料載入層 (Data Layer)
 # ==========================================
-@st.cache_data
+# 只剩 Streamlit 專屬的快取包裝；資料與計算都在 synchronotron 套件 (可單獨匯入，無副作用)
+@st.cache_resource
 def load_data():
-    data = {}
-    files = {
-        'start_year': "data/kin_start_year.csv",
-        'month_accum': "data/month_day_accum.csv",
-        'kin_info': "data/kin_basic_info.csv",
-        'psi': "data/PSI印記對照表.csv",
-        'plasma': "data/Heptad_Gate_Path.csv",
-        'white_turtle': "data/White_Turtle_Day.csv",
-        'week_keyword': "data/瑪亞週關鍵句.csv",
-        'date_to_matrix': "data/瑪雅生日對時間矩陣對照表.csv",
-        'base_matrix': "data/Base_Matrix_441.csv",
-        'tzolkin_matrix': "data/Tzolkin_Matrix.csv",
-        'iching': "data/銀河易經編碼.csv",
-        'time_matrix': "data/Time_Matrix.csv",
-        'space_matrix': "data/Space_Matrix.csv",
-        'synchronic_matrix': "data/Synchronic_Matrix.csv"
-    }
-    for key, filename in files.items():
-        try:
-            if os.path.exists(filename):
-                df = pd.read_csv(filename)
-                if len(df.columns) > 0 and ("Unnamed" in str(df.columns[0]) or "Unnamed" in str(df.columns[1])):
-                     df = pd.read_csv(filename, header=1)
-                df.columns = [str(c).strip() for c in df.columns]
-                data[key] = df
-            else: data[key] = None
-        except: data[key] = None
-
-    if data['start_year'] is not None:
-        data['start_year_dict'] = dict(zip(data['start_year']['年份'], data['start_year']['起始KIN']))
-    if data['month_accum'] is not None:
-        data['month_accum_dict'] = dict(zip(data['month_accum']['月份'], data['month_accum']['累積天數']))
-    
-    data['harmonic_map'] = {}
-    if data['iching'] is not None:
-        for _, row in data['iching'].iterrows():
-            try:
-                match = re.search(r'諧波(\d+)', str(row.get('諧波', '')))
-                if match: data['harmonic_map'][int(match.group(1))] = row.to_dict()
-            except: continue
-    return data
+    # 各資料集在第一次使用時才讀檔 (見 synchronotron.data.DATASETS)，跨 rerun 共用同一份
+    return DataRegistry()
 
 # --- Google Sheets 資料庫 ---
-def load_contacts_db():
+@st.cache_resource
+def get_contacts_repo():
+    # 通訊錄快取跨 rerun 共用；TTL 可用環境變數 CONTACTS_CACHE_TTL (秒) 調整
     conn = st.connection("gsheets", type=GSheetsConnection)
+    ttl = int(os.environ.get("CONTACTS_CACHE_TTL", DEFAULT_TTL))
+    return ContactsRepository(GSheetsBackend(conn, worksheet="contacts"), ttl=ttl)
+
+@st.cache_resource(max_entries=4)
+def get_contact_index(_repo, version):
+    # 通訊錄內容沒變 (version 相同) 就沿用同一份 調性/圖騰 欄位與篩選索引
+    return ContactIndex.from_frame(_repo.all())
+
+def load_contacts_db():
+    repo = get_contacts_repo()
     try:
-        df = conn.read(worksheet="contacts", ttl=0)
-        if '生日' in df.columns: df['生日'] = df['生日'].astype(str)
-        return conn, df
+        repo.all()
+        return repo, get_contact_index(repo, repo.version)
     except:
-        return conn, pd.DataFrame(columns=["姓名", "生日", "KIN"])
-
-def save_contact(conn, df, name, birth_date, kin_num):
-    new_data = pd.DataFrame([{"姓名": name, "生日": str(birth_date), "KIN": int(kin_num)}])
-    updated_df = pd.concat([df, new_data], ignore_index=True)
-    conn.update(worksheet="contacts", data=updated_df)
-    return updated_df
-
-def parse_date_safe(date_input):
-    if not date_input: return None
-    if isinstance(date_input, datetime.date): return date_input
-    if isinstance(date_input, datetime.datetime): return date_input.date()
-    date_str = str(date_input).strip()
-    try:
-        if " " in date_str: date_str = date_str.split(" ")[0]
-        date_str = date_str.replace('/', '-')
-        parts = date_str.split('-')
-        if len(parts) == 3: return datetime.date(int(parts[0]), int(parts[1]), int(parts[2]))
-    except: pass
-    return None
-
-def get_kin_summary(kin_num):
-    if not kin_num or pd.isna(kin_num): return "", ""
-    try:
-        k = int(float(kin_num))
-        t = (k - 1) % 13 + 1
-        s = (k - 1) % 20 + 1
-        return TONES_NAME[t], SEALS_NAME[s]
-    except: return "", ""
-
-def enrich_contacts_with_details(df):
-    if df.empty: return df
-    df = df.copy()
-    df['調性'] = df['KIN'].apply(lambda x: get_kin_summary(x)[0])
-    df['圖騰'] = df['KIN'].apply(lambda x: get_kin_summary(x)[1])
-    return df
+        return repo, ContactIndex.from_frame(pd.DataFrame(columns=CONTACT_COLUMNS))
+
+# 效能量測：包裝既有函式 (計時 + 計數)，顯示在側欄 ⏱️ 效能面板；設定 SYNC_TRACE_FILE 時寫成 JSONL
+load_data = profiling.timed("load_data")(load_data)
+load_contacts_db = profiling.timed("load_contacts_db")(load_contacts_db)
+profiling.instrument(DataRegistry, "_load", "資料集讀檔")
+for _method in ("read_all", "append_rows", "update_rows", "delete_rows"):
+    profiling.instrument(GSheetsBackend, _method, f"GSheets {_method}")
+profiling.instrument(assets, "data_uri", "base64 data URI", size=len)
+profiling.instrument(assets, "thumbnail_bytes", "縮圖", size=len)
+profiling.watch_cache("縮圖", assets.thumbnail)
+profiling.watch_cache("data URI", assets._data_uri)
+profiling.watch_cache("靜態檔網址", assets._static_url)
+profiling.watch_cache("神諭 + 波符 HTML", render.analysis_html)
+profiling.watch_cache("波符 HTML", render.wavespell_html)
 
 DB = load_data()
+# 啟用 server.enableStaticServing (.streamlit/config.toml) 時圖片改走 app/static 的內容雜湊網址與 sprite
+if assets.use_static(st.get_option("server.enableStaticServing")): render.cache_clear()
 
 # ==========================================
 # 3. 邏輯核心層
 # ==========================================
-
-def find_kin_num(tone, seal):
-    for k in range(1, 261):
-        if (k-1)%13+1 == tone and (k-1)%20+1 == seal: return k
-    return 0
-
-def calculate_kin_num(year, month, day, db):
-    if db['start_year'] is None: return None
-    start_kin = db['start_year_dict'].get(year)
-    if not start_kin: return None
-    accum = db['month_accum_dict'].get(month, 0)
-    total = start_kin + accum + day
-    kin = total % 260
-    return 260 if kin == 0 else kin
-
-def get_kin_details(kin_num, db):
-    if not kin_num or db['kin_info'] is None: return {}
-    row = db['kin_info'][db['kin_info']['KIN'] == kin_num]
-    if not row.empty: return row.iloc[0].to_dict()
-    t = (kin_num - 1) % 13 + 1
-    s = (kin_num - 1) % 20 + 1
-    return {'KIN': kin_num, '主印記': f"{TONES_NAME[t]}{SEALS_NAME[s]}", '圖騰': SEALS_NAME[s], '波符': '', '城堡': ''}
-
-def calculate_oracle(kin_num, db):
-    if not kin_num: return None
-    t = (kin_num - 1) % 13 + 1
-    s = (kin_num - 1) % 20 + 1
-    s_ana = (19 - s); 
-    if s_ana <= 0: s_ana += 20
-    s_anti = (s + 10) % 20
-    if s_anti == 0: s_anti = 20
-    s_occ = (21 - s)
-    if s_occ <= 0: s_occ += 20
-    t_occ = 14 - t
-    s_guide = s
-    if t in [2,7,12]: s_guide = (s + 12) % 20
-    elif t in [3,8,13]: s_guide = (s + 4) % 20
-    elif t in [4,9]: s_guide = (s - 4)
-    elif t in [5,10]: s_guide = (s + 8) % 20
-    if s_guide <= 0: s_guide += 20
-    if s_guide == 0: s_guide = 20
-    return {
-        'main': get_kin_details(kin_num, db),
-        'analog': get_kin_details(find_kin_num(t, s_ana), db),
-        'antipode': get_kin_details(find_kin_num(t, s_anti), db),
-        'occult': get_kin_details(find_kin_num(t_occ, s_occ), db),
-        'guide': get_kin_details(find_kin_num(t, s_guide), db)
-    }
-
-def get_psi_kin(date_obj, main_kin_num, db):
-    m, d = date_obj.month, date_obj.day
-    if m == 7 and d == 25: return main_kin_num, "無時間日"
-    query = f"{m}月{d}日"
-    if db['psi'] is not None:
-        row = db['psi'][db['psi']['月日'] == query]
-        if row.empty:
-            query2 = f"{m:02d}月{d:02d}日"
-            row = db['psi'][db['psi']['國曆生日'] == query2]
-        if not row.empty:
-            try: return int(row.iloc[0]['PSI印記']), "PSI資料庫"
-            except: pass
-    return None, "未知"
-
-def calculate_goddess_force(oracle_data, db):
-    if not oracle_data: return None
-    kins = [oracle_data[k]['KIN'] for k in ['main', 'analog', 'antipode', 'occult', 'guide']]
-    tones = [(k - 1) % 13 + 1 for k in kins]
-    seals = [(k - 1) % 20 + 1 for k in kins]
-    final_tone = (sum(tones) - 1) % 13 + 1
-    final_seal = (sum(seals) - 1) % 20 + 1
-    return get_kin_details(find_kin_num(final_tone, final_seal), db)
-
-def get_13moon_date(date_obj):
-    year = date_obj.year
-    start_date = datetime.date(year, 7, 26)
-    if date_obj < start_date: start_date = datetime.date(year - 1, 7, 26)
-    delta = (date_obj - start_date).days
-    if delta == 364: return "Day Out of Time", 0, 0, 0
-    moon = (delta // 28) + 1
-    day = (delta % 28) + 1
-    heptad_week = (delta // 7) + 1
-    return f"{moon}.{day}", moon, day, heptad_week
-
-def calculate_flow_year_kin(birth_date, db, ref_date=None):
-    if ref_date is None: ref_date = datetime.date.today()
-    this_year_bday = datetime.date(ref_date.year, birth_date.month, birth_date.day)
-    target_year = ref_date.year if ref_date >= this_year_bday else ref_date.year - 1
-    flow_kin_num = calculate_kin_num(target_year, birth_date.month, birth_date.day, db)
-    return target_year, get_kin_details(flow_kin_num, db)
-
-def get_daily_energy(moon, day, db):
-    info = {}
-    if db['plasma'] is not None:
-        row = db['plasma'][db['plasma']['第幾天'] == day]
-        if not row.empty: info['plasma'] = row.iloc[0].to_dict()
-    if db['week_keyword'] is not None:
-        week_idx = (day - 1) // 7
-        weeks = ['紅色啟動之週', '白色淨化之週', '藍色蛻變之週', '黃色收穫之週']
-        if 0 <= week_idx < 4:
-            w_name = weeks[week_idx]
-            row = db['week_keyword'][db['week_keyword']['瑪雅週'] == w_name]
-            if not row.empty: info['week'] = row.iloc[0].to_dict()
-    return info
-
-def calculate_today_kin(selected_date, db):
-    kin = calculate_kin_num(selected_date.year, selected_date.month, selected_date.day, db)
-    return selected_date, get_kin_details(kin, db)
-
-def calculate_relationship(kin1, kin2, db):
-    if not kin1 or not kin2: return None
-    combined_kin_num = (kin1 + kin2 - 1) % 260 + 1
-    t1 = (kin1 - 1) % 13 + 1; s1 = (kin1 - 1) % 20 + 1
-    t2 = (kin2 - 1) % 13 + 1; s2 = (kin2 - 1) % 20 + 1
-    combined_tone = (t1 + t2 - 1) % 13 + 1
-    combined_seal = (s1 + s2 - 1) % 20 + 1
-    return {'KIN': combined_kin_num, 'info': get_kin_details(combined_kin_num, db), 'tone_sum': combined_tone, 'seal_sum': combined_seal}
-
-def get_journey_earth_heaven(day):
-    if 1 <= day <= 6:
-        step = EARTH_JOURNEY.get(day, "建立基地")
-        return f"🌍 地球之旅 (Day {day})", step, ["assets/tokens/turtle_yellow.png", "assets/tokens/turtle_white.png"], "黃上白下 (頭右)"
-    elif 7 <= day <= 22:
-        return f"🛤️ 分道揚鑣 (Day {day})", "黃烏龜：繼續前進 / 白烏龜：Day 6 原地等待", ["assets/tokens/turtle_yellow.png", "assets/tokens/turtle_white.png"], "分開行動"
-    elif 23 <= day <= 28:
-        heaven_step = HEAVEN_JOURNEY.get(day, "返回天堂")
-        return f"☁️ 天堂之旅 (Day {day})", heaven_step, ["assets/tokens/turtle_yellow.png", "assets/tokens/turtle_white.png"], "肩並肩 (黃左白右, 頭左)"
-    return "無時間日", "自由", [], ""
-
-def get_journey_warrior(day):
-    if 7 <= day <= 22:
-        warrior_step = WARRIOR_JOURNEY.get(day, "奪回力量")
-        return f"⚔️ 戰士立方體之旅 (Day {day})", warrior_step, "assets/tokens/turtle_green.png"
-    return None, None, None
-
-def get_telektonon_info(seal_idx):
-    return TELEKTONON_MAP.get(seal_idx, {})
-
-def get_heptad_gate_info(day):
-    week_day = (day - 1) % 7 + 1
-    return HEPTAD_GATE_INFO.get(week_day, {})
-
-def calculate_synchronotron_data(date_obj, main_kin, db):
-    logs = []
-    m, d = date_obj.month, date_obj.day
-    q = f"{m:02d}/{d:02d}"
-    pos_1 = None
-    if db['date_to_matrix'] is not None:
-        row = db['date_to_matrix'][db['date_to_matrix']['月日'] == q]
-        if not row.empty: pos_1 = row.iloc[0]['時間矩陣位置']
-        elif m==7 and d==25: pos_1 = "V11:H11"
-    if not pos_1: return None, ["無法定位生辰座標"]
-
-    def get_val(key, pos):
-        if db[key] is None or not pos: return 0
-        df = db[key]
-        try: 
-            r = df[df['矩陣位置'].astype(str).str.strip() == str(pos).strip()]
-            if not r.empty: return int(r.iloc[0]['KIN'])
-        except: pass
-        return 0
-    
-    def get_pos(key, k):
-        if db[key] is None: return None
-        df = db[key]
-        try:
-            r = df[df['KIN'] == k]
-            if not r.empty: return r.iloc[0]['矩陣位置']
-        except: pass
-        return None
-
-    v_t1 = get_val('time_matrix', pos_1)
-    v_s1 = get_val('space_matrix', pos_1)
-    v_sy1 = get_val('synchronic_matrix', pos_1)
-    sum_1 = v_t1 + v_s1 + v_sy1
-    logs.append(f"1. 時間矩陣座標 {pos_1} → {v_t1} + {v_s1} + {v_sy1} = {sum_1}")
-    
-    pos_2 = get_pos('space_matrix', main_kin)
-    v_t2 = get_val('time_matrix', pos_2)
-    v_s2 = main_kin
-    v_sy2 = get_val('synchronic_matrix', pos_2)
-    sum_2 = v_t2 + v_s2 + v_sy2
-    logs.append(f"2. 空間矩陣座標 {pos_2} → {v_t2} + {v_s2} + {v_sy2} = {sum_2}")
-    
-    pos_3 = get_pos('tzolkin_matrix', main_kin)
-    v_t3 = get_val('time_matrix', pos_3)
-    v_s3 = get_val('space_matrix', pos_3)
-    v_sy3 = main_kin
-    sum_3 = v_t3 + v_s3 + v_sy3
-    logs.append(f"3. 共時矩陣座標 {pos_3} → {v_t3} + {v_s3} + {v_sy3} = {sum_3}")
-    
-    mcf = sum_1 + sum_2 + sum_3
-    bmu = (mcf - 1) % 441 + 1
-    kin_equiv = (mcf - 1) % 260 + 1
-    return {'MCF': mcf, 'BMU': bmu, 'KIN_EQUIV': get_kin_details(kin_equiv, db), 'logs': logs}
-
-# --- 輔助：圖片轉 Base64 函式 ---
-def image_to_base64(img_path):
-    """將圖片轉為 Base64 字串，以便嵌入 HTML"""
-    # 使用絕對路徑確保 Streamlit Cloud 能找到檔案
-    abs_path = os.path.abspath(img_path)
-    
-    if os.path.exists(abs_path):
-        try:
-            with open(abs_path, "rb") as f:
-                data = f.read()
-            return base64.b64encode(data).decode()
-        except Exception as e:
-            print(f"Error reading image {abs_path}: {e}")
-            return None
-    # Fallback
-    elif os.path.exists(img_path):
-        try:
-            with open(img_path, "rb") as f:
-                data = f.read()
-            return base64.b64encode(data).decode()
-        except: return None
-    return None
+# 計算函式已移至 synchronotron.core (不依賴 Streamlit，REST API 共用)
 
 # --- 輔助：HTML 神諭卡片渲染 ---
 def render_kin_card(title, kin_num, kin_info, bg_color="#FFFFFF"):
@@ -418,56 +90,7 @@ def render_kin_card(title, kin_num, kin_info, bg_color="#FFFFFF"):
     # 確保 KIN 有效
     if not kin_num: return
     
-    seal_idx = (kin_num - 1) % 20 + 1
-    tone_idx = (kin_num - 1) % 13 + 1
-    
-    # 路徑設定 (注意大小寫與副檔名)
-    seal_path = f"assets/seals/{seal_idx:02d}.jpg"
-    tone_path = f"assets/tones/tone-{tone_idx}.png"
-    
-    b64_seal = image_to_base64(seal_path)
-    b64_tone = image_to_base64(tone_path)
-    
-    tone_name = TONES_NAME[tone_idx]
-    seal_name = SEALS_NAME[seal_idx]
-    
-    # 樣式設定
-    html = f"""
-    <div style="
-        background-color: {bg_color}; 
-        border: 1px solid #ddd; 
-        border-radius: 8px; 
-        padding: 10px; 
-        text-align: center; 
-        height: 100%;
-        display: flex; 
-        flex-direction: column; 
-        align_items: center;
-        justify_content: center;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    ">
-        <div style="font-size: 12px; font-weight: bold; color: #666; margin-bottom: 5px;">{title}</div>
-    """
-    
-    # 調性圖片
-    if b64_tone:
-        html += f'<img src="data:image/png;base64,{b64_tone}" style="width: 40px; margin-bottom: 2px;">'
-    else:
-        html += f"<div style='font-size:12px; color:#555;'>({tone_name}調性)</div>"
-        
-    # 圖騰圖片
-    if b64_seal:
-        html += f'<img src="data:image/jpeg;base64,{b64_seal}" style="width: 60px; border-radius: 5px; margin-bottom: 5px;">'
-    else:
-        html += f"<div style='font-size:12px; color:#555;'>({seal_name}圖騰)</div>"
-        
-    # 文字資訊
-    html += f"""
-        <div style="font-size: 16px; font-weight: bold; color: #333;">KIN {kin_num}</div>
-        <div style="font-size: 12px; color: #666;">{tone_name}調性 {seal_name}</div>
-    </div>
-    """
-    st.markdown(html, unsafe_allow_html=True)
+    st.markdown(render.kin_card_html(title, kin_num, bg_color), unsafe_allow_html=True)
 
 def render_vertical_oracle_card(title, kin_data, bg_color):
     render_kin_card(title, kin_data['KIN'], kin_data, bg_color)
@@ -475,12 +98,12 @@ def render_vertical_oracle_card(title, kin_data, bg_color):
 def render_large_kin(kin_num, kin_info):
     seal_idx = (kin_num - 1) % 20 + 1
     tone_idx = (kin_num - 1) % 13 + 1
-    seal_path = f"assets/seals/{seal_idx:02d}.jpg"
-    tone_path = f"assets/tones/tone-{tone_idx}.png"
+    tone_img = assets.image_source(assets.tone_path(tone_idx), 80)
+    seal_img = assets.image_source(assets.seal_path(seal_idx), 250)
     c1, c2 = st.columns([1, 2])
     with c1:
-        if os.path.exists(tone_path): st.image(tone_path, width=80)
-        if os.path.exists(seal_path): st.image(seal_path, width=250, caption=kin_info.get('主印記'))
+        if tone_img: st.image(tone_img, width=80)
+        if seal_img: st.image(seal_img, width=250, caption=kin_info.get('主印記'))
         else: st.markdown(f"### KIN {kin_num} {kin_info.get('主印記')}")
     return c2
 
@@ -496,76 +119,22 @@ def render_oracle_pyramid(title, kin_num, kin_info):
         st.markdown(f"**{title}**")
         st.caption(f"KIN {kin_num} {kin_info.get('圖騰')}")
         is_destiny = ("主印記" in title)
-        pyr_path = get_pyramid_path(kin_num, is_destiny)
-        if os.path.exists(pyr_path): st.image(pyr_path, width=80)
+        pyr_img = assets.image_source(get_pyramid_path(kin_num, is_destiny))
+        if pyr_img: st.image(pyr_img, width=80)
         else: st.markdown("⚠️") 
         s_idx = (kin_num - 1) % 20 + 1
         t_data = get_telektonon_info(s_idx)
         st.markdown(f"""<div style="font-size:12px; line-height:1.2;">🪐 {t_data.get('planet')}<br>⚡ {t_data.get('circuit')}<br>🌊 {t_data.get('flow')}</div>""", unsafe_allow_html=True)
 
-# --- 波符渲染函式 ---
-def get_wavespell_data(kin_num):
-    tone = (kin_num - 1) % 13 + 1
-    start_kin = kin_num - (tone - 1)
-    if start_kin <= 0: start_kin += 260
-    
-    wavespell = []
-    for i in range(13):
-        k = start_kin + i
-        if k > 260: k -= 260
-        t = (k - 1) % 13 + 1
-        s = (k - 1) % 20 + 1
-        
-        q = TONE_QUESTIONS.get(TONES_NAME[t], "")
-        img = f"assets/seals/{s:02d}.jpg"
-        
-        wavespell.append({
-            "Tone": t, "ToneName": TONES_NAME[t], "SealName": SEALS_NAME[s],
-            "KIN": k, "Question": q, "Image": img, "FullName": f"{TONES_NAME[t]}{SEALS_NAME[s]}"
-        })
-    return wavespell
-
 def render_wavespell_section(kin_info):
-    kin_num = kin_info['KIN']
-    ws_data = get_wavespell_data(kin_num)
-    wave_name = ws_data[0]['SealName'] + "波符"
-    
-    st.subheader(f"🌊 {wave_name} 波符旅程")
-    with st.expander("查看完整 13 天波符路徑"):
-        for w in ws_data:
-            hl = "border: 2px solid #FFD700; background: #FFFBE6;" if w['KIN'] == kin_num else "border: 1px solid #eee;"
-            
-            c_img, c_txt = st.columns([0.5, 4])
-            with c_img:
-                if os.path.exists(w['Image']): st.image(w['Image'], width=40)
-            with c_txt:
-                st.markdown(f"""
-                <div style="{hl} padding: 8px; border-radius: 5px; margin-bottom: 5px;">
-                    <b style='color:#D4AF37'>調性 {w['Tone']} ({w['ToneName']})：{w['Question']}</b><br>
-                    <span style='font-size:14px; color:#555;'>KIN {w['KIN']} {w['FullName']}</span>
-                </div>
-                """, unsafe_allow_html=True)
+    # 13 列波符路徑是一整段快取的 HTML (一則訊息)，不再每列各建 columns / image / markdown
+    st.markdown(render.wavespell_html(kin_info['KIN']), unsafe_allow_html=True)
 
 def render_full_analysis(kin_num, title, db):
-    """通用分析模組：顯示任何 KIN 的神諭與波符"""
+    """通用分析模組：顯示任何 KIN 的神諭與波符 (標題 + 十字佈陣 + 波符合成一則訊息)"""
     kin_info = get_kin_details(kin_num, db)
-    oracle = calculate_oracle(kin_num, db)
-    
-    st.markdown(f"## {title}: KIN {kin_num} {kin_info.get('主印記')}")
-    
-    # 十字佈陣
-    bg_guide = "#F4F6F6"; bg_antipode = "#F4F6F6"; bg_destiny = "#FCF3CF"; bg_analog = "#F4F6F6"; bg_occult = "#F4F6F6"
-    r1c1, r1c2, r1c3 = st.columns([1, 1, 1])
-    with r1c2: render_kin_card("指引 (Guide)", oracle['guide']['KIN'], oracle['guide'], bg_guide)
-    r2c1, r2c2, r2c3 = st.columns([1, 1, 1])
-    with r2c1: render_kin_card("挑戰 (Antipode)", oracle['antipode']['KIN'], oracle['antipode'], bg_antipode)
-    with r2c2: render_kin_card("主印記 (Main Kin)", oracle['main']['KIN'], oracle['main'], bg_destiny)
-    with r2c3: render_kin_card("支持 (Analog)", oracle['analog']['KIN'], oracle['analog'], bg_analog)
-    r3c1, r3c2, r3c3 = st.columns([1, 1, 1])
-    with r3c2: render_kin_card("隱藏 (Occult)", oracle['occult']['KIN'], oracle['occult'], bg_occult)
-    
-    st.markdown("---")
-    render_wavespell_section(kin_info)
+    st.markdown(f"## {title}: KIN {kin_num} {kin_info.get('主印記')}\n\n{render.analysis_html(kin_num)}",
+                unsafe_allow_html=True)
 
 # ==========================================
 # 4. 前端展示層
@@ -587,24 +156,26 @@ st.sidebar.markdown("---")
 
 # 使用者
 st.sidebar.subheader("👤 使用者設定 (KIN A)")
-conn, contacts_df = load_contacts_db()
-contacts_df = enrich_contacts_with_details(contacts_df)
+contacts_repo, contacts_index = load_contacts_db()
+contacts_df = contacts_index.frame
 
 use_contact = st.sidebar.checkbox("從通訊錄匯入", value=False)
 
 # Debug
-if st.sidebar.checkbox("🔧 檔案檢查"):
+assets.page_stats().reset()
+show_file_debug = st.sidebar.checkbox("🔧 檔案檢查")
+show_perf = st.sidebar.checkbox("⏱️ 效能")
+if show_file_debug:
     st.sidebar.write("Seals Path: assets/seals")
     if os.path.exists("assets/seals"):
         st.sidebar.write(os.listdir("assets/seals")[:5])
     else: st.sidebar.error("Seals not found")
+    st.sidebar.write("已載入資料集：", {k: f"{DB.timings[k] * 1000:.1f} ms {DB.sources.get(k, '')}" for k in DB.loaded})
 
 if use_contact and not contacts_df.empty:
     f_tone = st.sidebar.multiselect("篩選調性", TONES_NAME[1:])
     f_seal = st.sidebar.multiselect("篩選圖騰", SEALS_NAME[1:])
-    filtered_df = contacts_df.copy()
-    if f_tone: filtered_df = filtered_df[filtered_df['調性'].isin(f_tone)]
-    if f_seal: filtered_df = filtered_df[filtered_df['圖騰'].isin(f_seal)]
+    filtered_df = contacts_index.filter(tones=f_tone, seals=f_seal)
     contact_list = filtered_df['姓名'].tolist()
     selected_contact = st.sidebar.selectbox("選擇人員", ["-- 請選擇 --"] + contact_list)
     
@@ -624,26 +195,18 @@ if not use_contact:
         if st.button("儲存"):
             k = calculate_kin_num(birth_date.year, birth_date.month, birth_date.day, DB)
             if new_name:
-                save_contact(conn, contacts_df, new_name, birth_date, k)
+                contacts_repo.add(new_name, birth_date, k)  # 只新增一列，不再整張表覆寫
                 st.success(f"已儲存 {new_name}")
                 st.rerun()
 
-# 計算
-kin_A = calculate_kin_num(birth_date.year, birth_date.month, birth_date.day, DB)
-info_A = get_kin_details(kin_A, DB)
-oracle_A = calculate_oracle(kin_A, DB)
-psi_num, _ = get_psi_kin(birth_date, kin_A, DB)
-psi_info = get_kin_details(psi_num, DB)
-goddess_info = calculate_goddess_force(oracle_A, DB)
-flow_year_val, flow_year_info = calculate_flow_year_kin(birth_date, DB, ref_date=daily_date)
-today_date, today_kin_info = calculate_today_kin(daily_date, DB)
-moon_str, moon_num, day_num, heptad_week = get_13moon_date(daily_date)
-daily_energy = get_daily_energy(moon_num, day_num, DB)
-today_oracle = calculate_oracle(today_kin_info['KIN'], DB)
-sync_data = calculate_synchronotron_data(daily_date, kin_A, DB)
-heptad_info = get_heptad_gate_info(day_num)
+# 計算：藍圖依 (生日, 今日) 存在 session 中，各項第一次用到時才算，切換頁面不重算
+if "blueprints" not in st.session_state: st.session_state["blueprints"] = BlueprintStore(maxsize=8)
+bp = st.session_state["blueprints"].get(birth_date, daily_date, DB)
+bp.begin_rerun()
+kin_A = bp.kin_A
 
 if selected_function != "👥 人員管理":
+    today_kin_info = bp.today_kin_info
     st.title("🌌 13 Moon Synchronotron Master System")
     st.markdown(f"**歡迎來到時間法則的中心** | 設定今日: **{daily_date}** | 今日 KIN **{today_kin_info['KIN']} {today_kin_info['主印記']}**")
     st.markdown("---")
@@ -651,6 +214,7 @@ if selected_function != "👥 人員管理":
 # ==========================================
 # 5. 頁面路由
 # ==========================================
+profiling.start(f"頁面 {selected_function}")
 
 if selected_function == "🔮 靈魂藍圖":
     # 主印記分析
@@ -659,6 +223,7 @@ if selected_function == "🔮 靈魂藍圖":
     st.markdown("---")
     
     # PSI 展開
+    psi_num, goddess_info = bp.psi_num, bp.goddess_info
     with st.expander(f"查看 PSI 印記詳情: KIN {psi_num}"):
         render_full_analysis(psi_num, "PSI 印記 (Planetary Memory)", DB)
         
@@ -667,6 +232,7 @@ if selected_function == "🔮 靈魂藍圖":
         render_full_analysis(goddess_info['KIN'], "女神印記 (Goddess Force)", DB)
 
 elif selected_function == "🏰 時間地圖":
+    info_A = bp.info_A
     castle_name = info_A.get('城堡', '')
     castle_data = None
     for c_key, c_val in CASTLES_INFO.items():
@@ -675,7 +241,8 @@ elif selected_function == "🏰 時間地圖":
     if castle_data:
         c1, c2 = st.columns([1, 3])
         with c1:
-            if os.path.exists(castle_data['img']): st.image(castle_data['img'], width=100)
+            castle_img = assets.image_source(castle_data['img'], 100)
+            if castle_img: st.image(castle_img, width=100)
         with c2:
             st.markdown(f"""<div style="background-color:{castle_data['color_bg']}; padding:15px; border-radius:10px; border:1px solid #ddd;">
                 <h3 style="margin:0;">{castle_name}</h3>
@@ -686,8 +253,28 @@ elif selected_function == "🏰 時間地圖":
     render_wavespell_section(info_A)
 
 elif selected_function == "🌊 流年與運勢":
+    flow_year_val, flow_year_info = bp.flow_year
     st.subheader(f"🌊 流年運勢 ({flow_year_val})")
     render_full_analysis(flow_year_info['KIN'], f"流年印記 (Flow Year)", DB)
+    star = DB['star_years'].of_date(daily_date)
+    st.caption(f"🌌 星際年 {star.label or '—'}：{get_kin_details(star.kin, DB).get('主印記', '')}年 (KIN {star.kin})・"
+               f"52 年週期第 {star.cycle_year} 年・{star.castle}")
+    with st.expander("📜 52 年流年表"):
+        st.dataframe(bp.life_chart, hide_index=True)
+
+    st.markdown("---")
+    st.subheader("📅 印記日期反查")
+    oracle_roles = {"主印記 (銀河回歸)": 0, "支持": 1, "挑戰": 2, "隱藏": 3, "指引": 4}
+    role = st.radio("今日 KIN 等於我的…", list(oracle_roles), horizontal=True)
+    target_kin = kin_engine.oracle_kins(kin_A)[oracle_roles[role]]
+    moon_year = kin_engine.moon_year_of(daily_date)
+    c_from, c_to = st.columns(2)
+    with c_from: range_start = st.date_input("起", value=datetime.date(moon_year, 7, 26))
+    with c_to: range_end = st.date_input("迄", value=datetime.date(moon_year + 1, 7, 25))
+    next_hit = reverse.next_date(target_kin, daily_date, inclusive=True)
+    st.info(f"KIN {target_kin} {get_kin_details(target_kin, DB).get('主印記', '')}：下一次在 **{next_hit}**")
+    hits = reverse.find_dates(range_start, range_end, kin=target_kin)
+    st.write(f"區間內共 {len(hits)} 天：" + "、".join(str(d) for d in hits))
 
 elif selected_function == "💞 關係合盤":
     st.header("💞 關係能量合盤")
@@ -703,53 +290,87 @@ elif selected_function == "💞 關係合盤":
     if combined:
         render_full_analysis(combined['KIN'], "合盤印記 (Combined Seal)", DB)
 
+    rel_matrix, _ = contacts_index.relationship_matrix()
+    if len(rel_matrix):
+        st.markdown("---")
+        st.subheader("👥 通訊錄關係矩陣")
+        member_ids = list(range(len(rel_matrix)))
+        member_name = lambda i: f"{rel_matrix.names[i]} (KIN {rel_matrix.kins[i]})"
+        team = st.multiselect("團隊合盤：選擇成員", member_ids, format_func=member_name)
+        if team:
+            team_kin = rel_matrix.team_kin(team)
+            st.success(f"**團隊 KIN {team_kin} {get_kin_details(team_kin, DB).get('主印記', '')}** ({len(team)} 人)")
+        center = st.selectbox("神諭關係：選擇對象", member_ids, format_func=member_name)
+        rel_cols = st.columns(len(RELATIONS))
+        for col, rel in zip(rel_cols, RELATIONS):
+            with col:
+                found = rel_matrix.partners(center, rel)
+                st.markdown(f"**{RELATION_NAMES[rel]}** ({len(found)})")
+                st.caption("、".join(rel_matrix.names[found[:30]]) or "—")
+        top, score = rel_matrix.top_k(center, 10)
+        top, score = top[score > 0], score[score > 0]
+        st.dataframe(pd.DataFrame({
+            "姓名": rel_matrix.names[top], "KIN": rel_matrix.kins[top], "關係數": score,
+            "合盤 KIN": rel_matrix.composite([center], top)[0], "關係": rel_matrix.relation_labels(center, top),
+        }), hide_index=True)
+
 elif selected_function == "👑 國王棋盤":
     st.header("👑 Telektonon 預言棋盤")
-    board_img = "assets/tokens/telektonon_board.jpg"
-    if os.path.exists(board_img): st.image(board_img, caption="Telektonon 預言遊戲棋盤", use_column_width=True)
-    
-    if 1 <= day_num <= 6:
-        path_img = "assets/tokens/yellow_white_path_1_6.jpg"
-        if os.path.exists(path_img): st.image(path_img, caption="黃白烏龜地球之旅 (Day 1-6)", width=400)
-    elif 23 <= day_num <= 28:
-        path_img = "assets/tokens/heaven_reunion_path.jpg"
-        if os.path.exists(path_img): st.image(path_img, caption="天堂之旅 (Day 23-28)", width=400)
-    elif 7 <= day_num <= 22:
-        warrior_img = "assets/tokens/warrior_yellow_white_path.jpg"
-        if os.path.exists(warrior_img): st.image(warrior_img, caption="戰士期間分道揚鑣 (Day 7-22)", width=400)
+    moon_str, moon_num, day_num, heptad_week = bp.moon_date
+    today_oracle = bp.today_oracle
+    # 今日棋盤 / 羅盤是預先合成好的狀態圖 (synchronotron.board，只查對照表)；無時間日等沒有狀態圖時顯示原圖
+    # 其餘圖片依顯示寬度縮圖 (assets.TOKEN_WIDTHS)；啟用靜態檔時為可快取的網址
+    board_states = DB['board']
+    board_state = board_states.board_image(day_num) if board_states is not None else None
+    if board_state:
+        st.image(assets.static_source(board_state), caption=f"今日棋盤 (第 {day_num} 天)：{board_states.caption(day_num)}", use_column_width=True)
+    else:
+        board_img = assets.image_source("assets/tokens/telektonon_board.jpg")
+        if board_img: st.image(board_img, caption="Telektonon 預言遊戲棋盤", use_column_width=True)
+        if 1 <= day_num <= 6:
+            path_img = assets.image_source("assets/tokens/yellow_white_path_1_6.jpg")
+            if path_img: st.image(path_img, caption="黃白烏龜地球之旅 (Day 1-6)", width=400)
+        elif 23 <= day_num <= 28:
+            path_img = assets.image_source("assets/tokens/heaven_reunion_path.jpg")
+            if path_img: st.image(path_img, caption="天堂之旅 (Day 23-28)", width=400)
+        elif 7 <= day_num <= 22:
+            warrior_img = assets.image_source("assets/tokens/warrior_yellow_white_path.jpg")
+            if warrior_img: st.image(warrior_img, caption="戰士期間分道揚鑣 (Day 7-22)", width=400)
 
     st.markdown("---")
     st.subheader("🧭 13:20 羅盤每日校準")
     c_compass, c_inst = st.columns([1, 1])
     with c_compass:
-        compass_img = "assets/tokens/compass_1320.jpg"
-        if os.path.exists(compass_img): st.image(compass_img, width=300)
+        compass_img = assets.static_source(board_states.compass_1320_image(today_kin_info['KIN'])) if board_states is not None else None
+        compass_img = compass_img or assets.image_source("assets/tokens/compass_1320.jpg")
+        if compass_img: st.image(compass_img, width=300)
     with c_inst:
         t_idx = (today_kin_info['KIN'] - 1) % 13 + 1
         s_idx = (today_kin_info['KIN'] - 1) % 20 + 1
         st.success(f"**今日校準：KIN {today_kin_info['KIN']}**")
         c_w, c_b = st.columns(2)
         with c_w:
-            st.image("assets/tokens/particle_white.png", width=50)
+            st.image(assets.image_source(PARTICLE_WHITE_IMG), width=50)
             st.write(f"**白粒子**：內圈 第 {t_idx} 格")
         with c_b:
-            st.image("assets/tokens/particle_black.png", width=50)
+            st.image(assets.image_source(PARTICLE_BLACK_IMG), width=50)
             st.write(f"**黑粒子**：外圈 第 {s_idx} 格")
 
     st.markdown("---")
     st.subheader("🗓️ 13:28 羅盤每日校準")
     c_comp2, c_inst2 = st.columns([1, 1])
     with c_comp2:
-        compass2 = "assets/tokens/compass_1328.jpg"
-        if os.path.exists(compass2): st.image(compass2, width=300)
+        compass2 = assets.static_source(board_states.compass_1328_image(moon_num, day_num)) if board_states is not None else None
+        compass2 = compass2 or assets.image_source("assets/tokens/compass_1328.jpg")
+        if compass2: st.image(compass2, width=300)
     with c_inst2:
         st.success(f"**今日校準：{MOON_NAMES[moon_num]} 第 {day_num} 天**")
         c_w2, c_b2 = st.columns(2)
         with c_w2:
-            st.image("assets/tokens/particle_white.png", width=50)
+            st.image(assets.image_source(PARTICLE_WHITE_IMG), width=50)
             st.write(f"**白粒子**：內圈 第 {moon_num} 格")
         with c_b2:
-            st.image("assets/tokens/particle_black.png", width=50)
+            st.image(assets.image_source(PARTICLE_BLACK_IMG), width=50)
             st.write(f"**黑粒子**：外圈 第 {day_num} 格")
 
     st.markdown("---")
@@ -759,20 +380,21 @@ elif selected_function == "👑 國王棋盤":
     if eh_hint: st.caption(f"提示：{eh_hint}")
     if eh_imgs:
         c1, c2 = st.columns(2)
-        with c1: st.image(eh_imgs[0], caption="黃烏龜 (國王)", width=80)
-        with c2: st.image(eh_imgs[1], caption="白烏龜 (皇后)", width=80)
+        with c1: st.image(assets.image_source(eh_imgs[0]), caption="黃烏龜 (國王)", width=80)
+        with c2: st.image(assets.image_source(eh_imgs[1]), caption="白烏龜 (皇后)", width=80)
         
     warrior_name, warrior_desc, warrior_img = get_journey_warrior(day_num)
     if warrior_name:
         st.divider()
         st.info(f"**{warrior_name}** — {warrior_desc}")
-        if os.path.exists(warrior_img):
-            st.image(warrior_img, caption="綠烏龜 (戰士)", width=80)
+        warrior_token = assets.image_source(warrior_img)
+        if warrior_token:
+            st.image(warrior_token, caption="綠烏龜 (戰士)", width=80)
 
     st.markdown("---")
     st.subheader("🏛️ 神諭金字塔佈陣 (GK/SP 能量流)")
-    flow_img = "assets/tokens/gk_sp_flow.jpg"
-    if os.path.exists(flow_img): st.image(flow_img, caption="GK (左) / SP (右) 垂直能量流", use_column_width=True)
+    flow_img = assets.image_source("assets/tokens/gk_sp_flow.jpg")
+    if flow_img: st.image(flow_img, caption="GK (左) / SP (右) 垂直能量流", use_column_width=True)
     cols = st.columns(5)
     keys = ['guide', 'analog', 'main', 'antipode', 'occult']
     labels = ["指引", "支持", "主印記", "挑戰", "隱藏"]
@@ -782,13 +404,18 @@ elif selected_function == "👑 國王棋盤":
     st.markdown("---")
     c_cry1, c_cry2 = st.columns([1, 3])
     with c_cry1:
-        if os.path.exists("assets/tokens/crystal.png"): st.image("assets/tokens/crystal.png", width=80)
+        crystal_img = assets.image_source("assets/tokens/crystal.png")
+        if crystal_img: st.image(crystal_img, width=80)
     with c_cry2:
-        if os.path.exists("assets/tokens/crystal_battery.jpg"): st.image("assets/tokens/crystal_battery.jpg", width=200)
+        battery_img = assets.image_source("assets/tokens/crystal_battery.jpg")
+        if battery_img: st.image(battery_img, width=200)
         st.info(f"將水晶移至今日圖騰：**{today_kin_info.get('圖騰')}**")
 
 elif selected_function == "🧠 441 共時化科學":
     st.header("🧠 441 Synchronotron")
+    sync_data = bp.sync_data
+    moon_str, moon_num, day_num, heptad_week = bp.moon_date
+    heptad_info = bp.heptad_info
     c_h, c_res = st.columns([1, 1])
     with c_h:
         st.markdown("#### 52 七價路徑")
@@ -815,23 +442,45 @@ elif selected_function == "🧠 441 共時化科學":
                 <h3>BMU: {bmu}</h3><small>Base Matrix Unit</small><hr>
                 <h3>對等: KIN {keq['KIN']}</h3></div>""", unsafe_allow_html=True)
         
+        bmu_info = DB['bmu'].resolve(bmu)
+        if bmu_info:
+            with st.expander(f"BMU {bmu} 註解：{bmu_info['座標']} · {bmu_info['音符']} · {bmu_info['腦部']}"):
+                st.write(bmu_info['全腦調頻語'])
+                rune = bmu_info['盧恩符文']
+                if rune: st.info(f"烏爾諧波盧恩符文 {rune['代號']}：{rune['說明']} ({rune['意識流']})")
+                hexagram = bmu_info['卦象']
+                if hexagram: st.caption(f"卓爾金曆 KIN {bmu_info['KIN']} · 諧波 {bmu_info['諧波']} · {hexagram['卦象']} ({hexagram['意涵']})")
+
         with st.expander(f"查看 對等印記詳情: KIN {keq['KIN']}"):
             render_full_analysis(keq['KIN'], "對等印記 (Equivalent Kin)", DB)
             
         with st.expander("查看 TFI 加總細節"):
             for log in sync_data['logs']: st.code(log, language="text")
 
+    light = bp.light_points
+    if light:
+        with st.expander("✨ 八個光點"):
+            points = pd.DataFrame([{
+                "光點": f"{p['no']}. {p['name']}", "對應": p['label'], "座標": p['pos'], "BMU": p['bmu'],
+                "音符": p['note'], "TFI": p['tfi'], "加總": " + ".join(map(str, p['terms']))
+            } for p in light['points']])
+            # 腦部 / 盧恩符文 / 卦象 由 BMU 整批查表
+            notes = DB['bmu'].frame(points['BMU'])[["腦部", "盧恩符文", "符文說明", "卦象"]]
+            st.dataframe(pd.concat([points, notes], axis=1), hide_index=True)
+    if len(contacts_index):
+        with st.expander(f"👥 通訊錄所有人的八個光點 ({daily_date})"):
+            # 整批查表，一次算完所有人 (團體共修用)
+            st.dataframe(DB['light_points'].contact_charts(contacts_index.frame, daily_date), hide_index=True)
+
 elif selected_function == "👥 人員管理":
     st.header("👥 人員資料庫管理")
+    if 'contacts_conflict' in st.session_state: st.warning(st.session_state.pop('contacts_conflict'))
     search_term = st.text_input("🔍 搜尋姓名", "")
     c_f1, c_f2 = st.columns(2)
     with c_f1: f_tone = st.multiselect("篩選調性", TONES_NAME[1:])
     with c_f2: f_seal = st.multiselect("篩選圖騰", SEALS_NAME[1:])
     
-    display_df = contacts_df
-    if search_term: display_df = display_df[display_df['姓名'].str.contains(search_term, case=False, na=False)]
-    if f_tone: display_df = display_df[display_df['調性'].isin(f_tone)]
-    if f_seal: display_df = display_df[display_df['圖騰'].isin(f_seal)]
+    display_df = contacts_index.filter(tones=f_tone, seals=f_seal, name_contains=search_term)
 
     st.info("💡在此表格中直接 **修改** 或 **新增/刪除** 列。完成後請點擊下方「儲存」按鈕。")
     edited_df = st.data_editor(
@@ -847,24 +496,21 @@ elif selected_function == "👥 人員管理":
     )
 
     if st.button("💾 儲存變更 & 更新 KIN"):
-        updated_rows = []
-        for index, row in edited_df.iterrows():
-            b_date = parse_date_safe(row['生日'])
-            if b_date:
-                k = calculate_kin_num(b_date.year, b_date.month, b_date.day, DB)
-                updated_rows.append({"姓名": row['姓名'], "生日": str(b_date), "KIN": k})
-            else:
-                st.warning(f"跳過無效日期：{row.get('姓名', 'Unknown')} - {row.get('生日')}")
-        
-        if updated_rows:
-            final_df = pd.DataFrame(updated_rows)
-            conn.update(worksheet="contacts", data=final_df)
-            st.success("✅ 資料庫已更新！")
-            st.rerun()
-        elif len(edited_df) == 0:
-            conn.update(worksheet="contacts", data=pd.DataFrame(columns=["姓名", "生日", "KIN"]))
-            st.success("✅ 資料庫已清空！")
-            st.rerun()
+        # 一次解析所有日期並重算 KIN；只送出新增 / 修改 / 刪除的列，日期無效的列保持原狀
+        final_df, invalid = prepare_contacts(edited_df)
+        for _, row in edited_df[invalid].head(20).iterrows():
+            st.warning(f"跳過無效資料：{row.get('姓名', 'Unknown')} - {row.get('生日')}")
+        if invalid.sum() > 20: st.warning(f"另有 {invalid.sum() - 20} 筆無效資料未列出")
+        skipped = set(edited_df.index[invalid])
+        shown = display_df[~display_df.index.isin(list(skipped))]
+        try:
+            n_add, n_upd, n_del = contacts_repo.apply_edits(shown, final_df)
+            st.success(f"✅ 資料庫已更新！新增 {n_add}、修改 {n_upd}、刪除 {n_del} 筆")
+        except ContactsConflict as e:
+            # 試算表已被其他人變更：放棄這次編輯，以最新資料重新顯示
+            st.session_state['contacts_conflict'] = f"⚠️ {e}"
+            st.session_state.pop('contact_editor', None)
+        st.rerun()
 
     st.markdown("---")
     c_exp, c_imp = st.columns(2)
@@ -877,19 +523,32 @@ elif selected_function == "👥 人員管理":
         uploaded_file = st.file_uploader("上傳 CSV (需包含 '姓名', '生日' 欄位)", type=['csv'])
         if uploaded_file is not None:
             if st.button("確認匯入"):
+                # 分塊串流匯入：每塊向量化算 KIN、略過 (姓名, 生日) 已存在的列，只 append 新的列
+                bar = st.progress(0.0, text="匯入中…")
+                def on_progress(report):
+                    bar.progress(report.fraction or 0.0, text=report.summary())
                 try:
-                    imp_df = pd.read_csv(uploaded_file)
-                    if '姓名' in imp_df.columns and '生日' in imp_df.columns:
-                        new_rows = []
-                        for _, row in imp_df.iterrows():
-                            b_d = parse_date_safe(row['生日'])
-                            if b_d:
-                                k_num = calculate_kin_num(b_d.year, b_d.month, b_d.day, DB)
-                                new_rows.append({"姓名": row['姓名'], "生日": str(b_d), "KIN": k_num})
-                        new_data = pd.DataFrame(new_rows)
-                        final_import_df = pd.concat([contacts_df, new_data], ignore_index=True)
-                        conn.update(worksheet="contacts", data=final_import_df)
-                        st.success(f"成功匯入 {len(new_data)} 筆資料！")
-                        st.rerun()
-                    else: st.error("CSV 缺少 '姓名' 或 '生日' 欄位")
+                    report = import_contacts(uploaded_file, contacts_repo, progress=on_progress)
+                    st.success(f"匯入完成！{report.summary()}")
+                    if report.rejected:
+                        st.warning(f"有 {report.rejected} 筆姓名空白或日期無效 (最多列出 {len(report.rejects)} 筆)")
+                        st.dataframe(report.rejects_frame(), hide_index=True)
                 except Exception as e: st.error(f"匯入失敗: {e}")
+
+profiling.stop(f"頁面 {selected_function}")
+n_fresh, n_reused, fresh_ms = bp.rerun_summary()
+profiling.count("藍圖計算項目", n_fresh)
+profiling.count("藍圖沿用項目", n_reused)
+trace = profiling.end_trace(page=selected_function)
+
+if show_perf:
+    st.sidebar.caption(f"⏱️ 本次 rerun {trace.elapsed * 1000:.0f} ms (版本 {profiling.deploy_id() or '—'})")
+    st.sidebar.dataframe(trace.rows(), hide_index=True)
+    st.sidebar.write("計數：", dict(trace.counters))
+    st.sidebar.write("快取：", trace.cache_deltas())
+    st.sidebar.write("啟動 (ms)：", profiling.startup_timings())
+
+if show_file_debug:
+    st.sidebar.caption(f"🖼️ 本頁圖片：{assets.page_stats().summary()}")
+    st.sidebar.caption(f"🧮 藍圖：計算 {n_fresh} 項 ({fresh_ms:.1f} ms)、沿用 {n_reused} 項")
+    st.sidebar.dataframe(bp.rerun_table(), hide_index=True)
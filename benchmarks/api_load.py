@@ -0,0 +1,116 @@
+"""壓力測試：REST API (synchronotron.api) 在單一 worker 與 N 個 worker 下的延遲與吞吐量
+
+    python -m benchmarks.api_load [--workers 1 4] [--clients 8] [--duration 10] [--mix date]
+
+每組 worker 數各啟動一次 uvicorn，以多個客戶端行程 (keep-alive 連線) 持續送出請求，
+回報 p50 / p99 延遲與每秒請求數。--mix 可選：
+  date   單筆 /v1/date (隨機日期，會逐漸命中 LRU 快取)
+  mixed  單筆 date / kin / synchronotron / flow-year 混合
+  batch  /v1/batch/blueprints (每次 1000 個日期)
+"""
+import argparse
+import datetime
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_DATE = datetime.date(1950, 1, 1)
+
+
+def _random_date(rng):
+    return (BASE_DATE + datetime.timedelta(days=rng.randrange(365 * 80))).isoformat()
+
+
+def _request(rng, mix):
+    if mix == "batch":
+        body = json.dumps({"dates": [_random_date(rng) for _ in range(1000)]})
+        return "POST", "/v1/batch/blueprints", body
+    kind = "date" if mix == "date" else rng.choice(("date", "kin", "synchronotron", "flow-year"))
+    if kind == "kin": return "GET", f"/v1/kin/{rng.randint(1, 260)}", None
+    if kind == "synchronotron": return "GET", f"/v1/synchronotron?date={_random_date(rng)}&birth={_random_date(rng)}", None
+    if kind == "flow-year": return "GET", f"/v1/flow-year?birth={_random_date(rng)}&ref=2026-01-01", None
+    return "GET", f"/v1/date/{_random_date(rng)}", None
+
+
+def _client(args):
+    port, duration, mix, seed = args
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    latencies, errors = [], 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        method, path, body = _request(rng, mix)
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers={"Content-Type": "application/json"} if body else {})
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 500: errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            continue
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def _wait_ready(port, timeout=60):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200: return True
+        except OSError: time.sleep(0.2)
+    return False
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values: return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run(workers, clients, duration, mix, port):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "synchronotron.api:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"], cwd=ROOT_DIR)
+    try:
+        if not _wait_ready(port): raise RuntimeError("API 伺服器未能啟動")
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(_client, [(port, duration, mix, i) for i in range(clients)])
+    finally:
+        server.terminate()
+        server.wait(10)
+    latencies = sorted(x for lat, _ in results for x in lat)
+    errors = sum(e for _, e in results)
+    return {
+        "workers": workers, "clients": clients, "mix": mix, "requests": len(latencies), "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": _percentile(latencies, 0.50) * 1000, "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--mix", choices=("date", "mixed", "batch"), default="mixed")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    print(f"{'workers':>7} {'請求數':>8} {'錯誤':>4} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for w in args.workers:
+        r = run(w, args.clients, args.duration, args.mix, args.port)
+        print(f"{r['workers']:>7} {r['requests']:>8} {r['errors']:>4} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
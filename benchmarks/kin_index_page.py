@@ -0,0 +1,67 @@
+"""微基準：🔮 靈魂藍圖頁面的 KIN 查詢成本 (DataFrame 遮罩掃描 vs KinIndex)
+
+    python -m benchmarks.kin_index_page [次數]
+"""
+import datetime
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+from synchronotron import kin_engine
+from synchronotron.kin_index import KinIndex
+
+KIN_INFO_CSV = os.path.join(kin_engine.DATA_DIR, "kin_basic_info.csv")
+
+
+def legacy_details(kin_info):
+    """改版前 get_kin_details 的查詢方式"""
+    def get(kin_num):
+        if not kin_num: return {}
+        row = kin_info[kin_info['KIN'] == kin_num]
+        if not row.empty: return row.iloc[0].to_dict()
+        return {'KIN': kin_num}
+    return get
+
+
+def page_compute(get_details, birth, today):
+    """依頁面順序重現所有 KIN 查詢：主印記、神諭、PSI、女神、流年、今日，再加上三個完整分析區塊"""
+    def oracle(kin):
+        return [get_details(k) for k in kin_engine.oracle_kins(kin)]
+
+    kin_a = kin_engine.kin_of(birth)
+    get_details(kin_a)
+    oracle(kin_a)
+    goddess = kin_engine.goddess_kin(kin_a)
+    get_details(goddess)
+    kin_today = kin_engine.kin_of(today)
+    get_details(kin_today)
+    oracle(kin_today)
+    flow_kin = kin_engine.kin_num(today.year, birth.month, birth.day)
+    get_details(flow_kin)
+    for k in (kin_a, flow_kin, goddess):
+        get_details(k)
+        oracle(k)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    number = int(argv[0]) if argv else 200
+    kin_info = pd.read_csv(KIN_INFO_CSV)
+    kin_info.columns = [str(c).strip() for c in kin_info.columns]
+    index = KinIndex.from_frame(kin_info)
+    birth, today = datetime.date(1985, 10, 24), datetime.date.today()
+    results = {}
+    for label, get in (("DataFrame 掃描", legacy_details(kin_info)), ("KinIndex", index.details)):
+        sec = timeit.timeit(lambda: page_compute(get, birth, today), number=number) / number
+        results[label] = sec
+        print(f"{label:<14} {sec * 1000:8.3f} ms / 頁")
+    build = timeit.timeit(lambda: KinIndex.from_frame(kin_info), number=10) / 10
+    print(f"{'索引建置':<14} {build * 1000:8.3f} ms (啟動時一次)")
+    print(f"加速 {results['DataFrame 掃描'] / results['KinIndex']:.0f}×")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
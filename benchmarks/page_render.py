@@ -0,0 +1,156 @@
+"""頁面渲染量測：每個頁面一次 rerun 送出的 delta 訊息數、訊息大小與腳本耗時 (不需瀏覽器)
+
+    python -m benchmarks.page_render                      # 🔮 靈魂藍圖
+    python -m benchmarks.page_render --page 🏰 --repeat 10
+    python -m benchmarks.page_render --all
+    python -m benchmarks.page_render --session --reruns 3  # 每個 session 的位元組 (delta + 圖片)
+
+以 streamlit.testing 執行 app.py：元素樹中每個區塊 (columns / expander / container) 與元素
+(markdown / image …) 各對應一則送往瀏覽器的 delta 訊息；大小為各訊息 protobuf 的位元組數。
+Streamlit 邊執行邊送出 delta，頁面要等最後一則訊息到達才完整，所以腳本耗時即首次完整繪製前的伺服器端時間。
+通訊錄讀取失敗 (沒有 Google Sheets 憑證) 時頁面仍會渲染，只是沒有聯絡人。
+
+--session 模擬一個 session：每頁進入一次再 rerun --reruns 次。delta 每次 rerun 都重送 (內嵌的 data URI 也在其中)；
+st.image 的 /media/ 檔案與 app/static/ 檔案依網址計，同一 session 只下載一次；
+app/static/ 的內容雜湊檔帶長效快取標頭 (serve.py)，之後的 session 不必再下載，/media/ 則每個 session 都要。
+要得到修改前的數字，可在舊版本的 worktree 上執行同一支腳本。
+"""
+import argparse
+import contextlib
+import os
+import re
+import statistics
+import sys
+import time
+from urllib.parse import unquote
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+ASSET_URL = re.compile(rb"/media/[0-9a-f]+\.(?:png|jpe?g|webp|gif)|app/static/[\w.%-]+?\.(?:png|jpe?g|webp|gif)")
+PAGES = ["🔮 靈魂藍圖", "🏰 時間地圖", "🌊 流年與運勢", "💞 關係合盤", "👑 國王棋盤", "🧠 441 共時化科學", "👥 人員管理"]
+
+
+def _protos(node):
+    """元素樹中每則 delta 訊息的 proto (沒有 proto 的區塊為 None)；根節點本身不是訊息"""
+    for child in getattr(node, "children", {}).values():
+        yield getattr(child, "proto", None)
+        yield from _protos(child)
+
+
+def count_deltas(node):
+    """(訊息數, protobuf 位元組數)"""
+    messages, size = 0, 0
+    for proto in _protos(node):
+        messages += 1
+        if proto is not None and hasattr(proto, "ByteSize"): size += proto.ByteSize()
+    return messages, size
+
+
+def asset_urls(node):
+    """元素樹引用的圖片網址 (/media/… 與 app/static/…)"""
+    urls = set()
+    for proto in _protos(node):
+        if proto is not None and hasattr(proto, "SerializeToString"):
+            urls.update(u.decode() for u in ASSET_URL.findall(proto.SerializeToString()))
+    return urls
+
+
+@contextlib.contextmanager
+def media_sizes():
+    """記錄送進 Streamlit media 檔案管理員 (st.image 的檔案 / 位元組) 的檔案大小 {file_id: 位元組}"""
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    sizes, original = {}, MemoryMediaFileStorage.load_and_get_id
+
+    def load_and_get_id(self, path_or_data, *args, **kwargs):
+        file_id = original(self, path_or_data, *args, **kwargs)
+        sizes[file_id] = len(self._files_by_id[file_id].content)
+        return file_id
+    MemoryMediaFileStorage.load_and_get_id = load_and_get_id
+    try:
+        yield sizes
+    finally:
+        MemoryMediaFileStorage.load_and_get_id = original
+
+
+def url_size(url, media):
+    if url.startswith("app/static/"): return os.path.getsize(os.path.join(STATIC_DIR, unquote(url[len("app/static/"):])))
+    return media.get(os.path.splitext(os.path.basename(url))[0], 0)
+
+
+def session(pages=PAGES, reruns=3):
+    """每頁進入一次再 rerun reruns 次；回傳 [(頁面, delta 位元組, 該頁新增的 media 位元組, 該頁新增的 static 位元組)]"""
+    from streamlit.testing.v1 import AppTest
+    rows, seen = [], set()
+    with media_sizes() as media:
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        for page in pages:
+            at.sidebar.radio[0].set_value(page)
+            delta, urls = 0, set()
+            for _ in range(reruns + 1):
+                at.run()
+                if at.exception: raise RuntimeError(at.exception[0].value)
+                delta += count_deltas(at.main)[1]
+                urls |= asset_urls(at.main)
+            new = urls - seen
+            seen |= urls
+            rows.append((page, delta, sum(url_size(u, media) for u in new if not u.startswith("app/static/")),
+                         sum(url_size(u, media) for u in new if u.startswith("app/static/"))))
+    return rows
+
+
+def print_session(rows, reruns):
+    print(f"每頁進入一次 + rerun {reruns} 次 (KB)")
+    print(f"{'頁面':<16} {'delta':>9} {'media':>9} {'static':>9}")
+    for page, delta, media, static in rows:
+        print(f"{page:<16} {delta / 1024:>9.1f} {media / 1024:>9.1f} {static / 1024:>9.1f}")
+    delta, media, static = (sum(r[i] for r in rows) for i in (1, 2, 3))
+    print(f"{'合計':<16} {delta / 1024:>9.1f} {media / 1024:>9.1f} {static / 1024:>9.1f}")
+    print(f"第一個 session：{(delta + media + static) / 1024:,.0f} KB；之後的 session (static 已快取)：{(delta + media) / 1024:,.0f} KB")
+
+
+def measure(page, repeat=5, at=None):
+    """回傳 {訊息數, 位元組, 首次 (冷) 秒數, 之後 rerun 的中位數秒數}"""
+    from streamlit.testing.v1 import AppTest
+    if at is None:
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+    at.sidebar.radio[0].set_value(page)
+    times = []
+    for _ in range(repeat + 1):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+        if at.exception: raise RuntimeError(at.exception[0].value)
+    main_messages, main_size = count_deltas(at.main)
+    return {"page": page, "messages": main_messages, "bytes": main_size,
+            "first_s": times[0], "rerun_s": statistics.median(times[1:])}, at
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", default=PAGES[0], help="頁面名稱或開頭 (例如 🔮)")
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--session", action="store_true", help="所有頁面一個 session 的位元組報告")
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args(argv)
+    if args.session:
+        print_session(session(reruns=args.reruns), args.reruns)
+        return 0
+    pages = PAGES if args.all else [p for p in PAGES if p.startswith(args.page)]
+    if not pages:
+        print(f"找不到頁面 {args.page}")
+        return 1
+    at = None
+    print(f"{'頁面':<16} {'訊息數':>6} {'KB':>8} {'首次 ms':>9} {'rerun ms':>9}")
+    for page in pages:
+        r, at = measure(page, args.repeat, at)
+        print(f"{page:<16} {r['messages']:>6} {r['bytes'] / 1024:>8.1f} {r['first_s'] * 1000:>9.1f} {r['rerun_s'] * 1000:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT_DIR)
+    sys.exit(main())
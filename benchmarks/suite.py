@@ -0,0 +1,316 @@
+"""基準測試組：計算核心 (單筆與百萬筆批次)、資料載入 (冷 / 熱) 與卡片 HTML 產生，不需 Streamlit
+
+    python -m benchmarks.suite                    # 執行並與 benchmarks/baseline.json 比較
+    python -m benchmarks.suite --save             # 執行並覆寫基準
+    python -m benchmarks.suite -k oracle -k load  # 只跑名稱含 oracle 或 load 的項目
+    python -m benchmarks.suite --batch-size 100000 --threshold 1.5
+
+每個項目重複 --repeat 次取最小值 (較不受其他行程干擾；單筆項目每次呼叫 N 次再平均)。
+比基準慢超過 threshold 倍 (預設 1.25) 的項目標為回歸，結束碼為 1；
+基準記錄了機器資訊，在不同機器上比較時只作參考。
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 1.25
+BIRTH = datetime.date(1985, 10, 24)
+TODAY = datetime.date(2026, 10, 18)
+
+CASES = []
+
+
+def case(name, number=1, batch=False, threshold=None):
+    """登錄基準項目；fn(ctx) 回傳要計時的無參數函式 (準備工作不計時)。
+    threshold 可放寬個別項目 (奈秒級或讀磁碟的項目在共用機器上波動較大)"""
+    def register(fn):
+        CASES.append((name, number, batch, threshold, fn))
+        return fn
+    return register
+
+
+class Context:
+    def __init__(self, batch_size):
+        from synchronotron.data import DataRegistry
+        self.batch_size = batch_size
+        self.db = DataRegistry().preload()
+        self._dates = None
+
+    @property
+    def dates(self):
+        if self._dates is None:
+            rng = np.random.default_rng(0)
+            start = np.datetime64("1900-01-01")
+            self._dates = start + rng.integers(0, 365 * 200, self.batch_size).astype("timedelta64[D]")
+        return self._dates
+
+
+# ---------- 單筆 ----------
+@case("calculate_kin_num", number=20000)
+def _kin_num(ctx):
+    from synchronotron.core import calculate_kin_num
+    return lambda: calculate_kin_num(BIRTH.year, BIRTH.month, BIRTH.day, ctx.db)
+
+
+@case("calculate_oracle", number=5000)
+def _oracle(ctx):
+    from synchronotron.core import calculate_oracle
+    return lambda: calculate_oracle(164, ctx.db)
+
+
+@case("get_kin_details", number=20000)
+def _details(ctx):
+    from synchronotron.core import get_kin_details
+    return lambda: get_kin_details(164, ctx.db)
+
+
+@case("get_psi_kin", number=500)
+def _psi(ctx):
+    from synchronotron.core import get_psi_kin
+    return lambda: get_psi_kin(BIRTH, 164, ctx.db)
+
+
+@case("calculate_synchronotron_data", number=2000)
+def _sync(ctx):
+    from synchronotron.core import calculate_synchronotron_data
+    return lambda: calculate_synchronotron_data(TODAY, 164, ctx.db)
+
+
+@case("get_wavespell_data", number=2000)
+def _wavespell(ctx):
+    from synchronotron.core import get_wavespell_data
+    return lambda: get_wavespell_data(164)
+
+
+@case("light_points.chart (八個光點)", number=5000)
+def _light_points(ctx):
+    lp = ctx.db['light_points']
+    return lambda: lp.chart(TODAY, 164)
+
+
+@case("calendar.record", number=5000)
+def _calendar(ctx):
+    cal = ctx.db['calendar']
+    return lambda: cal.record(TODAY)
+
+
+# ---------- 批次 ----------
+@case("batch kin_numbers", batch=True)
+def _batch_kin(ctx):
+    from synchronotron.batch import kin_numbers
+    return lambda: kin_numbers(ctx.dates)
+
+
+@case("batch compute_blueprints (主印記/神諭/女神/PSI)", batch=True)
+def _batch_blueprints(ctx):
+    from synchronotron.batch import compute_blueprints
+    return lambda: compute_blueprints(ctx.dates)
+
+
+def _per_unique_kin(ctx, func):
+    """整批日期 -> KIN，只對出現過的 KIN 呼叫 func，再依原順序收集結果"""
+    from synchronotron.batch import kin_numbers
+    kins = kin_numbers(ctx.dates)
+
+    def run():
+        uniq, inverse = np.unique(kins, return_inverse=True)
+        results = np.empty(len(uniq), dtype=object)
+        results[:] = [func(int(k)) for k in uniq]
+        return results[inverse]
+    return run
+
+
+@case("batch get_kin_details (唯一 KIN 後收集)", batch=True)
+def _batch_details(ctx):
+    from synchronotron.core import get_kin_details
+    return _per_unique_kin(ctx, lambda k: get_kin_details(k, ctx.db))
+
+
+@case("batch synchronotron (MCF/BMU)", batch=True)
+def _batch_sync(ctx):
+    from synchronotron.batch import kin_numbers
+    matrix = ctx.db['matrix441']
+    kins = kin_numbers(ctx.dates)
+    return lambda: matrix.synchronotron_dates(ctx.dates, kins)
+
+
+@case("batch light_points (八個光點)", batch=True)
+def _batch_light_points(ctx):
+    from synchronotron.batch import kin_numbers
+    lp = ctx.db['light_points']
+    kins = kin_numbers(ctx.dates)
+    return lambda: lp.chart_dates(ctx.dates, kins)
+
+
+@case("batch get_wavespell_data (唯一 KIN 後收集)", batch=True)
+def _batch_wavespell(ctx):
+    from synchronotron.core import get_wavespell_data
+    return _per_unique_kin(ctx, get_wavespell_data)
+
+
+# ---------- 資料載入 ----------
+@case("load_data 冷啟動 (資料包)")
+def _load_cold_bundle(ctx):
+    from synchronotron.data import DataRegistry
+    return lambda: DataRegistry(auto_rebuild=False).preload()
+
+
+@case("load_data 冷啟動 (CSV)")
+def _load_cold_csv(ctx):
+    from synchronotron.data import DataRegistry
+    missing = os.path.join(tempfile.gettempdir(), "synchronotron-no-bundle")
+    return lambda: DataRegistry(bundle_path=missing, auto_rebuild=False).preload()
+
+
+@case("load_data 熱 (已載入)", number=20000, threshold=1.5)
+def _load_warm(ctx):
+    db = ctx.db
+    return lambda: (db['kin_index'], db['psi'], db['matrix441'])
+
+
+# ---------- 渲染 ----------
+@case("kin_card_html 冷 (記憶體快取清空)", number=20, threshold=2.0)
+def _card_cold(ctx):
+    from synchronotron import assets, render
+
+    def run():
+        assets.thumbnail.cache_clear()
+        assets._data_uri.cache_clear()
+        return render.kin_card_html("主印記", 164, "#FFFFFF")
+    return run
+
+
+@case("kin_card_html 熱", number=5000)
+def _card_warm(ctx):
+    from synchronotron import render
+    render.kin_card_html("主印記", 164, "#FFFFFF")
+    return lambda: render.kin_card_html("主印記", 164, "#FFFFFF")
+
+
+@case("analysis_html 冷 (神諭十字 + 波符，快取清空)", number=20, threshold=2.0)
+def _analysis_cold(ctx):
+    from synchronotron import assets, render
+
+    def run():
+        for fn in (render.analysis_html, render.oracle_cross_html, render.wavespell_html, assets.thumbnail, assets._data_uri):
+            fn.cache_clear()
+        return render.analysis_html(164)
+    return run
+
+
+@case("analysis_html 熱 (LRU 命中)", number=20000, threshold=1.5)
+def _analysis_warm(ctx):
+    from synchronotron import render
+    render.analysis_html(164)
+    return lambda: render.analysis_html(164)
+
+
+@case("board 狀態圖 (對照表命中)", number=20000, threshold=1.5)
+def _board_hit(ctx):
+    board = ctx.db['board']
+    board.compass_1320_image(164)
+    return lambda: board.compass_1320_image(164)
+
+
+@case("board 合成 (13:20 羅盤，不含編碼)", number=50, threshold=1.5)
+def _board_render(ctx):
+    board = ctx.db['board']
+    return lambda: board.render_compass_1320(164)
+
+
+def measure(fn, number, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number): fn()
+        times.append((time.perf_counter() - start) / number)
+    return min(times)
+
+
+def machine():
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "processor": platform.processor(), "cpus": os.cpu_count()}
+
+
+def run(patterns=(), batch_size=1_000_000, repeat=7):
+    ctx = Context(batch_size)
+    results = {}
+    for name, number, batch, threshold, setup in CASES:
+        if patterns and not any(p.lower() in name.lower() for p in patterns): continue
+        fn = setup(ctx)
+        fn()  # 暖身 (不計時)
+        seconds = measure(fn, number, repeat)
+        results[name] = {"seconds": seconds, "per_item_ns": seconds / batch_size * 1e9 if batch else None,
+                         "threshold": threshold}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """回傳 [(名稱, 本次秒數, 基準秒數或 None, 倍率或 None, 是否回歸)]"""
+    rows = []
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append((name, r["seconds"], None, None, False))
+            continue
+        ratio = r["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        rows.append((name, r["seconds"], base["seconds"], ratio, ratio > max(threshold, r["threshold"] or 0)))
+    return rows
+
+
+def _fmt(seconds):
+    if seconds is None: return "—"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale: return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="patterns", action="append", default=[], help="只跑名稱含此字串的項目")
+    parser.add_argument("--batch-size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="把本次結果寫成新的基準")
+    args = parser.parse_args(argv)
+
+    results = run(args.patterns, args.batch_size, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f: baseline = json.load(f)
+    if baseline and baseline.get("batch_size") != args.batch_size:
+        print(f"⚠️ 基準的批次大小為 {baseline.get('batch_size')}，批次項目的比較僅供參考")
+    if baseline and baseline.get("machine") != machine():
+        print("⚠️ 基準是在不同的機器 / 版本上量測的，比較僅供參考")
+
+    rows = compare(results, baseline, args.threshold)
+    print(f"{'項目':<44} {'本次':>10} {'基準':>10} {'倍率':>6}")
+    for name, now, base, ratio, regressed in rows:
+        flag = "  ✗ 回歸" if regressed else ""
+        print(f"{name:<44} {_fmt(now):>10} {_fmt(base):>10} {('%.2f' % ratio) if ratio else '—':>6}{flag}")
+
+    if args.save:
+        merged = dict(baseline.get("results", {})) if baseline.get("batch_size") == args.batch_size else {}
+        merged.update(results)
+        out = {"created": datetime.datetime.now().isoformat(timespec="seconds"), "machine": machine(),
+               "batch_size": args.batch_size, "repeat": args.repeat, "results": merged}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"已寫入基準 {args.baseline}")
+        return 0
+    return 1 if any(r[4] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""以 ASGI 伺服器執行 app.py，並替 app/static 的內容雜湊檔加上長效快取標頭
+
+    uvicorn serve:app --host 0.0.0.0 --port 8501
+
+`streamlit run app.py` 的 app/static 路由不送 Cache-Control，瀏覽器只能靠 ETag / Last-Modified 重新驗證；
+檔名含內容雜湊的檔案 (synchronotron.assets 產生，內容變了網址就變) 可以放心快取一年，
+這裡的 middleware 替它們回 `public, max-age=31536000, immutable`。需要提供 st.App 的 Streamlit 版本。
+"""
+import re
+
+import streamlit as st
+from starlette.middleware import Middleware
+
+from synchronotron import assets
+
+HASHED_STATIC = re.compile(rf"/app/static/[^/]+\.[0-9a-f]{{{assets.HASH_LEN}}}\.\w+$")
+CACHE_CONTROL = b"public, max-age=31536000, immutable"
+
+
+class ImmutableStaticMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not HASHED_STATIC.search(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        async def send_with_cache(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"cache-control"]
+                message["headers"] = headers + [(b"cache-control", CACHE_CONTROL)]
+            await send(message)
+        await self.app(scope, receive, send_with_cache)
+
+
+app = st.App("app.py", middleware=[Middleware(ImmutableStaticMiddleware)])
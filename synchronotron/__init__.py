@@ -0,0 +1,40 @@
+"""13 Moon Synchronotron 運算核心 (不依賴 Streamlit，可供批次作業與服務匯入)
+
+匯入本套件不會載入 NumPy / pandas / Streamlit；下列名稱在第一次存取時才匯入所屬模組：
+
+    from synchronotron import kin_of, calculate_oracle, DataRegistry
+
+匯入時間目標：python -m synchronotron import-time
+"""
+import importlib
+
+# 名稱 → 所屬子模組
+_EXPORTS = {
+    **dict.fromkeys(("kin_num", "kin_of", "tone_of", "seal_of", "kin_from_tone_seal", "oracle_kins",
+                     "goddess_kin", "relationship_kin", "moon_date_of", "moon_year_of", "flow_year"), "kin_engine"),
+    **dict.fromkeys(("calculate_kin_num", "get_kin_details", "calculate_oracle", "get_psi_kin",
+                     "calculate_goddess_force", "get_13moon_date", "calculate_flow_year_kin", "get_daily_energy",
+                     "calculate_today_kin", "calculate_relationship", "get_heptad_gate_info",
+                     "calculate_synchronotron_data", "get_wavespell_data", "parse_date_safe"), "core"),
+    "DataRegistry": "data",
+    "compute_blueprints": "batch",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        # 子模組 (synchronotron.batch 等) 也在第一次存取時才匯入
+        try: return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}": raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
@@ -0,0 +1,66 @@
+"""命令列工具
+
+    python -m synchronotron build-bundle     重建二進位資料包
+    python -m synchronotron build-thumbs     預先產生圖騰/調性縮圖與 static/ 的內容雜湊檔、sprite
+    python -m synchronotron build-board      預先產生國王棋盤與 13:20 / 13:28 羅盤的每日狀態圖
+    python -m synchronotron self-check       逐日比對 KIN 引擎與 CSV 查表
+    python -m synchronotron import-time      量測純運算模組的匯入時間 (新行程，目標 < 50 ms、不載入 NumPy / pandas)
+"""
+import os
+import subprocess
+import sys
+
+# 純運算子集：不需 NumPy / pandas 就能計算 KIN、神諭、13 月亮日期與流年
+PURE_MODULES = ("synchronotron", "synchronotron.kin_engine", "synchronotron.core", "synchronotron.data")
+HEAVY_MODULES = ("numpy", "pandas", "streamlit", "pyarrow")
+IMPORT_BUDGET_MS = 50
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time(module, runs=5):
+    """在新的 Python 行程中匯入 module，回傳 (最短毫秒數, 被連帶載入的大型套件)"""
+    code = (f"import sys, time; t = time.perf_counter(); import {module}; "
+            f"ms = (time.perf_counter() - t) * 1000; "
+            f"print(ms, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    best, heavy = float("inf"), ""
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT_DIR)
+        ms, _, loaded = out.stdout.strip().partition(" ")
+        best, heavy = min(best, float(ms)), loaded or heavy
+    return best, heavy
+
+
+def check_import_time(budget_ms=IMPORT_BUDGET_MS):
+    failed = False
+    for module in PURE_MODULES:
+        ms, heavy = import_time(module)
+        ok = ms <= budget_ms and not heavy
+        failed |= not ok
+        print(f"{'✓' if ok else '✗'} {module:<26} {ms:6.1f} ms" + (f"  (載入了 {heavy})" if heavy else ""))
+    print(f"目標：每個模組 < {budget_ms} ms，且不載入 {' / '.join(HEAVY_MODULES)}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    cmd, rest = (argv[0], argv[1:]) if argv else ("", [])
+    if cmd == "build-bundle":
+        from synchronotron import bundle
+        return bundle.main(rest)
+    if cmd == "build-thumbs":
+        from synchronotron import assets
+        return assets.main(["build", *rest])
+    if cmd == "build-board":
+        from synchronotron import board
+        return board.main(["build", *rest])
+    if cmd == "import-time":
+        return check_import_time(float(rest[0]) if rest else IMPORT_BUDGET_MS)
+    if cmd == "self-check":
+        from synchronotron import kin_engine
+        return kin_engine.main(["--self-check", *rest])
+    print(__doc__)
+    return 0 if not cmd else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
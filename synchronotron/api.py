@@ -0,0 +1,192 @@
+"""REST/JSON API：以 synchronotron.core 的計算函式提供 KIN、神諭、PSI、女神、流年、合盤與 MCF/BMU
+
+    pip install -r requirements-api.txt
+    uvicorn synchronotron.api:app --workers 4
+
+- 單筆查詢以日期為鍵放在 LRU 快取 (已序列化的 JSON 位元組)，重複的日期不再計算。
+- 批次端點一次最多 MAX_BATCH 個日期 (或 出生日 × 日期 格數)，以 NumPy 向量化計算。
+- 會做計算的端點 (單筆快取未命中時也要查 pandas 表) 一律宣告為 def，由 FastAPI 在執行緒池中執行，
+  不會阻塞事件迴圈；只有 /health 是 async def。
+"""
+import contextlib
+import datetime
+import functools
+import json
+import os
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from synchronotron import kin_engine
+from synchronotron.core import (
+    calculate_kin_num, get_kin_details, calculate_oracle, get_psi_kin, calculate_goddess_force,
+    get_13moon_date, calculate_flow_year_kin, calculate_relationship, calculate_synchronotron_data
+)
+
+MAX_BATCH = int(os.environ.get("API_MAX_BATCH", 5000))
+CACHE_SIZE = int(os.environ.get("API_CACHE_SIZE", 8192))
+
+
+@functools.lru_cache(maxsize=1)
+def get_db():
+    from synchronotron.data import DataRegistry
+    return DataRegistry().preload()
+
+
+def _jsonable(value):
+    """numpy 純量、NaN、日期 → JSON 可序列化的值"""
+    if isinstance(value, dict): return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)): return [_jsonable(v) for v in value]
+    if isinstance(value, (datetime.date, np.datetime64)): return str(value)
+    if hasattr(value, "item"): value = value.item()
+    if isinstance(value, float) and value != value: return None
+    return value
+
+
+def _json(payload):
+    return json.dumps(_jsonable(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _respond(body):
+    return Response(body, media_type="application/json")
+
+
+def parse_date(value, field="date"):
+    try: return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(422, f"{field} 需為 YYYY-MM-DD：{value!r}")
+
+
+def parse_date_list(values, field="dates"):
+    from synchronotron.importer import parse_dates
+    dates = parse_dates(values)
+    bad = np.flatnonzero(np.isnat(dates))
+    if len(bad): raise HTTPException(422, f"{field} 第 {bad[:10].tolist()} 筆日期無效")
+    return dates
+
+
+def _oracle_summary(oracle):
+    return {role: {"KIN": d.get("KIN"), "主印記": d.get("主印記")} for role, d in oracle.items()}
+
+
+# ---------- 單筆 (LRU 快取) ----------
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def kin_json(kin):
+    db = get_db()
+    oracle = calculate_oracle(kin, db)
+    return _json({
+        "KIN": kin, "tone": kin_engine.tone_of(kin), "seal": kin_engine.seal_of(kin),
+        "details": get_kin_details(kin, db), "oracle": _oracle_summary(oracle),
+        "goddess": calculate_goddess_force(oracle, db),
+    })
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def date_json(date):
+    db = get_db()
+    kin = calculate_kin_num(date.year, date.month, date.day, db)
+    oracle = calculate_oracle(kin, db)
+    psi, psi_source = get_psi_kin(date, kin, db)
+    label, moon, day, week = get_13moon_date(date)
+    return _json({
+        "date": date, "KIN": kin, "details": get_kin_details(kin, db), "oracle": _oracle_summary(oracle),
+        "psi": {"KIN": psi, "source": psi_source, "details": get_kin_details(psi, db)},
+        "goddess": calculate_goddess_force(oracle, db),
+        "moon_date": {"label": label, "moon": moon, "day": day, "heptad_week": week},
+    })
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def flow_year_json(birth, ref):
+    year, info = calculate_flow_year_kin(birth, get_db(), ref)
+    return _json({"birth": birth, "ref": ref, "year": year, "KIN": info.get("KIN"), "details": info})
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def synchronotron_json(date, birth):
+    kin = kin_engine.kin_of(birth)
+    data = calculate_synchronotron_data(date, kin, get_db())
+    if data is None: return _json({"date": date, "birth": birth, "KIN": kin, "MCF": None, "BMU": None})
+    return _json({"date": date, "birth": birth, "KIN": kin, "MCF": data["MCF"], "BMU": data["BMU"],
+                  "KIN_EQUIV": data["KIN_EQUIV"], "logs": data["logs"]})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    get_db()  # 每個 worker 啟動時先載入資料，第一個請求不必等待
+    yield
+
+
+app = FastAPI(title="13 Moon Synchronotron API", version="1", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "cache": date_json.cache_info()._asdict()}
+
+
+@app.get("/v1/kin/{kin}")
+def kin(kin: int):
+    if not 1 <= kin <= 260: raise HTTPException(422, "KIN 需介於 1-260")
+    return _respond(kin_json(kin))
+
+
+@app.get("/v1/date/{date}")
+def blueprint(date: str):
+    return _respond(date_json(parse_date(date)))
+
+
+@app.get("/v1/flow-year")
+def flow_year(birth: str, ref: str = Query(None, description="參考日期，預設為今天")):
+    ref_date = parse_date(ref, "ref") if ref else datetime.date.today()
+    return _respond(flow_year_json(parse_date(birth, "birth"), ref_date))
+
+
+@app.get("/v1/relationship")
+def relationship(a: str, b: str):
+    db = get_db()
+    kins = [kin_engine.kin_of(parse_date(v, f)) for f, v in (("a", a), ("b", b))]
+    rel = calculate_relationship(*kins, db)
+    return _respond(_json({"KIN_A": kins[0], "KIN_B": kins[1], **rel}))
+
+
+@app.get("/v1/synchronotron")
+def synchronotron(date: str, birth: str):
+    return _respond(synchronotron_json(parse_date(date), parse_date(birth, "birth")))
+
+
+# ---------- 批次 ----------
+class DatesRequest(BaseModel):
+    dates: list[str]
+
+
+class SweepRequest(BaseModel):
+    birth_dates: list[str]
+    dates: list[str]
+
+
+@app.post("/v1/batch/blueprints")
+def batch_blueprints(req: DatesRequest):
+    """每個日期的主印記、五大神諭、女神、PSI 與 13 月亮日期 (欄式輸出)"""
+    from synchronotron.batch import compute_blueprints, moon_date_arrays, split_dates
+    if len(req.dates) > MAX_BATCH: raise HTTPException(413, f"一次最多 {MAX_BATCH} 個日期")
+    dates = parse_date_list(req.dates)
+    out = compute_blueprints(dates)
+    _, month, day = split_dates(dates)
+    moon, moon_day, week = moon_date_arrays(month, day)
+    columns = {name: out[name].tolist() for name in out.dtype.names if name != "date"}
+    columns.update(moon=moon.tolist(), moon_day=moon_day.tolist(), heptad_week=week.tolist())
+    return _respond(_json({"dates": np.datetime_as_string(dates, unit="D").tolist(), **columns}))
+
+
+@app.post("/v1/batch/synchronotron")
+def batch_synchronotron(req: SweepRequest):
+    """出生日 × 日期 的 MCF/BMU 網格 (出生日為外層)"""
+    from synchronotron.sweep import sweep_block
+    if len(req.birth_dates) * len(req.dates) > MAX_BATCH:
+        raise HTTPException(413, f"出生日 × 日期 最多 {MAX_BATCH} 格")
+    out = sweep_block(parse_date_list(req.birth_dates, "birth_dates"), parse_date_list(req.dates))
+    return _respond(_json({name: (np.datetime_as_string(out[name], unit="D") if out[name].dtype.kind == "M"
+                                  else out[name]).tolist() for name in out.dtype.names}))
@@ -0,0 +1,344 @@
+"""圖片資源管線：檔名解析、縮圖與 data URI 快取
+
+assets/seals 的原圖每張約 1.7 MB (1024×1024)，卡片上只顯示 40–60 px。
+這裡把圖片縮成顯示尺寸 (預設 2 倍解析度以支援高 DPI 螢幕)，
+以 WebP 編碼 (Pillow 不支援時改用 PNG)，並以 (路徑, 寬度) 為鍵快取成 data URI。
+
+啟用 Streamlit 靜態檔 (.streamlit/config.toml 的 server.enableStaticServing) 時改為瀏覽器可快取的檔案：
+縮圖寫到 static/ 並以內容雜湊命名 (app/static/名稱.雜湊.webp，內容變了網址就變)，
+20 個圖騰與 13 個調性另外拼成一張 sprite，整個神諭十字只需抓一次圖。
+未啟用時 (或在 Streamlit 以外) 維持 data URI。
+
+預先產生所有縮圖與靜態檔：python -m synchronotron.assets build
+"""
+import base64
+import contextlib
+import functools
+import hashlib
+import io
+import os
+import sys
+import threading
+from collections import namedtuple
+from urllib.parse import quote, unquote
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THUMB_DIR = os.path.join(ROOT_DIR, ".cache", "thumbs")
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+STATIC_URL = "app/static"     # 相對網址：設定 server.baseUrlPath 時仍正確
+HASH_LEN = 10
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+SCALE = 2
+
+# 卡片上的顯示寬度 (px)
+SEAL_CARD_WIDTH = 60
+TONE_CARD_WIDTH = 40
+WAVESPELL_THUMB_WIDTH = 40   # 波符路徑每一列的圖騰
+SPRITE_SEALS_PER_ROW = 10
+
+# 👑 國王棋盤 / 🏰 時間地圖 的 st.image 顯示寬度 (use_column_width 的圖以原圖寬度為上限)
+TOKEN_WIDTHS = {
+    "assets/tokens/telektonon_board.jpg": 800, "assets/tokens/gk_sp_flow.jpg": 700,
+    "assets/tokens/yellow_white_path_1_6.jpg": 400, "assets/tokens/heaven_reunion_path.jpg": 400,
+    "assets/tokens/warrior_yellow_white_path.jpg": 400,
+    "assets/tokens/compass_1320.jpg": 300, "assets/tokens/compass_1328.jpg": 300,
+    "assets/tokens/particle_white.png": 50, "assets/tokens/particle_black.png": 50,
+    "assets/tokens/turtle_yellow.png": 80, "assets/tokens/turtle_white.png": 80, "assets/tokens/turtle_green.png": 80,
+    "assets/tokens/pyramid_red.png": 100, "assets/tokens/pyramid_white.png": 100, "assets/tokens/pyramid_blue.png": 100,
+    "assets/tokens/pyramid_yellow.png": 100, "assets/tokens/pyramid_green.png": 100,
+    "assets/tokens/crystal.png": 80, "assets/tokens/crystal_battery.jpg": 200,
+}
+
+
+def resolve_asset(path):
+    """回傳實際存在的檔案路徑；副檔名不符時 (例如要 .jpg 但只有 .png) 依序嘗試其他圖片格式"""
+    if not path: return None
+    candidates = [path, os.path.join(ROOT_DIR, path)]
+    for p in candidates:
+        if os.path.exists(p): return p
+    for p in candidates:
+        stem = os.path.splitext(p)[0]
+        for ext in IMAGE_EXTS:
+            if os.path.exists(stem + ext): return stem + ext
+    return None
+
+
+def seal_path(seal_idx):
+    return resolve_asset(f"assets/seals/{seal_idx:02d}.png")
+
+
+def tone_path(tone_idx):
+    return resolve_asset(f"assets/tones/tone-{tone_idx}.png")
+
+
+class AssetStats:
+    """一次 rerun 送出的圖片位元組數 (原檔 vs 縮圖)"""
+    __slots__ = ("images", "original_bytes", "served_bytes")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.images = 0
+        self.original_bytes = 0
+        self.served_bytes = 0
+
+    def record(self, original, served):
+        self.images += 1
+        self.original_bytes += original
+        self.served_bytes += served
+
+    def add(self, other):
+        self.images += other.images
+        self.original_bytes += other.original_bytes
+        self.served_bytes += other.served_bytes
+
+    @property
+    def saved_bytes(self):
+        return self.original_bytes - self.served_bytes
+
+    def summary(self):
+        return (f"{self.images} 張圖片：原檔 {self.original_bytes / 1024:,.0f} KB → "
+                f"送出 {self.served_bytes / 1024:,.0f} KB (節省 {self.saved_bytes / 1024:,.0f} KB)")
+
+
+_local = threading.local()
+
+
+def page_stats():
+    """目前執行緒 (即目前這位使用者的 rerun) 的統計；Streamlit 每個 session 各自一條執行緒"""
+    s = getattr(_local, "stats", None)
+    if s is None: s = _local.stats = AssetStats()
+    return s
+
+
+@contextlib.contextmanager
+def capture_stats():
+    """區塊內的圖片統計改記到一份新的 AssetStats (給有快取的 HTML：快取命中時由呼叫端再記入 page_stats)"""
+    prev = getattr(_local, "stats", None)
+    captured = _local.stats = AssetStats()
+    try: yield captured
+    finally: _local.stats = prev
+
+
+def _thumb_cache_path(path, width, ext):
+    rel = os.path.relpath(os.path.abspath(path), ROOT_DIR)
+    stem = os.path.splitext(rel)[0].replace(os.sep, "_")
+    return os.path.join(THUMB_DIR, f"{stem}_{width}{ext}")
+
+
+def _encode_thumbnail(path, width):
+    from PIL import Image, features
+    with Image.open(path) as im:
+        target = width * SCALE
+        if im.width > target:
+            im = im.resize((target, max(1, round(im.height * target / im.width))), Image.LANCZOS)
+        buf = io.BytesIO()
+        if features.check("webp"):
+            im.save(buf, "WEBP", quality=85, method=6)
+            return buf.getvalue(), ".webp"
+        im.save(buf, "PNG", optimize=True)
+        return buf.getvalue(), ".png"
+
+
+@functools.lru_cache(maxsize=256)
+def thumbnail(path, width):
+    """回傳 (圖片位元組, 副檔名)；優先讀磁碟快取，沒有 Pillow 時退回原檔"""
+    for ext in (".webp", ".png"):
+        cached = _thumb_cache_path(path, width, ext)
+        if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+            with open(cached, "rb") as f: return f.read(), ext
+    try:
+        data, ext = _encode_thumbnail(path, width)
+    except ImportError:
+        with open(path, "rb") as f: data = f.read()
+        return data, os.path.splitext(path)[1].lower()
+    try:
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        with open(_thumb_cache_path(path, width, ext), "wb") as f: f.write(data)
+    except OSError: pass
+    return data, ext
+
+
+def thumbnail_bytes(path, width):
+    """給 st.image 使用的縮圖位元組；檔案不存在回傳 None"""
+    real = resolve_asset(path)
+    if not real: return None
+    data, _ = thumbnail(real, width)
+    page_stats().record(os.path.getsize(real), len(data))
+    return data
+
+
+@functools.lru_cache(maxsize=256)
+def _data_uri(path, width):
+    data, ext = thumbnail(path, width)
+    return f"data:{MIME_TYPES.get(ext, 'image/png')};base64,{base64.b64encode(data).decode()}"
+
+
+def data_uri(path, width):
+    """縮圖的 data URI (可直接放進 <img src>)；檔案不存在回傳 None"""
+    real = resolve_asset(path)
+    if not real: return None
+    uri = _data_uri(real, width)
+    # 原本的做法是整個檔案 base64 內嵌，約為檔案大小的 4/3
+    page_stats().record(os.path.getsize(real) * 4 // 3, len(uri))
+    return uri
+
+
+# ==========================================
+# 靜態檔 (內容雜湊網址) 與 sprite
+# ==========================================
+_static = False
+Sprite = namedtuple("Sprite", "url width height cells")   # cells: {("seal" | "tone", 編號): (x, y, 寬, 高)}
+
+
+def use_static(enabled):
+    """切換為靜態檔網址 (需 server.enableStaticServing)；回傳是否有變動 (有變動時 HTML 快取要清空)"""
+    global _static
+    changed, _static = bool(enabled) != _static, bool(enabled)
+    return changed
+
+
+def static_enabled():
+    return _static
+
+
+def write_static(stem, data, ext):
+    """以內容雜湊命名寫入 static/ (已存在就不重寫)，回傳相對網址"""
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LEN]}{ext}"
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as f: f.write(data)
+        os.replace(path + ".tmp", path)
+    return f"{STATIC_URL}/{quote(name)}"
+
+
+def static_file(url):
+    """app/static/ 網址 → static/ 中的檔案路徑"""
+    return os.path.join(STATIC_DIR, unquote(url.rsplit("/", 1)[1]))
+
+
+def static_source(url):
+    """st.image 用：已寫進 static/ 的檔案 (write_static 的網址)，未啟用靜態檔時改給檔案路徑；url 為 None 時回傳 None"""
+    if not url: return None
+    return "/" + url if _static else static_file(url)
+
+
+@functools.lru_cache(maxsize=256)
+def _static_url(path, width):
+    data, ext = thumbnail(path, width)
+    stem = os.path.splitext(os.path.basename(_thumb_cache_path(path, width, ext)))[0].replace(" ", "")
+    return write_static(stem, data, ext)
+
+
+def static_url(path, width):
+    """縮圖的靜態檔網址 (給 HTML 的 <img src>)；未啟用靜態檔或檔案不存在回傳 None"""
+    if not _static: return None
+    real = resolve_asset(path)
+    if not real: return None
+    url = _static_url(real, width)
+    page_stats().record(os.path.getsize(real) * 4 // 3, len(url))
+    return url
+
+
+def image_src(path, width):
+    """<img src> 用：靜態檔網址，未啟用時為 data URI；檔案不存在回傳 None"""
+    return static_url(path, width) or data_uri(path, width)
+
+
+def image_source(path, width=None):
+    """st.image 用：靜態檔網址 (/app/static/…)，未啟用時為縮圖位元組；width 預設查 TOKEN_WIDTHS"""
+    width = width or TOKEN_WIDTHS.get(path, 400)
+    url = static_url(path, width)
+    return "/" + url if url else thumbnail_bytes(path, width)
+
+
+@functools.lru_cache(maxsize=1)
+def sprite():
+    """圖騰 (每列 10 個，格寬 SEAL_CARD_WIDTH×SCALE) 與調性 (最後一列，格寬 TONE_CARD_WIDTH×SCALE) 拼成一張圖；
+    缺圖檔或 Pillow 時回傳 None"""
+    try:
+        from PIL import Image, features
+    except ImportError:
+        return None
+    tiles = [("seal", i, seal_path(i), SEAL_CARD_WIDTH) for i in range(1, 21)]
+    tiles += [("tone", i, tone_path(i), TONE_CARD_WIDTH) for i in range(1, 14)]
+    if not all(path for _, _, path, _ in tiles): return None
+    images, cells, x, y, row_h = [], {}, 0, 0, 0
+    for n, (kind, idx, path, width) in enumerate(tiles):
+        im = Image.open(io.BytesIO(thumbnail(path, width)[0])).convert("RGBA")
+        if n == SPRITE_SEALS_PER_ROW or n == 20: x, y, row_h = 0, y + row_h, 0   # 換列 (圖騰第二列、調性列)
+        cells[(kind, idx)] = (x, y, im.width, im.height)
+        images.append((im, x, y))
+        x, row_h = x + im.width, max(row_h, im.height)
+    width = max(cx + w for cx, _, w, _ in cells.values())
+    atlas = Image.new("RGBA", (width, y + row_h), (0, 0, 0, 0))
+    for im, cx, cy in images: atlas.paste(im, (cx, cy))
+    buf, ext = io.BytesIO(), ".png"
+    if features.check("webp"):
+        atlas.save(buf, "WEBP", quality=85, method=6)
+        ext = ".webp"
+    else: atlas.save(buf, "PNG", optimize=True)
+    return Sprite(write_static("sprite", buf.getvalue(), ext), atlas.width, atlas.height, cells)
+
+
+def sprite_style(kind, idx, width):
+    """sprite 中一格的 inline CSS (寬 width px、高依比例)；未啟用靜態檔或沒有 sprite 回傳 None"""
+    if not _static: return None
+    s = sprite()
+    if s is None: return None
+    x, y, w, h = s.cells[(kind, idx)]
+    k = width / w
+    return (f"display: inline-block; width: {width}px; height: {round(h * k)}px; "
+            f"background: url({s.url}) {-x * k:.2f}px {-y * k:.2f}px / {s.width * k:.2f}px {s.height * k:.2f}px no-repeat;")
+
+
+def build(widths=(TONE_CARD_WIDTH, SEAL_CARD_WIDTH, WAVESPELL_THUMB_WIDTH)):
+    """預先產生 seals / tones 的所有縮圖到磁碟快取"""
+    total_in = total_out = 0
+    for folder in ("assets/seals", "assets/tones"):
+        base = os.path.join(ROOT_DIR, folder)
+        for name in sorted(os.listdir(base)):
+            if os.path.splitext(name)[1].lower() not in IMAGE_EXTS: continue
+            path = os.path.join(base, name)
+            total_in += os.path.getsize(path)
+            for w in sorted(set(widths)):
+                data, _ = thumbnail(path, w)
+                total_out += len(data)
+    return total_in, total_out
+
+
+def build_static():
+    """產生 static/ 下的 sprite、大張印記 (80 / 250 px) 與 TOKEN_WIDTHS 的縮圖，
+    並刪除同名但雜湊已過期的舊檔；回傳 {網址: 位元組數}"""
+    s = sprite()
+    urls = [s.url] if s else []
+    jobs = [(seal_path(i), 250) for i in range(1, 21)] + [(tone_path(i), 80) for i in range(1, 14)]
+    jobs += [(resolve_asset(p), w) for p, w in TOKEN_WIDTHS.items()]
+    urls += [_static_url(p, w) for p, w in jobs if p]
+    current = {url.rsplit("/", 1)[1] for url in urls}
+    stems = {name.rsplit(".", 2)[0] for name in current}
+    sizes = {}
+    for name in sorted(os.listdir(STATIC_DIR)):
+        path = os.path.join(STATIC_DIR, name)
+        if quote(name) in current: sizes[f"{STATIC_URL}/{quote(name)}"] = os.path.getsize(path)
+        elif quote(name.rsplit(".", 2)[0]) in stems: os.remove(path)
+    return sizes
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] != ["build"]:
+        print(__doc__)
+        return 0
+    total_in, total_out = build()
+    print(f"縮圖完成：{total_in / 1024 / 1024:.1f} MB → {total_out / 1024:.0f} KB ({THUMB_DIR})")
+    sizes = build_static()
+    print(f"靜態檔完成：{len(sizes)} 個檔案，共 {sum(sizes.values()) / 1024:.0f} KB ({STATIC_DIR})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""向量化批次運算：一次計算大量生日的主印記、五大神諭、女神與 PSI 印記
+
+所有規則先展開成查表陣列 (13×20 調性/圖騰表、260 長度的神諭/女神表、
+月×日 PSI 表)，批次時只做 NumPy 整數運算與索引，不經過逐列 Python 迴圈。
+
+    import numpy as np
+    from synchronotron.batch import compute_blueprints
+    dates = np.array(["1985-10-24", "1994-08-10"], dtype="datetime64[D]")
+    compute_blueprints(dates)                 # 結構化陣列
+    compute_blueprints(dates, as_frame=True)  # pandas DataFrame
+"""
+import csv
+import functools
+import os
+
+import numpy as np
+
+from synchronotron import kin_engine
+
+BLUEPRINT_FIELDS = ("main", "analog", "antipode", "occult", "guide", "goddess", "psi")
+BLUEPRINT_DTYPE = np.dtype([("date", "datetime64[D]")] + [(f, np.int16) for f in BLUEPRINT_FIELDS])
+
+MONTH_ACCUM = np.array(kin_engine.MONTH_ACCUM, dtype=np.int64)
+
+# KIN_BY_TONE_SEAL[tone - 1, seal - 1] = KIN
+KIN_BY_TONE_SEAL = np.array(
+    [[kin_engine.kin_from_tone_seal(t, s) for s in range(1, 21)] for t in range(1, 14)], dtype=np.int16)
+
+# 以 KIN 為索引 (第 0 格保留為 0)：ORACLE_TABLE[kin] = (主, 支持, 挑戰, 隱藏, 指引)
+ORACLE_TABLE = np.array([(0,) * 5] + [kin_engine.oracle_kins(k) for k in range(1, 261)], dtype=np.int16)
+GODDESS_TABLE = np.array([0] + [kin_engine.goddess_kin(k) for k in range(1, 261)], dtype=np.int16)
+
+PSI_CSV = os.path.join(kin_engine.DATA_DIR, "PSI印記對照表.csv")
+
+
+@functools.lru_cache(maxsize=None)
+def psi_table(path=PSI_CSV):
+    """PSI_TABLE[month, day] = PSI KIN；無時間日 (7/25) 與查無資料為 0"""
+    table = np.zeros((13, 32), dtype=np.int16)
+    if not os.path.exists(path): return table
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            try:
+                m, d = row["月日"].rstrip("日").split("月")
+                table[int(m), int(d)] = int(row["PSI印記"])
+            except (KeyError, ValueError): continue
+    return table
+
+
+def split_dates(dates):
+    """datetime64 陣列 → (年, 月, 日) 三個 int64 陣列"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    year = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates - months).astype(np.int64) + 1
+    return year, month, day
+
+
+def kin_numbers(dates):
+    year, month, day = split_dates(dates)
+    return kin_array(year, month, day)
+
+
+def kin_array(year, month, day):
+    """kin_engine.kin_num 的向量化版本"""
+    start = (kin_engine.EPOCH_START_KIN + kin_engine.YEAR_STEP * (year - kin_engine.EPOCH_YEAR)) % 260
+    return ((start + MONTH_ACCUM[month] + day - 1) % 260 + 1).astype(np.int16)
+
+
+MONTH_DOY = np.array(kin_engine.MONTH_DOY, dtype=np.int64)
+
+
+def moon_date_arrays(month, day):
+    """kin_engine.moon_date 的向量化版本：回傳 (月, 日, 七價週)，無時間日與 2/29 皆為 0"""
+    delta = (MONTH_DOY[month] + day - 1 - kin_engine.MOON_NEW_YEAR_DOY) % 365
+    outside = (delta == 364) | ((month == 2) & (day == 29))
+    moon = np.where(outside, 0, delta // 28 + 1)
+    mday = np.where(outside, 0, delta % 28 + 1)
+    week = np.where(outside, 0, delta // 7 + 1)
+    return moon, mday, week
+
+
+def oracle_arrays(kins):
+    """回傳 (主, 支持, 挑戰, 隱藏, 指引) 五個 KIN 陣列"""
+    rows = ORACLE_TABLE[np.asarray(kins)]
+    return tuple(rows[:, i] for i in range(5))
+
+
+def goddess_array(kins):
+    return GODDESS_TABLE[np.asarray(kins)]
+
+
+def psi_array(month, day, main_kins):
+    """同 get_psi_kin：無時間日回傳主印記本身"""
+    psi = psi_table()[month, day]
+    return np.where((month == 7) & (day == 25), main_kins, psi).astype(np.int16)
+
+
+def relationship_array(kins1, kins2):
+    return ((np.asarray(kins1, dtype=np.int64) + np.asarray(kins2) - 1) % 260 + 1).astype(np.int16)
+
+
+def compute_blueprints(dates, as_frame=False):
+    """一次計算整批生日的靈魂藍圖 KIN 欄位"""
+    dates = np.asarray(dates, dtype="datetime64[D]").ravel()
+    year, month, day = split_dates(dates)
+    main = kin_array(year, month, day)
+    out = np.empty(len(dates), dtype=BLUEPRINT_DTYPE)
+    out["date"] = dates
+    rows = ORACLE_TABLE[main]
+    for i, name in enumerate(("main", "analog", "antipode", "occult", "guide")):
+        out[name] = rows[:, i]
+    out["goddess"] = GODDESS_TABLE[main]
+    out["psi"] = psi_array(month, day, main)
+    if as_frame:
+        import pandas as pd
+        return pd.DataFrame(out)
+    return out
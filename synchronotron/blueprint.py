@@ -0,0 +1,124 @@
+"""每位使用者的藍圖快取：以 (生日, 今日) 為鍵，各項結果第一次用到時才計算
+
+    store = BlueprintStore(maxsize=8)        # 放在 st.session_state
+    bp = store.get(birth_date, daily_date, db)
+    bp.begin_rerun()
+    bp.oracle_A, bp.psi_info                 # 只計算頁面實際用到的部分
+    bp.rerun_summary()
+
+切換頁面、展開 expander 等不改變日期的 rerun 只會讀取已算好的值；
+rerun_log 記錄本次 rerun 每一項是重新計算還是沿用，以及花費的時間。
+"""
+import time
+from collections import OrderedDict
+
+from synchronotron.core import (
+    calculate_kin_num, get_kin_details, calculate_oracle, get_psi_kin, calculate_goddess_force,
+    get_13moon_date, calculate_flow_year_kin, get_daily_energy, calculate_today_kin,
+    get_heptad_gate_info, calculate_synchronotron_data
+)
+from synchronotron.star_year import life_chart
+
+def _calendar_or(b, method, fallback):
+    """曆表涵蓋的日期直接查表 (db['calendar'])，其餘即時計算"""
+    cal = b.db['calendar'] if 'calendar' in b.db else None
+    if cal is not None and b.daily_date in cal:
+        value = getattr(cal, method)(b.daily_date)
+        if value is not None: return value
+    return fallback()
+
+
+# 名稱 → (計算函式, 說明)；計算函式接收 Blueprint，可讀取其他項目 (會依需要連帶計算)
+PIECES = {
+    "kin_A": (lambda b: calculate_kin_num(b.birth_date.year, b.birth_date.month, b.birth_date.day, b.db), "主印記"),
+    "info_A": (lambda b: get_kin_details(b.kin_A, b.db), "主印記資料"),
+    "oracle_A": (lambda b: calculate_oracle(b.kin_A, b.db), "五大神諭"),
+    "psi_num": (lambda b: get_psi_kin(b.birth_date, b.kin_A, b.db)[0], "PSI 印記"),
+    "psi_info": (lambda b: get_kin_details(b.psi_num, b.db), "PSI 資料"),
+    "goddess_info": (lambda b: calculate_goddess_force(b.oracle_A, b.db), "女神印記"),
+    "flow_year": (lambda b: calculate_flow_year_kin(b.birth_date, b.db, ref_date=b.daily_date), "流年"),
+    "today_kin_info": (lambda b: calculate_today_kin(b.daily_date, b.db)[1], "今日印記"),
+    "moon_date": (lambda b: _calendar_or(b, "moon_date", lambda: get_13moon_date(b.daily_date)), "13 月亮日期"),
+    "daily_energy": (lambda b: _calendar_or(b, "daily_energy", lambda: get_daily_energy(b.moon_date[1], b.moon_date[2], b.db)), "今日能量"),
+    "today_oracle": (lambda b: calculate_oracle(b.today_kin_info['KIN'], b.db), "今日神諭"),
+    "heptad_info": (lambda b: _calendar_or(b, "heptad_info", lambda: get_heptad_gate_info(b.moon_date[2])), "七價路徑"),
+    "life_chart": (lambda b: life_chart(b.birth_date, b.db), "52 年流年表"),
+    "sync_data": (lambda b: calculate_synchronotron_data(b.daily_date, b.kin_A, b.db), "MCF/BMU"),
+    "light_points": (lambda b: b.db['light_points'].chart(b.daily_date, b.kin_A), "八個光點"),
+}
+
+
+class Blueprint:
+    """單一 (生日, 今日) 的延遲計算結果；屬性名稱見 PIECES"""
+
+    def __init__(self, birth_date, daily_date, db):
+        self.birth_date = birth_date
+        self.daily_date = daily_date
+        self.db = db
+        self.timings = {}
+        self.rerun_log = []
+        self._values = {}
+        self._nested = 0.0
+
+    def __getattr__(self, name):
+        if name not in PIECES: raise AttributeError(name)
+        return self.get(name)
+
+    def get(self, name):
+        if name in self._values:
+            self.rerun_log.append((name, 0.0, True))
+            return self._values[name]
+        outer, self._nested = self._nested, 0.0
+        start = time.perf_counter()
+        try:
+            value = PIECES[name][0](self)
+        finally:
+            total = time.perf_counter() - start
+            own = total - self._nested  # 扣掉連帶計算的其他項目，只記本身的時間
+            self._nested = outer + total
+        self._values[name] = value
+        self.timings[name] = own
+        self.rerun_log.append((name, own, False))
+        return value
+
+    def begin_rerun(self):
+        self.rerun_log = []
+
+    @property
+    def computed(self):
+        return tuple(self._values)
+
+    def rerun_summary(self):
+        """本次 rerun 的 (新算項目數, 沿用項目數, 新算耗時 ms)"""
+        fresh = {n: t for n, t, cached in self.rerun_log if not cached}
+        reused = {n for n, _, cached in self.rerun_log if cached} - set(fresh)
+        return len(fresh), len(reused), sum(fresh.values()) * 1000
+
+    def rerun_table(self):
+        """每一項在本次 rerun 的狀態，給除錯面板顯示"""
+        rows = {}
+        for name, elapsed, cached in self.rerun_log:
+            if name not in rows or not cached:
+                rows[name] = {"項目": PIECES[name][1], "狀態": "沿用" if cached else "計算",
+                              "ms": round(elapsed * 1000, 3)}
+        return list(rows.values())
+
+
+class BlueprintStore:
+    """最多保留 maxsize 份藍圖的 LRU (每個 session 一份 store)"""
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, birth_date, daily_date, db):
+        key = (birth_date, daily_date)
+        bp = self._items.get(key)
+        if bp is None or bp.db is not db:
+            bp = self._items[key] = Blueprint(birth_date, daily_date, db)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize: self._items.popitem(last=False)
+        return bp
+
+    def __len__(self):
+        return len(self._items)
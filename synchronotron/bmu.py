@@ -0,0 +1,122 @@
+"""BMU 註解：任何 BMU (1-441) → 座標、八度音符、腦部、全腦調頻語、烏爾諧波盧恩符文、卓爾金曆 KIN 與銀河易經卦象
+
+五份表 (Base_Matrix_441 / Octave_Scale / Whole_Brain_Tuning / UR_Harmonic_Runes / 銀河易經編碼) 載入時一次
+整理成長度 442 的整數陣列 (索引即 BMU，0 為查無)，文字只存一份在 tuple 裡；查詢不再篩選 DataFrame。
+卦象：BMU 的座標在卓爾金曆矩陣中對應的 KIN → 該 KIN 的諧波 ((KIN-1)//4+1) → 銀河易經編碼的卦象；
+卓爾金曆矩陣只占 441 格中的 260 格，其餘 BMU 沒有 KIN 與卦象。盧恩符文只有 48 個 BMU 有。
+
+    res = db['bmu']
+    res.resolve(291)                  # 單一 BMU 的 dict
+    res.resolve_arrays(bmus)          # 整批：各欄位的代碼陣列 (可直接當索引查文字)
+    res.frame(bmus)                   # 整批：附上文字欄位的 DataFrame
+"""
+import numpy as np
+
+from synchronotron.matrix441 import TZOLKIN, format_pos, parse_pos
+
+NOTES = ("", "Do", "Re", "Mi", "Fa", "Sol", "La", "Si", "Do'")
+
+
+def harmonic_numbers(texts):
+    """銀河易經編碼 的「諧波」欄 (例如「諧波31 \\n共鳴的輸入…」) → 諧波編號陣列，無法解析的為 0"""
+    import pandas as pd
+    nums = pd.Series(texts).astype(str).str.extract(r'諧波\s*(\d+)', expand=False)
+    return pd.to_numeric(nums, errors="coerce").fillna(0).astype(np.int16).to_numpy()
+
+
+def _lookup(names, values):
+    """names → values 中的索引 (+1，0 為查無)"""
+    index = {v: i + 1 for i, v in enumerate(values)}
+    return np.array([index.get(n, 0) for n in names], dtype=np.int16)
+
+
+class BmuResolver:
+    def __init__(self, base_frame=None, octave_frame=None, brain_frame=None, rune_frame=None,
+                 harmonic_map=None, matrix=None):
+        n = 442
+        self.pos = np.zeros((n, 2), dtype=np.int8)
+        self.brain = np.zeros(n, dtype=np.int8)
+        self.brain_names = ()
+        if base_frame is not None:
+            bmus = base_frame['KIN'].to_numpy(dtype=np.int64)
+            ok = (bmus >= 1) & (bmus <= 441)
+            pos = np.array([parse_pos(p) or (0, 0) for p in base_frame['矩陣位置']], dtype=np.int8).reshape(-1, 2)
+            self.pos[bmus[ok]] = pos[ok]
+            if '對應腦部' in base_frame:
+                regions = base_frame['對應腦部'].astype(str).to_numpy()
+                self.brain_names = tuple(dict.fromkeys(regions[ok]))
+                self.brain[bmus[ok]] = _lookup(regions[ok], self.brain_names)
+        # 八度音符依座標 (Octave_Scale.csv)
+        note_at = np.zeros((22, 22), dtype=np.int8)
+        if octave_frame is not None:
+            for note, pos_text in zip(octave_frame['八度音符'], octave_frame['矩陣位置']):
+                pos = parse_pos(pos_text)
+                if pos and note in NOTES: note_at[pos] = NOTES.index(note)
+        self.note = note_at[self.pos[:, 0], self.pos[:, 1]]
+        # 全腦調頻語依腦部名稱
+        tuning = {}
+        if brain_frame is not None:
+            tuning = dict(zip(brain_frame['對應腦部'].astype(str), brain_frame['調頻語'].astype(str)))
+        self.brain_tuning = ("",) + tuple(tuning.get(b, "") for b in self.brain_names)
+        # 盧恩符文：BMU → 列號 (+1)
+        self.rune = np.zeros(n, dtype=np.int16)
+        self.runes = ()
+        if rune_frame is not None:
+            self.runes = tuple(rune_frame.to_dict('records'))
+            bmus = rune_frame['BMU'].to_numpy(dtype=np.int64)
+            ok = (bmus >= 1) & (bmus <= 441)
+            self.rune[bmus[ok]] = np.arange(1, len(bmus) + 1)[ok]
+        # 卓爾金曆 KIN → 諧波 → 卦象
+        self.kin = np.zeros(n, dtype=np.int16)
+        if matrix is not None:
+            self.kin = matrix.values[TZOLKIN][self.pos[:, 0], self.pos[:, 1]].astype(np.int16)
+            self.kin[0] = 0
+        self.harmonic = np.where(self.kin > 0, (self.kin - 1) // 4 + 1, 0).astype(np.int8)
+        harmonics = sorted((h, r) for h, r in (harmonic_map or {}).items() if 1 <= h <= 65)
+        self.hexagrams = tuple(r for _, r in harmonics)
+        self.hexagram_of_harmonic = np.zeros(66, dtype=np.int8)   # 諧波 → 卦象列號 (+1)
+        for i, (h, _) in enumerate(harmonics): self.hexagram_of_harmonic[h] = i + 1
+        self.hexagram = self.hexagram_of_harmonic[self.harmonic]
+
+    @classmethod
+    def from_db(cls, db):
+        return cls(db['base_matrix'], db['octave_scale'], db['brain_tuning'], db['runes'], db['harmonic_map'],
+                   db['matrix441'])
+
+    # ---------- 整批 ----------
+    def resolve_arrays(self, bmus):
+        """BMU 陣列 → {欄位: 陣列}；超出 1-441 的 BMU 各欄皆為 0"""
+        b = np.asarray(bmus, dtype=np.int64)
+        b = np.where((b >= 1) & (b <= 441), b, 0)
+        return {"bmu": b, "pos": self.pos[b], "note": self.note[b], "brain": self.brain[b], "rune": self.rune[b],
+                "kin": self.kin[b], "harmonic": self.harmonic[b], "hexagram": self.hexagram[b]}
+
+    def frame(self, bmus):
+        """BMU 陣列 → DataFrame (座標、音符、腦部、全腦調頻語、盧恩符文、KIN、諧波、卦象)"""
+        import pandas as pd
+        r = self.resolve_arrays(np.ravel(bmus))
+        brains = np.array(("",) + self.brain_names, dtype=object)
+        runes = np.array([{}] + list(self.runes), dtype=object)[r["rune"]]
+        hexagrams = np.array([{}] + list(self.hexagrams), dtype=object)[r["hexagram"]]
+        return pd.DataFrame({
+            "BMU": r["bmu"], "座標": [format_pos(v, h) for v, h in r["pos"]],
+            "音符": np.array(NOTES, dtype=object)[r["note"]], "腦部": brains[r["brain"]],
+            "全腦調頻語": np.array(self.brain_tuning, dtype=object)[r["brain"]],
+            "盧恩符文": [x.get('代號') for x in runes], "符文說明": [x.get('說明') for x in runes],
+            "KIN": r["kin"], "諧波": r["harmonic"],
+            "卦象": [x.get('卦象') for x in hexagrams], "意涵": [x.get('意涵') for x in hexagrams],
+        })
+
+    # ---------- 單筆 ----------
+    def resolve(self, bmu):
+        """單一 BMU 的註解 dict；超出 1-441 回傳 None"""
+        if not 1 <= bmu <= 441: return None
+        v, h = (int(x) for x in self.pos[bmu])
+        brain, rune, hexagram = int(self.brain[bmu]), int(self.rune[bmu]), int(self.hexagram[bmu])
+        return {
+            "BMU": bmu, "座標": format_pos(v, h), "音符": NOTES[self.note[bmu]],
+            "腦部": self.brain_names[brain - 1] if brain else "", "全腦調頻語": self.brain_tuning[brain],
+            "盧恩符文": self.runes[rune - 1] if rune else None,
+            "KIN": int(self.kin[bmu]) or None, "諧波": int(self.harmonic[bmu]) or None,
+            "卦象": self.hexagrams[hexagram - 1] if hexagram else None,
+        }
@@ -0,0 +1,265 @@
+"""Telektonon 棋盤與 13:20 / 13:28 羅盤的每日狀態圖：把烏龜、粒子與水晶合成到底圖上，預先產生並存成靜態檔
+
+格子座標量自三張底圖 (assets/tokens 的 telektonon_board.jpg 800×565、compass_1320.jpg、compass_1328.jpg)：
+  棋盤：12 欄 × 6 列的格線；外圈 28 格 (下排 1-12、右側 13-16、上排 17-28)，左側 4×4 為戰士立方體的 16 宮
+  13:20 羅盤：外圈 20 個圖騰逆時針排列 (圖騰 20 在正上方偏左)，內圈龜殼 13 格為調性
+  13:28 羅盤：外圈 28 天逆時針排列 (第 1 天在正上方偏左)，內圈龜殼 13 格為月亮
+每日位置：
+  黃烏龜：第 n 天在第 n 格 (Yellow_Turtle_Day.csv：地球之旅、Baktun 7-13 …)
+  白烏龜：White_Turtle_Day.csv 的「位置」
+  綠烏龜：Green_Turtle_Day.csv 的「屬宮」(第 7-22 天沿戰士立方體的路徑)，其餘日子站在立方體中間
+  13:20：白粒子在調性、黑粒子在圖騰，水晶放在今日圖騰外側；13:28：白粒子在月亮、黑粒子在第幾天
+
+所有變化 (棋盤 28 張、13:20 共 260 張、13:28 共 13×28 張) 可一次產生：python -m synchronotron build-board
+圖檔以內容雜湊命名寫進 static/ (synchronotron.assets)，對照表存於 .cache/board/manifest.json；
+頁面只查對照表，命中時不需任何繪圖。底圖、棋子、三份 CSV 或座標改變時版本不同，對照表作廢後重新產生。
+
+    board = db['board']
+    board.positions(day)              # {'yellow': 格, 'white': 格, 'green': 宮 (0 為立方體中間)}
+    board.board_image(day)            # app/static/… 網址；沒有 Pillow 或日期無效時為 None
+    board.compass_1320_image(kin)
+    board.compass_1328_image(moon, day)
+"""
+import functools
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+import threading
+
+from synchronotron import assets
+from synchronotron.constants import SEALS_NAME
+
+LAYOUT_VERSION = 1          # 座標或合成方式改變時加一 (對照表與圖檔隨之重新產生)
+MANIFEST_PATH = os.path.join(assets.ROOT_DIR, ".cache", "board", "manifest.json")
+BOARD_IMG = "assets/tokens/telektonon_board.jpg"
+COMPASS_1320_IMG = "assets/tokens/compass_1320.jpg"
+COMPASS_1328_IMG = "assets/tokens/compass_1328.jpg"
+# particle_white.png 其實是黑色的石頭、particle_black.png 是白色的 (檔名與內容相反)
+PARTICLE_WHITE_IMG = "assets/tokens/particle_black.png"
+PARTICLE_BLACK_IMG = "assets/tokens/particle_white.png"
+TOKENS = {
+    "yellow": "assets/tokens/turtle_yellow.png", "white": "assets/tokens/turtle_white.png",
+    "green": "assets/tokens/turtle_green.png", "particle_white": PARTICLE_WHITE_IMG,
+    "particle_black": PARTICLE_BLACK_IMG, "crystal": "assets/tokens/crystal.png",
+}
+TURTLE_SIZE = 30
+PARTICLE_SIZE = 22
+CRYSTAL_SIZE = 20
+STATE_PREFIXES = ("board_d", "compass1320_k", "compass1328_m")   # static/ 中狀態圖的檔名開頭
+
+# 棋盤格線：左上角與格寬 (px)
+BOARD_ORIGIN = (210.0, 164.3)
+BOARD_CELL = 39.3
+# 戰士立方體 16 宮 (欄, 列)，依圖騰 1-16 (紅龍之宮 … 黃戰士之宮) 排列，也就是第 7-22 天走的路徑
+WARRIOR_CUBE = ((4, 4), (4, 3), (4, 2), (4, 1), (3, 1), (2, 1), (1, 1), (1, 2),
+                (1, 3), (1, 4), (2, 4), (3, 4), (3, 3), (3, 2), (2, 2), (2, 3))
+CUBE_CENTER = (2.5, 2.5)
+
+# 羅盤：外圈中心、半徑與格數；內圈龜殼 13 格的中心 (兩張羅盤的排法相同，位置各自量測)
+COMPASS_1320 = {"center": (140.7, 183.3), "radius": 104.6, "cells": 20}
+COMPASS_1328 = {"center": (150.7, 143.3), "radius": 115.7, "cells": 28}
+SHELL_1320 = ((85, 141.7), (73.3, 175), (78.3, 211.7), (96.7, 240), (138.3, 256.7), (181.7, 236.7), (200, 205),
+              (200, 173.3), (190, 141.7), (135, 133.3), (135, 173.3), (136.7, 203.3), (136.7, 230))
+SHELL_1328 = ((85, 93.3), (71.7, 131.7), (78.3, 175), (100, 210), (148.3, 228.3), (200, 205), (218.3, 171.7),
+              (221.7, 128.3), (210, 91.7), (145, 83.3), (145, 131.7), (146.7, 166.7), (146.7, 198.3))
+
+
+def square_cell(n):
+    """外圈第 n 格 (1-28) → 格線 (欄, 列)"""
+    if n <= 12: return n - 1, 5
+    if n <= 16: return 11, 17 - n
+    return 28 - n, 0
+
+
+def cell_xy(col, row):
+    return BOARD_ORIGIN[0] + BOARD_CELL * (col + 0.5), BOARD_ORIGIN[1] + BOARD_CELL * (row + 0.5)
+
+
+def ring_xy(compass, i, extra=0.0):
+    """外圈逆時針第 i 格 (從正上方偏左的第 1 格起) 的中心；extra 為往外多推的半徑"""
+    angle = math.radians(-(i - 0.5) * 360 / compass["cells"])
+    (cx, cy), r = compass["center"], compass["radius"] + extra
+    return cx + r * math.sin(angle), cy - r * math.cos(angle)
+
+
+@functools.lru_cache(maxsize=16)
+def _image(path):
+    from PIL import Image
+    with Image.open(assets.resolve_asset(path)) as im: return im.convert("RGBA")
+
+
+@functools.lru_cache(maxsize=16)
+def _token(key, size):
+    from PIL import Image
+    im = _image(TOKENS[key])
+    im = im.crop(im.getchannel("A").getbbox())   # 去掉透明留白，大小才一致
+    return im.resize((size, max(1, round(im.height * size / im.width))), Image.LANCZOS)
+
+
+def _place(base, key, size, xy):
+    token = _token(key, size)
+    base.alpha_composite(token, (max(0, round(xy[0] - token.width / 2)), max(0, round(xy[1] - token.height / 2))))
+
+
+def _encode(im):
+    from PIL import features
+    buf, ext = io.BytesIO(), ".png"
+    if features.check("webp"):
+        im.convert("RGB").save(buf, "WEBP", quality=85, method=4)
+        ext = ".webp"
+    else: im.convert("RGB").save(buf, "PNG", optimize=True)
+    return buf.getvalue(), ext
+
+
+class BoardStates:
+    def __init__(self, yellow_frame=None, white_frame=None, green_frame=None, manifest_path=MANIFEST_PATH):
+        # 第幾天 → 格 / 宮；表中沒有的日子沒有該烏龜
+        self.yellow = {int(d): int(d) for d in yellow_frame['第幾天']} if yellow_frame is not None else {}
+        self.white = dict(zip(white_frame['第幾天'].astype(int), white_frame['位置'].astype(int))) \
+            if white_frame is not None else {}
+        self.green = {}
+        self.palace_names = {}
+        if green_frame is not None:
+            for d, palace in zip(green_frame['第幾天'].astype(int), green_frame['屬宮'].astype(str)):
+                seal = next((s for s in range(1, 17) if SEALS_NAME[s] in palace), 0)
+                self.green[d] = seal
+                if seal: self.palace_names[seal] = palace
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._version = None
+        self._images = None
+
+    @classmethod
+    def from_db(cls, db):
+        return cls(db['yellow_turtle'], db['white_turtle'], db['green_turtle'])
+
+    # ---------- 位置 ----------
+    def positions(self, day):
+        """{'yellow': 格, 'white': 格, 'green': 宮的圖騰 (0 為立方體中間)}；沒有該烏龜的為 None"""
+        return {"yellow": self.yellow.get(day), "white": self.white.get(day), "green": self.green.get(day)}
+
+    def caption(self, day):
+        p = self.positions(day)
+        parts = [f"{name}第 {p[key]} 格" for key, name in (("yellow", "黃烏龜"), ("white", "白烏龜")) if p[key]]
+        if p["green"] is not None:
+            parts.append(f"綠烏龜在{self.palace_names[p['green']]}" if p["green"] else "綠烏龜站在立方體中間")
+        return "、".join(parts)
+
+    # ---------- 合成 ----------
+    def render_board(self, day):
+        base = _image(BOARD_IMG).copy()
+        p = self.positions(day)
+        if p["green"] is not None:
+            col, row = WARRIOR_CUBE[p["green"] - 1] if p["green"] else CUBE_CENTER
+            _place(base, "green", TURTLE_SIZE, cell_xy(col, row))
+        shared = p["yellow"] is not None and p["yellow"] == p["white"]   # 天堂之旅：肩並肩，黃左白右
+        for key, dx in (("yellow", -9 if shared else 0), ("white", 9 if shared else 0)):
+            if p[key] is None: continue
+            x, y = cell_xy(*square_cell(p[key]))
+            _place(base, key, TURTLE_SIZE, (x + dx, y))
+        return base
+
+    def render_compass_1320(self, kin):
+        base = _image(COMPASS_1320_IMG).copy()
+        tone, seal = (kin - 1) % 13 + 1, (kin - 1) % 20 + 1
+        _place(base, "particle_white", PARTICLE_SIZE, SHELL_1320[tone - 1])
+        _place(base, "particle_black", PARTICLE_SIZE, ring_xy(COMPASS_1320, seal % 20 + 1))
+        _place(base, "crystal", CRYSTAL_SIZE, ring_xy(COMPASS_1320, seal % 20 + 1, extra=20))
+        return base
+
+    def render_compass_1328(self, moon, day):
+        base = _image(COMPASS_1328_IMG).copy()
+        _place(base, "particle_white", PARTICLE_SIZE, SHELL_1328[moon - 1])
+        _place(base, "particle_black", PARTICLE_SIZE, ring_xy(COMPASS_1328, day))
+        return base
+
+    # ---------- 快取 (對照表 → static/ 的內容雜湊檔) ----------
+    @property
+    def version(self):
+        """底圖、棋子、每日位置與座標的雜湊；任何一項改變，對照表就作廢"""
+        if self._version is None:
+            h = hashlib.sha256(repr((LAYOUT_VERSION, BOARD_ORIGIN, BOARD_CELL, WARRIOR_CUBE, COMPASS_1320, COMPASS_1328,
+                                     SHELL_1320, SHELL_1328, TURTLE_SIZE, PARTICLE_SIZE, CRYSTAL_SIZE,
+                                     sorted(self.yellow.items()), sorted(self.white.items()),
+                                     sorted(self.green.items()))).encode())
+            for path in (BOARD_IMG, COMPASS_1320_IMG, COMPASS_1328_IMG, *TOKENS.values()):
+                real = assets.resolve_asset(path)
+                if real:
+                    with open(real, "rb") as f: h.update(f.read())
+            self._version = h.hexdigest()[:assets.HASH_LEN]
+        return self._version
+
+    def _manifest(self):
+        if self._images is None:
+            images = {}
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f: data = json.load(f)
+                if data.get("version") == self.version: images = data.get("images", {})
+            except (OSError, ValueError): pass
+            self._images = images
+        return self._images
+
+    def _save_manifest(self):
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(self.manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "images": self._images}, f, ensure_ascii=False)
+            os.replace(self.manifest_path + ".tmp", self.manifest_path)
+        except OSError: pass
+
+    def _cached(self, key, stem, render, save=True):
+        """對照表命中 (且檔案還在) 直接回傳網址；否則合成一次、寫入 static/ 並記進對照表"""
+        images = self._manifest()
+        url = images.get(key)
+        if url and os.path.exists(assets.static_file(url)): return url
+        try:
+            data, ext = _encode(render())
+        except ImportError:
+            return None
+        with self._lock:
+            url = images[key] = assets.write_static(stem, data, ext)
+            if save: self._save_manifest()
+        return url
+
+    def board_image(self, day, save=True):
+        if not 1 <= day <= 28: return None
+        return self._cached(f"board/{day}", f"board_d{day:02d}", lambda: self.render_board(day), save)
+
+    def compass_1320_image(self, kin, save=True):
+        if not 1 <= kin <= 260: return None
+        return self._cached(f"1320/{kin}", f"compass1320_k{kin:03d}", lambda: self.render_compass_1320(kin), save)
+
+    def compass_1328_image(self, moon, day, save=True):
+        if not (1 <= moon <= 13 and 1 <= day <= 28): return None
+        return self._cached(f"1328/{moon}/{day}", f"compass1328_m{moon:02d}_d{day:02d}",
+                            lambda: self.render_compass_1328(moon, day), save)
+
+    def build(self):
+        """產生全部變化 (28 + 260 + 13×28 張)，回傳 {網址: 位元組數}"""
+        urls = [self.board_image(d, save=False) for d in range(1, 29)]
+        urls += [self.compass_1320_image(k, save=False) for k in range(1, 261)]
+        urls += [self.compass_1328_image(m, d, save=False) for m in range(1, 14) for d in range(1, 29)]
+        with self._lock: self._save_manifest()
+        # 刪除舊版本留下的狀態圖
+        current = {os.path.basename(assets.static_file(u)) for u in urls if u}
+        for name in os.listdir(assets.STATIC_DIR):
+            if name.startswith(STATE_PREFIXES) and name not in current: os.remove(os.path.join(assets.STATIC_DIR, name))
+        return {u: os.path.getsize(assets.static_file(u)) for u in urls if u}
+
+
+def main(argv=None):
+    from synchronotron.data import DataRegistry
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] != ["build"]:
+        print(__doc__)
+        return 0
+    sizes = DataRegistry()['board'].build()
+    print(f"棋盤 / 羅盤狀態圖：{len(sizes)} 張，共 {sum(sizes.values()) / 1024 / 1024:.1f} MB ({assets.STATIC_DIR})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
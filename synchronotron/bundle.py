@@ -0,0 +1,161 @@
+"""二進位資料包：把 data/ 的所有 CSV 轉成單一檔案的 Arrow 欄式格式
+
+- 字串一律解碼成 UTF-8 (原檔有 Big5 也有 UTF-8)，整數欄位存成最小的整數型別。
+- 已登錄的資料集 (synchronotron.data.DATASETS) 依其明確型別轉換，與讀 CSV 的結果完全相同；
+  其他 CSV 以檔名 (不含副檔名) 為鍵。
+- 讀取時以 memory map 開啟，每個資料集都是檔案中的一段 Arrow IPC，不需重新解析文字。
+- 檔案內記錄每個來源 CSV 的 SHA-256；來源有變動時 DataRegistry 會改讀 CSV 並在背景重建。
+
+建置：python -m synchronotron build-bundle
+
+檔案格式：MAGIC (8 bytes) + manifest 長度 (uint64, little-endian) + manifest JSON，
+之後是 64 bytes 對齊的資料區，manifest 內的 offset 以資料區起點為 0。
+"""
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import unicodedata
+
+from synchronotron.kin_engine import DATA_DIR
+
+ROOT_DIR = os.path.dirname(DATA_DIR)
+BUNDLE_PATH = os.path.join(ROOT_DIR, ".cache", "data_bundle.bin")
+MAGIC = b"S13MBND1"
+ALIGN = 64
+FORMAT_VERSION = 1
+
+_INT_RE = re.compile(r"^-?(0|[1-9]\d*)$")
+
+
+def file_hash(path):
+    with open(path, "rb") as f: return hashlib.sha256(f.read()).hexdigest()
+
+
+def normalize_frame(df):
+    """未登錄的 CSV：字串做 NFC 正規化，整數欄 (不含前導零) 轉成最小整數型別"""
+    import numpy as np
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        values = s.dropna()
+        if len(values) and values.map(lambda v: bool(_INT_RE.match(v))).all():
+            nums = pd.to_numeric(s)
+            kind = next((k for k in ("int8", "int16", "int32")
+                         if np.iinfo(k).min <= nums.min() and nums.max() <= np.iinfo(k).max), "int64")
+            df[col] = nums.astype(kind.capitalize() if s.isna().any() else kind)
+        else:
+            df[col] = s.map(lambda v: unicodedata.normalize("NFC", v) if isinstance(v, str) else v).astype("string")
+    return df
+
+
+def dataset_frames(data_dir=DATA_DIR):
+    """產生 (鍵, 來源檔名, DataFrame)：先是登錄資料集，再是其餘 CSV"""
+    from synchronotron.csvio import read_csv
+    from synchronotron.data import DATASETS, load_dataset
+    registered = set()
+    for key, spec in DATASETS.items():
+        registered.add(spec.filename)
+        df = load_dataset(key, data_dir)
+        if df is not None: yield key, spec.filename, df
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith(".csv") or filename in registered: continue
+        df = read_csv(os.path.join(data_dir, filename), dtype=str, keep_default_na=False, na_values=[""])
+        yield os.path.splitext(filename)[0], filename, normalize_frame(df)
+
+
+def build_bundle(data_dir=DATA_DIR, path=BUNDLE_PATH):
+    """重建資料包 (寫入暫存檔後原子替換)，回傳 manifest"""
+    import pyarrow as pa
+    manifest = {"version": FORMAT_VERSION, "datasets": {}}
+    segments, offset = [], 0
+    for key, filename, df in dataset_frames(data_dir):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer: writer.write_table(table)
+        buf = sink.getvalue()
+        pad = (-buf.size) % ALIGN
+        manifest["datasets"][key] = {
+            "source": filename, "sha256": file_hash(os.path.join(data_dir, filename)),
+            "offset": offset, "length": buf.size, "rows": table.num_rows,
+        }
+        segments.append((buf, pad))
+        offset += buf.size + pad
+    header = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+    head = MAGIC + struct.pack("<Q", len(header)) + header
+    head += b"\0" * ((-len(head)) % ALIGN)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(head)
+        for buf, pad in segments:
+            f.write(buf)
+            f.write(b"\0" * pad)
+    os.replace(tmp, path)
+    return manifest
+
+
+class Bundle:
+    """以 memory map 開啟的資料包"""
+
+    def __init__(self, path=BUNDLE_PATH, data_dir=DATA_DIR):
+        import pyarrow as pa
+        self.path = path
+        self.data_dir = data_dir
+        self._buf = pa.memory_map(path, "r").read_buffer()
+        if self._buf.size < 16 or self._buf.slice(0, 8).to_pybytes() != MAGIC:
+            raise ValueError(f"不是有效的資料包：{path}")
+        (n,) = struct.unpack("<Q", self._buf.slice(8, 8).to_pybytes())
+        self.manifest = json.loads(self._buf.slice(16, n).to_pybytes().decode("utf-8"))
+        if self.manifest.get("version") != FORMAT_VERSION: raise ValueError("資料包版本不符")
+        self._data_start = 16 + n + (-(16 + n)) % ALIGN
+        self._fresh = {}
+
+    def __contains__(self, key):
+        return key in self.manifest["datasets"]
+
+    def keys(self):
+        return self.manifest["datasets"].keys()
+
+    def is_fresh(self, key):
+        """來源 CSV 的雜湊與建置時相同 (每個資料集只檢查一次)"""
+        if key not in self._fresh:
+            meta = self.manifest["datasets"].get(key)
+            src = os.path.join(self.data_dir, meta["source"]) if meta else None
+            self._fresh[key] = bool(src and os.path.exists(src) and file_hash(src) == meta["sha256"])
+        return self._fresh[key]
+
+    def stale_keys(self):
+        return [k for k in self.keys() if not self.is_fresh(k)]
+
+    def table(self, key):
+        import pyarrow as pa
+        meta = self.manifest["datasets"][key]
+        seg = self._buf.slice(self._data_start + meta["offset"], meta["length"])
+        return pa.ipc.open_file(seg).read_all()
+
+    def frame(self, key):
+        return self.table(key).to_pandas()
+
+
+def open_bundle(path=BUNDLE_PATH, data_dir=DATA_DIR):
+    """開啟資料包；檔案不存在、格式不符或未安裝 pyarrow 時回傳 None"""
+    if not os.path.exists(path): return None
+    try: return Bundle(path, data_dir)
+    except (ImportError, ValueError, OSError): return None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else BUNDLE_PATH
+    manifest = build_bundle(path=path)
+    size = os.path.getsize(path)
+    print(f"已建置 {len(manifest['datasets'])} 個資料集 → {path} ({size / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
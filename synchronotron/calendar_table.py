@@ -0,0 +1,150 @@
+"""預先計算的每日曆表：1900-2200 每一天的 KIN、13 月亮日期、七價週、等離子、烏龜之旅與星際年
+
+整張表是一個 NumPy 結構化陣列 (約 11 萬列、2.5 MB)，以 (日期 - 起始日) 直接索引：
+任何一天的完整每日能量只要一次陣列讀取，整月 / 整年是原陣列的切片 (不複製)。
+
+    cal = db['calendar']                     # 或 Calendar.build()
+    cal.record(datetime.date(2026, 10, 18))  # 單日完整資料 (dict)
+    cal.month(2026, 10)                      # 結構化陣列切片
+    cal.moon_date(date)                      # 同 get_13moon_date
+"""
+import numpy as np
+
+from synchronotron import kin_engine
+from synchronotron.batch import kin_numbers, moon_date_arrays, split_dates
+from synchronotron.constants import HEPTAD_GATE_INFO, MOON_NAMES
+
+DEFAULT_RANGE = ("1900-01-01", "2200-12-31")
+
+CALENDAR_DTYPE = np.dtype([
+    ("date", "datetime64[D]"), ("kin", np.int16), ("tone", np.int8), ("seal", np.int8),
+    ("special", np.int8),        # 0 一般日、1 無時間日、2 0.0 Hunab Ku (2/29)
+    ("moon", np.int8), ("moon_day", np.int8), ("heptad_week", np.int8),
+    ("plasma", np.int8),         # 1-7 (Dali…Silio)，特殊日為 0
+    ("maya_week", np.int8),      # 月內第幾週 1-4 (紅/白/藍/黃)，特殊日為 0
+    ("journey", np.int8),        # 烏龜之旅階段，見 JOURNEY_PHASES
+    ("moon_year", np.int16),     # 13 月亮年的起始公曆年 (7/26)
+    ("star_year", np.int16),     # 星際年列號 (Calendar.star_labels 的索引)，-1 為查無
+])
+
+SPECIAL_LABELS = ("", kin_engine.DOOT, kin_engine.HUNAB_KU)
+MAYA_WEEKS = ("", "紅色啟動之週", "白色淨化之週", "藍色蛻變之週", "黃色收穫之週")
+# 與 get_journey_earth_heaven 的分段相同
+JOURNEY_PHASES = ("無時間日", "🌍 地球之旅", "🛤️ 分道揚鑣", "☁️ 天堂之旅")
+
+
+def journey_phase(moon_day):
+    moon_day = np.asarray(moon_day)
+    return np.select([(moon_day >= 1) & (moon_day <= 6), (moon_day >= 7) & (moon_day <= 22),
+                      (moon_day >= 23) & (moon_day <= 28)], [1, 2, 3], 0).astype(np.int8)
+
+
+def build_table(start=DEFAULT_RANGE[0], end=DEFAULT_RANGE[1], star_years=None):
+    """產生曆表；star_years 為 (天文年陣列, 標籤陣列)，年份需遞增"""
+    dates = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    year, month, day = split_dates(dates)
+    moon, moon_day, week = moon_date_arrays(month, day)
+    kin = kin_numbers(dates)
+    t = np.empty(len(dates), dtype=CALENDAR_DTYPE)
+    t["date"], t["kin"] = dates, kin
+    t["tone"], t["seal"] = (kin - 1) % 13 + 1, (kin - 1) % 20 + 1
+    leap_day = (month == 2) & (day == 29)
+    t["special"] = np.where(leap_day, 2, np.where(moon == 0, 1, 0))
+    t["moon"], t["moon_day"], t["heptad_week"] = moon, moon_day, week
+    t["plasma"] = np.where(moon_day > 0, (moon_day - 1) % 7 + 1, 0)
+    t["maya_week"] = np.where(moon_day > 0, (moon_day - 1) // 7 + 1, 0)
+    t["journey"] = journey_phase(moon_day)
+    t["moon_year"] = np.where((month > 7) | ((month == 7) & (day >= 26)), year, year - 1)
+    t["star_year"] = -1
+    if star_years is not None and len(star_years[0]):
+        starts = np.asarray(star_years[0])
+        pos = np.searchsorted(starts, t["moon_year"])
+        found = (pos < len(starts)) & (starts[np.minimum(pos, len(starts) - 1)] == t["moon_year"])
+        t["star_year"] = np.where(found, pos, -1)
+    return t
+
+
+class Calendar:
+    """以日期直接索引的唯讀曆表；範圍外的日期改用 kin_engine 即時計算"""
+
+    def __init__(self, table, star_labels=(), energy=None):
+        self.table = table
+        self.table.flags.writeable = False
+        self.start = table["date"][0] if len(table) else None
+        self.star_labels = tuple(star_labels)
+        self._energy = energy  # 依月內第幾天 (0-28) 預先算好的 get_daily_energy 結果
+
+    @classmethod
+    def build(cls, start=DEFAULT_RANGE[0], end=DEFAULT_RANGE[1], db=None):
+        star_years, labels, energy = None, (), None
+        if db is not None:
+            table = db['star_years']
+            if table is not None: star_years, labels = (table.years, table.labels), table.labels
+            from synchronotron.core import get_daily_energy
+            energy = tuple(get_daily_energy(0, d, db) for d in range(29))
+        return cls(build_table(start, end, star_years), labels, energy)
+
+    def __len__(self):
+        return len(self.table)
+
+    def index(self, date):
+        """日期在表中的列號；範圍外回傳 None"""
+        if self.start is None: return None
+        i = int((np.datetime64(date, "D") - self.start).astype(np.int64))
+        return i if 0 <= i < len(self.table) else None
+
+    def __contains__(self, date):
+        return self.index(date) is not None
+
+    def row(self, date):
+        i = self.index(date)
+        return None if i is None else self.table[i]
+
+    # ---------- 切片 (不複製) ----------
+    def days(self, start, end):
+        """[start, end] 的連續切片；超出範圍的部分會被截掉"""
+        lo = max(0, int((np.datetime64(start, "D") - self.start).astype(np.int64)))
+        hi = min(len(self.table), int((np.datetime64(end, "D") - self.start).astype(np.int64)) + 1)
+        return self.table[lo:max(lo, hi)]
+
+    def month(self, year, month):
+        first = np.datetime64(f"{year:04d}-{month:02d}", "M")
+        return self.days(first.astype("datetime64[D]"), (first + 1).astype("datetime64[D]") - 1)
+
+    def year(self, year):
+        return self.days(f"{year:04d}-01-01", f"{year:04d}-12-31")
+
+    def moon_year(self, year):
+        """13 月亮年 (year/7/26 - year+1/7/25)"""
+        return self.days(f"{year:04d}-07-26", f"{year + 1:04d}-07-25")
+
+    # ---------- 單日 (與 core 的函式回傳值相同) ----------
+    def moon_date(self, date):
+        r = self.row(date)
+        if r is None: return kin_engine.moon_date_of(date)
+        if r["special"]: return SPECIAL_LABELS[r["special"]], 0, 0, 0
+        return f"{r['moon']}.{r['moon_day']}", int(r["moon"]), int(r["moon_day"]), int(r["heptad_week"])
+
+    def daily_energy(self, date):
+        r = self.row(date)
+        if r is None or self._energy is None: return None
+        return self._energy[r["moon_day"]]
+
+    def heptad_info(self, date):
+        """同 get_heptad_gate_info(月內第幾天)"""
+        day = self.moon_date(date)[2]
+        return HEPTAD_GATE_INFO.get((day - 1) % 7 + 1, {})
+
+    def record(self, date):
+        """單日完整資料；範圍外回傳 None"""
+        r = self.row(date)
+        if r is None: return None
+        star = int(r["star_year"])
+        return {
+            "date": str(r["date"]), "KIN": int(r["kin"]), "tone": int(r["tone"]), "seal": int(r["seal"]),
+            "moon_date": self.moon_date(date), "moon_name": MOON_NAMES[r["moon"]] if r["moon"] else "",
+            "plasma": HEPTAD_GATE_INFO[r["plasma"]] if r["plasma"] else {},
+            "maya_week": MAYA_WEEKS[r["maya_week"]], "journey": JOURNEY_PHASES[r["journey"]],
+            "moon_year": int(r["moon_year"]), "star_year": self.star_labels[star] if star >= 0 else "",
+            "energy": self.daily_energy(date),
+        }
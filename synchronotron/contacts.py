@@ -0,0 +1,243 @@
+"""通訊錄儲存庫：本機快取 + 差異同步到 Google Sheets
+
+讀取走記憶體快取 (TTL 可設定，預設 300 秒)，只有過期或明確 invalidate() 後才重新讀取整張表。
+寫入只送出變動的列：新增用 append，修改用 batch update，刪除用 delete_rows；
+寫入成功後直接套用到快取 (write-through)，失敗則作廢快取，下次讀取時重新同步。
+修改 / 刪除前一律重新讀取整張表，並以 (姓名, 生日) 找回每一列目前的位置，
+找不到 (已被其他人改動) 就放棄這次寫入並丟出 ContactsConflict，由畫面重新整理後再編輯。
+DataFrame 的 index 就是試算表的資料列序號 (0 = 第 2 列)：中間的空白列不放進快取，但其他列保留原列號，
+刪除後下方的列號與試算表一樣往上移，新增則寫在最後一筆資料之後。
+
+後端需提供 read_all / append_rows / update_rows / delete_rows：
+- GSheetsBackend：包裝 st.connection("gsheets", type=GSheetsConnection)。
+- FakeSheetBackend：記憶體中的假試算表，記錄每次呼叫與送出的列數，供測試與本機開發使用。
+"""
+import math
+import threading
+import time
+
+import pandas as pd
+
+CONTACT_COLUMNS = ["姓名", "生日", "KIN"]
+DEFAULT_TTL = 300
+
+
+class ContactsConflict(RuntimeError):
+    """要修改 / 刪除的列已被其他人變更，本次寫入已放棄 (快取已重新讀取)"""
+
+
+class ContactsBackendError(RuntimeError):
+    """後端不支援列層級寫入"""
+
+
+def _cell(value):
+    """轉成 Google Sheets 可接受的儲存格值"""
+    if value is None: return ""
+    if isinstance(value, float) and math.isnan(value): return ""
+    if hasattr(value, "item"): value = value.item()  # numpy 純量
+    if value is pd.NA: return ""
+    return value
+
+
+def _row_values(row, columns):
+    return [_cell(row.get(c)) for c in columns]
+
+
+def _key(row):
+    """(姓名, 生日)：用來確認試算表中的列仍是編輯時看到的那一列"""
+    return tuple(str(_cell(row.get(c))) for c in ("姓名", "生日"))
+
+
+class GSheetsBackend:
+    """st-gsheets-connection 的差異寫入包裝；工作表第 1 列為標題，資料從第 2 列開始"""
+
+    def __init__(self, conn, worksheet="contacts"):
+        self.conn = conn
+        self.worksheet = worksheet
+
+    def _sheet(self):
+        # 服務帳戶模式才有 gspread Worksheet，可做列層級的寫入；公開試算表連線只能讀取
+        from streamlit_gsheets.gsheets_connection import GSheetsServiceAccountClient
+        client = self.conn.client
+        select = getattr(client, "_select_worksheet", None)
+        if not isinstance(client, GSheetsServiceAccountClient) or select is None:
+            raise ContactsBackendError('通訊錄寫入需要服務帳戶連線：請在 secrets 的 [connections.gsheets] 設定 type = "service_account"')
+        return select(worksheet=self.worksheet)
+
+    def read_all(self):
+        return self.conn.read(worksheet=self.worksheet, ttl=0)
+
+    def append_rows(self, rows, start):
+        """寫在資料列序號 start (最後一筆資料的下一列)；table_range 指向最後一筆資料，避免被中間的空白列截斷"""
+        self._sheet().append_rows(rows, value_input_option="USER_ENTERED", table_range=f"A{start + 1}")
+
+    def update_rows(self, updates):
+        """updates: {資料列序號 (0 起算): 值清單}"""
+        self._sheet().batch_update(
+            [{"range": f"A{i + 2}", "values": [values]} for i, values in updates.items()],
+            value_input_option="USER_ENTERED")
+
+    def delete_rows(self, positions):
+        sheet = self._sheet()
+        for i in sorted(positions, reverse=True):  # 由下往上刪，前面的列號不會位移
+            sheet.delete_rows(i + 2)
+
+
+class FakeSheetBackend:
+    """記憶體中的假試算表；calls / rows_sent 可用來驗證只送出了變動的列
+
+    read_all 與 gspread_dataframe 一樣：空白儲存格為 NaN，尾端的空白列不回傳。
+    """
+
+    def __init__(self, df=None, columns=CONTACT_COLUMNS):
+        df = pd.DataFrame(columns=columns) if df is None else df
+        self.columns = list(df.columns)
+        self.rows = [_row_values(r, self.columns) for r in df.to_dict("records")]
+        self.calls = []
+        self.rows_sent = 0
+
+    def read_all(self):
+        self.calls.append(("read_all", len(self.rows)))
+        df = pd.DataFrame(self.rows, columns=self.columns)
+        df = df.mask(df.eq("") | df.isna())
+        filled = df.notna().any(axis=1)
+        return df.iloc[:filled[::-1].idxmax() + 1 if filled.any() else 0]
+
+    def append_rows(self, rows, start):
+        self.calls.append(("append_rows", len(rows)))
+        self.rows_sent += len(rows)
+        self.rows[start:start + len(rows)] = [list(r) for r in rows]
+
+    def update_rows(self, updates):
+        self.calls.append(("update_rows", len(updates)))
+        self.rows_sent += len(updates)
+        for i, values in updates.items(): self.rows[i] = list(values)
+
+    def delete_rows(self, positions):
+        self.calls.append(("delete_rows", len(positions)))
+        for i in sorted(positions, reverse=True): del self.rows[i]
+
+
+class ContactsRepository:
+    """通訊錄的讀寫入口；DataFrame 的 index 即為試算表的資料列序號 (0 起算，空白列不在其中但仍佔列號)"""
+
+    def __init__(self, backend, ttl=DEFAULT_TTL, columns=CONTACT_COLUMNS):
+        self.backend = backend
+        self.ttl = ttl
+        self.columns = list(columns)
+        self.reads = 0
+        self.writes = 0
+        self.rows_sent = 0
+        self.version = 0  # 快取內容每變動一次 +1，供衍生結構 (ContactIndex) 判斷是否要重建
+        self._df = None
+        self._loaded_at = 0.0
+        self._lock = threading.RLock()
+
+    # ---------- 讀取 ----------
+    def all(self):
+        """回傳快取的通訊錄 (複本)；過期或作廢時才重新讀取"""
+        with self._lock:
+            if self._df is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._df = self._normalize(self.backend.read_all())
+                self._loaded_at = time.monotonic()
+                self.reads += 1
+                self.version += 1
+            return self._df.copy()
+
+    def invalidate(self):
+        with self._lock: self._df = None
+
+    def _normalize(self, df):
+        if df is None or len(df.columns) == 0: df = pd.DataFrame(columns=self.columns)
+        df = df.reset_index(drop=True).dropna(how="all")  # 不重新編號：index 要對得上試算表的列
+        for c in self.columns:
+            if c not in df.columns: df[c] = ""
+        if "生日" in df.columns: df["生日"] = df["生日"].astype(str)
+        return df
+
+    # ---------- 寫入 ----------
+    def _write(self, apply_remote, apply_local, rows):
+        with self._lock:
+            current = self.all()
+            try:
+                apply_remote(current)
+            except Exception:
+                self.invalidate()
+                raise
+            self._df = apply_local(current)
+            self.version += 1
+            self.writes += 1
+            self.rows_sent += rows
+
+    def add(self, name, birthday, kin):
+        return self.append(pd.DataFrame([{"姓名": name, "生日": str(birthday), "KIN": int(kin) if kin else ""}]))
+
+    def append(self, new_rows):
+        """只新增列 (CSV 匯入 / 儲存單筆)"""
+        if new_rows is None or new_rows.empty: return 0
+        new_rows = new_rows.reindex(columns=self.columns)
+        values = [_row_values(r, self.columns) for r in new_rows.to_dict("records")]
+        self._write(lambda cur: self.backend.append_rows(values, self._end(cur)),
+                    lambda cur: pd.concat([cur, new_rows.set_axis(range(self._end(cur), self._end(cur) + len(values)))]),
+                    len(values))
+        return len(values)
+
+    @staticmethod
+    def _end(df):
+        """最後一筆資料的下一個列序號 (新增列的位置)"""
+        return int(df.index.max()) + 1 if len(df) else 0
+
+    def apply_edits(self, shown, edited):
+        """比較編輯前顯示的列 (shown，保留原 index) 與編輯後的表格，只送出差異
+
+        edited 中 index 屬於 shown 的列視為修改，其餘為新增 (編輯器新增列的 index 可能與未顯示的列重複)；
+        shown 中不在 edited 的列視為刪除。寫入前重新讀取試算表，依 (姓名, 生日) 找回列的位置，
+        對不上就丟出 ContactsConflict，不送出任何修改 / 刪除。回傳 (新增, 修改, 刪除) 筆數。
+        """
+        edited = edited.reindex(columns=self.columns)
+        existing = edited.index.isin(shown.index)
+        added = edited[~existing]
+        kept = edited[existing]
+        changed = {i: _row_values(row, self.columns) for i, row in kept.iterrows()
+                   if _row_values(row, self.columns) != _row_values(shown.loc[i], self.columns)}
+        removed = [i for i in shown.index if i not in kept.index]
+        with self._lock:
+            self.invalidate()
+            current = self.all()
+            where = self._locate(current, shown.loc[list(changed) + removed])
+            updates = {where[i]: values for i, values in changed.items()}
+            deleted = [where[i] for i in removed]
+            if updates:
+                self._write(lambda cur: self.backend.update_rows(updates),
+                            lambda cur: self._patched(cur, updates), len(updates))
+            if deleted:
+                self._write(lambda cur: self.backend.delete_rows(deleted),
+                            lambda cur: self._without(cur, deleted), 0)
+            if not added.empty: self.append(added)
+            return len(added), len(updates), len(deleted)
+
+    def _locate(self, current, shown):
+        """要修改 / 刪除的列 (shown 的 index) -> 最新資料中的列序號；原位置的 (姓名, 生日) 沒變就沿用，否則找同鍵值且未被佔用的列"""
+        keys = dict(zip(current.index, (_key(r) for r in current.to_dict("records"))))
+        wanted = {i: _key(row) for i, row in shown.iterrows()}
+        where = {i: int(i) for i, k in wanted.items() if keys.get(i) == k}
+        taken = set(where.values())
+        for i, k in wanted.items():
+            if i in where: continue
+            pos = next((int(p) for p, key in keys.items() if key == k and p not in taken), None)
+            if pos is None:
+                raise ContactsConflict(f"「{k[0]} ({k[1]})」已被其他人修改或刪除，資料已重新讀取，請重新編輯")
+            where[i] = pos
+            taken.add(pos)
+        return where
+
+    @staticmethod
+    def _without(df, deleted):
+        """刪除列後，下方的列號往上移 (與試算表 delete_rows 相同)"""
+        df = df.drop(index=deleted)
+        return df.set_axis(df.index - pd.Index(sorted(deleted)).searchsorted(df.index))
+
+    def _patched(self, df, updates):
+        df = df.copy()
+        for i, values in updates.items(): df.loc[i, self.columns] = values
+        return df
@@ -0,0 +1,178 @@
+"""邏輯核心：與介面無關的 13 月亮曆計算 (原 app.py 第 3 節)
+
+所有函式只依賴 kin_engine 與資料登錄表 db (synchronotron.data.DataRegistry 或同樣介面的 Mapping)，
+不引用 Streamlit，匯入時也不載入 NumPy / pandas (用到矩陣時才載入)；
+app.py、REST API (synchronotron.api) 與批次工具共用同一套規則。
+"""
+import datetime
+
+from synchronotron import assets, kin_engine
+from synchronotron.constants import (
+    HEPTAD_GATE_INFO, TELEKTONON_MAP, WARRIOR_JOURNEY, EARTH_JOURNEY, HEAVEN_JOURNEY,
+    TONES_NAME, SEALS_NAME, TONE_QUESTIONS
+)
+
+
+def parse_date_safe(date_input):
+    """通訊錄的生日欄位 (字串 / 日期) → datetime.date；無法解析回傳 None"""
+    if not date_input: return None
+    if isinstance(date_input, datetime.date): return date_input
+    if isinstance(date_input, datetime.datetime): return date_input.date()
+    date_str = str(date_input).strip()
+    try:
+        if " " in date_str: date_str = date_str.split(" ")[0]
+        date_str = date_str.replace('/', '-')
+        parts = date_str.split('-')
+        if len(parts) == 3: return datetime.date(int(parts[0]), int(parts[1]), int(parts[2]))
+    except: pass
+    return None
+
+
+def find_kin_num(tone, seal):
+    if not (1 <= tone <= 13 and 1 <= seal <= 20): return 0
+    return kin_engine.kin_from_tone_seal(tone, seal)
+
+
+def calculate_kin_num(year, month, day, db=None):
+    # 純算術計算，不再依賴 kin_start_year.csv 查表 (任何年份皆可)
+    return kin_engine.kin_num(year, month, day)
+
+
+def get_kin_details(kin_num, db):
+    if not kin_num: return {}
+    return db['kin_index'].details(kin_num)
+
+
+def calculate_oracle(kin_num, db):
+    if not kin_num: return None
+    _, k_ana, k_anti, k_occ, k_guide = db['kin_index'].oracle(kin_num)
+    return {
+        'main': get_kin_details(kin_num, db),
+        'analog': get_kin_details(k_ana, db),
+        'antipode': get_kin_details(k_anti, db),
+        'occult': get_kin_details(k_occ, db),
+        'guide': get_kin_details(k_guide, db)
+    }
+
+
+def get_psi_kin(date_obj, main_kin_num, db):
+    m, d = date_obj.month, date_obj.day
+    if m == 7 and d == 25: return main_kin_num, "無時間日"
+    query = f"{m}月{d}日"
+    if db['psi'] is not None:
+        row = db['psi'][db['psi']['月日'] == query]
+        if row.empty:
+            query2 = f"{m:02d}月{d:02d}日"
+            row = db['psi'][db['psi']['國曆生日'] == query2]
+        if not row.empty:
+            try: return int(row.iloc[0]['PSI印記']), "PSI資料庫"
+            except: pass
+    return None, "未知"
+
+
+def calculate_goddess_force(oracle_data, db):
+    if not oracle_data: return None
+    return get_kin_details(kin_engine.goddess_kin(oracle_data['main']['KIN']), db)
+
+
+def get_13moon_date(date_obj):
+    # 2/29 (0.0 Hunab Ku) 不計入 13 個月亮，閏年的 7/25 仍為無時間日
+    return kin_engine.moon_date_of(date_obj)
+
+
+def calculate_flow_year_kin(birth_date, db, ref_date=None):
+    target_year, flow_kin_num = kin_engine.flow_year(birth_date, ref_date)
+    return target_year, get_kin_details(flow_kin_num, db)
+
+
+def get_daily_energy(moon, day, db):
+    info = {}
+    if db['plasma'] is not None:
+        row = db['plasma'][db['plasma']['第幾天'] == day]
+        if not row.empty: info['plasma'] = row.iloc[0].to_dict()
+    if db['week_keyword'] is not None:
+        week_idx = (day - 1) // 7
+        weeks = ['紅色啟動之週', '白色淨化之週', '藍色蛻變之週', '黃色收穫之週']
+        if 0 <= week_idx < 4:
+            w_name = weeks[week_idx]
+            row = db['week_keyword'][db['week_keyword']['瑪雅週'] == w_name]
+            if not row.empty: info['week'] = row.iloc[0].to_dict()
+    return info
+
+
+def calculate_today_kin(selected_date, db):
+    kin = calculate_kin_num(selected_date.year, selected_date.month, selected_date.day, db)
+    return selected_date, get_kin_details(kin, db)
+
+
+def calculate_relationship(kin1, kin2, db):
+    if not kin1 or not kin2: return None
+    combined_kin_num = kin_engine.relationship_kin(kin1, kin2)
+    t1 = (kin1 - 1) % 13 + 1; s1 = (kin1 - 1) % 20 + 1
+    t2 = (kin2 - 1) % 13 + 1; s2 = (kin2 - 1) % 20 + 1
+    combined_tone = (t1 + t2 - 1) % 13 + 1
+    combined_seal = (s1 + s2 - 1) % 20 + 1
+    return {'KIN': combined_kin_num, 'info': get_kin_details(combined_kin_num, db), 'tone_sum': combined_tone, 'seal_sum': combined_seal}
+
+
+def get_journey_earth_heaven(day):
+    if 1 <= day <= 6:
+        step = EARTH_JOURNEY.get(day, "建立基地")
+        return f"🌍 地球之旅 (Day {day})", step, ["assets/tokens/turtle_yellow.png", "assets/tokens/turtle_white.png"], "黃上白下 (頭右)"
+    elif 7 <= day <= 22:
+        return f"🛤️ 分道揚鑣 (Day {day})", "黃烏龜：繼續前進 / 白烏龜：Day 6 原地等待", ["assets/tokens/turtle_yellow.png", "assets/tokens/turtle_white.png"], "分開行動"
+    elif 23 <= day <= 28:
+        heaven_step = HEAVEN_JOURNEY.get(day, "返回天堂")
+        return f"☁️ 天堂之旅 (Day {day})", heaven_step, ["assets/tokens/turtle_yellow.png", "assets/tokens/turtle_white.png"], "肩並肩 (黃左白右, 頭左)"
+    return "無時間日", "自由", [], ""
+
+
+def get_journey_warrior(day):
+    if 7 <= day <= 22:
+        warrior_step = WARRIOR_JOURNEY.get(day, "奪回力量")
+        return f"⚔️ 戰士立方體之旅 (Day {day})", warrior_step, "assets/tokens/turtle_green.png"
+    return None, None, None
+
+
+def get_telektonon_info(seal_idx):
+    return TELEKTONON_MAP.get(seal_idx, {})
+
+
+def get_heptad_gate_info(day):
+    week_day = (day - 1) % 7 + 1
+    return HEPTAD_GATE_INFO.get(week_day, {})
+
+
+def get_wavespell_data(kin_num):
+    """KIN 所在波符的 13 天 (調性、圖騰、調性問題與圖騰圖片路徑)"""
+    tone = (kin_num - 1) % 13 + 1
+    start_kin = kin_num - (tone - 1)
+    if start_kin <= 0: start_kin += 260
+
+    wavespell = []
+    for i in range(13):
+        k = start_kin + i
+        if k > 260: k -= 260
+        t = (k - 1) % 13 + 1
+        s = (k - 1) % 20 + 1
+        
+        q = TONE_QUESTIONS.get(TONES_NAME[t], "")
+        img = assets.seal_path(s)
+        
+        wavespell.append({
+            "Tone": t, "ToneName": TONES_NAME[t], "SealName": SEALS_NAME[s],
+            "KIN": k, "Question": q, "Image": img, "FullName": f"{TONES_NAME[t]}{SEALS_NAME[s]}"
+        })
+    return wavespell
+
+
+def calculate_synchronotron_data(date_obj, main_kin, db):
+    # 座標已預先解析成整數陣列 (Matrix441)，不再逐次比對字串
+    from synchronotron.matrix441 import format_pos
+    res = db['matrix441'].synchronotron(date_obj.month, date_obj.day, main_kin)
+    if res is None: return None  # 無法定位生辰座標 (例如 2/29)
+    labels = ["時間矩陣座標", "空間矩陣座標", "共時矩陣座標"]
+    logs = []
+    for i, (label, ((v, h), terms)) in enumerate(zip(labels, res['steps'])):
+        logs.append(f"{i + 1}. {label} {format_pos(v, h)} → {terms[0]} + {terms[1]} + {terms[2]} = {sum(terms)}")
+    return {'MCF': res['MCF'], 'BMU': res['BMU'], 'KIN_EQUIV': get_kin_details(res['KIN_EQUIV'], db), 'logs': logs}
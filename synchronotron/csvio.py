@@ -0,0 +1,24 @@
+"""CSV 讀取工具：自動判斷編碼 (UTF-8 / Big5) 與標題列位置"""
+import os
+
+import pandas as pd
+
+ENCODINGS = ("utf-8-sig", "big5", "cp950")
+
+
+def read_csv(filename, encoding=None, **kwargs):
+    """未指定編碼時依序嘗試 UTF-8 與 Big5；未指定 header 且第一列是表名 (其餘欄位為 Unnamed) 時改用第二列當標題"""
+    if not os.path.exists(filename): return None
+    last_error = None
+    for enc in ((encoding,) if encoding else ENCODINGS):
+        try:
+            df = pd.read_csv(filename, encoding=enc, **kwargs)
+        except UnicodeDecodeError as e:
+            last_error = e
+            continue
+        if "header" not in kwargs and len(df.columns) > 1 and \
+                ("Unnamed" in str(df.columns[0]) or "Unnamed" in str(df.columns[1])):
+            df = pd.read_csv(filename, encoding=enc, header=1, **kwargs)
+        df.columns = [str(c).strip() for c in df.columns]
+        return df
+    raise last_error
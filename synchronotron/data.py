@@ -0,0 +1,185 @@
+"""資料層：延遲載入的資料集登錄表
+
+每個資料集在第一次被存取 (db['plasma']) 時才讀檔，並以明確的編碼、標題列與欄位型別解析，
+各自快取、各自計時。衍生結構 (KinIndex、Matrix441、八光點查表、BMU 註解、harmonic_map、星際年、每日曆表) 也在第一次使用時才建立。
+
+若有二進位資料包 (synchronotron.bundle) 且來源 CSV 未變動，直接從 memory map 讀取；
+來源有變動或資料包不存在時改讀 CSV，並在背景重建資料包。
+"""
+import importlib.util
+import os
+import threading
+import time
+from collections import namedtuple
+from collections.abc import Mapping
+
+from synchronotron.kin_engine import DATA_DIR
+
+Dataset = namedtuple("Dataset", "filename header encoding dtype")
+
+UTF8, BIG5 = "utf-8-sig", "big5"
+
+DATASETS = {
+    'kin_info': Dataset("kin_basic_info.csv", 0, UTF8, {'KIN': 'int16'}),
+    'psi': Dataset("PSI印記對照表.csv", 0, UTF8, {'國曆生日': str, '月日': str, '瑪雅生日': str, 'PSI印記': 'Int16', '矩陣位置': str}),
+    'plasma': Dataset("Heptad_Gate_Path.csv", 1, UTF8, {'第幾天': 'int8', 'KIN': 'int16'}),
+    'white_turtle': Dataset("White_Turtle_Day.csv", 1, UTF8, {'第幾天': 'int8', '位置': 'int8'}),
+    'yellow_turtle': Dataset("Yellow_Turtle_Day.csv", 1, UTF8, {'第幾天': 'int8', '說明': str, '盧恩符文': str}),
+    'green_turtle': Dataset("Green_Turtle_Day.csv", 1, UTF8, {'第幾天': 'int8', '屬宮': str, '說明': str}),
+    'week_keyword': Dataset("瑪亞週關鍵句.csv", 0, UTF8, {'瑪雅週': str, '關鍵句': str}),
+    'date_to_matrix': Dataset("瑪雅生日對時間矩陣對照表.csv", 0, UTF8, {'月日': str, '瑪雅生日': str, '時間矩陣位置': str}),
+    'base_matrix': Dataset("Base_Matrix_441.csv", 1, UTF8, {'KIN': 'int16', '矩陣位置': str}),
+    'runes': Dataset("UR_Harmonic_Runes.csv", 1, UTF8, {'代號': str, 'BMU': 'int16', '八度音階': str, '說明': str, '意識流': str}),
+    'brain_tuning': Dataset("Whole_Brain_Tuning.csv", 1, UTF8, {'對應腦部': str, '調頻語': str}),
+    'octave_scale': Dataset("Octave_Scale.csv", 1, UTF8, {'八度音符': str, '矩陣位置': str, '行': 'int16', '列': 'int16'}),
+    'tzolkin_matrix': Dataset("Tzolkin_Matrix.csv", 1, UTF8, {'矩陣位置': str, 'KIN': 'int16', '行': 'int16', '列': 'int16'}),
+    'iching': Dataset("銀河易經編碼.csv", 0, BIG5, {'編號': str, '編碼': str, '二進位': str, '二進位.1': str}),
+    'time_matrix': Dataset("Time_Matrix.csv", 1, BIG5, {'矩陣位置': str, 'KIN': 'int16', '行': 'int16', '列': 'int16'}),
+    'space_matrix': Dataset("Space_Matrix.csv", 1, UTF8, {'KIN': 'int16', '矩陣位置': str, '行': 'int16', '列': 'int16'}),
+    'synchronic_matrix': Dataset("Synchronic_Matrix.csv", 1, UTF8, {'矩陣位置': str, 'KIN': 'Int16', '行': 'int16', '列': 'int16'}),
+    'star_year': Dataset("星際年.csv", 0, BIG5, {'對應星際年': str, '起始年': 'int16', '調性數字': 'int8', '圖騰數字': 'int8', '對應KIN': 'int16', 'PSI流月KIN': 'int16'}),
+}
+
+
+def _build_kin_index(db):
+    from synchronotron.constants import TELEKTONON_MAP
+    from synchronotron.kin_index import KinIndex
+    return KinIndex.from_frame(db['kin_info'], TELEKTONON_MAP)
+
+
+def _build_matrix441(db):
+    from synchronotron.matrix441 import Matrix441
+    return Matrix441.from_db(db)
+
+
+def _build_light_points(db):
+    from synchronotron.light_points import LightPoints
+    return LightPoints.from_db(db)
+
+
+def _build_harmonic_map(db):
+    from synchronotron.bmu import harmonic_numbers
+    df = db['iching']
+    if df is None or '諧波' not in df: return {}
+    return {int(n): r for n, r in zip(harmonic_numbers(df['諧波']), df.to_dict('records')) if n}
+
+
+def _build_bmu(db):
+    from synchronotron.bmu import BmuResolver
+    return BmuResolver.from_db(db)
+
+
+def _build_calendar(db):
+    from synchronotron.calendar_table import Calendar
+    return Calendar.build(db=db)
+
+
+def _build_board(db):
+    from synchronotron.board import BoardStates
+    return BoardStates.from_db(db)
+
+
+def _build_star_years(db):
+    from synchronotron.star_year import StarYearTable
+    return StarYearTable.from_frame(db['star_year'])
+
+
+DERIVED = {
+    'kin_index': _build_kin_index,
+    'matrix441': _build_matrix441,
+    'light_points': _build_light_points,
+    'harmonic_map': _build_harmonic_map,
+    'bmu': _build_bmu,
+    'star_years': _build_star_years,
+    'calendar': _build_calendar,
+    'board': _build_board,
+}
+
+
+def load_dataset(key, data_dir=DATA_DIR):
+    from synchronotron.csvio import read_csv
+    spec = DATASETS[key]
+    return read_csv(os.path.join(data_dir, spec.filename), encoding=spec.encoding,
+                    header=spec.header, dtype=spec.dtype)
+
+
+class DataRegistry(Mapping):
+    """db[key] 第一次存取時才載入；讀檔失敗的資料集為 None (與舊版 load_data 相同)"""
+
+    def __init__(self, data_dir=DATA_DIR, bundle_path=None, auto_rebuild=True):
+        from synchronotron.bundle import BUNDLE_PATH
+        self.data_dir = data_dir
+        self.bundle_path = bundle_path or BUNDLE_PATH
+        self.auto_rebuild = auto_rebuild
+        self.timings = {}
+        self.sources = {}
+        self.errors = {}
+        self._cache = {}
+        self._bundle = None
+        self._bundle_opened = False
+        self._rebuilding = None
+        self._locks = {key: threading.Lock() for key in (*DATASETS, *DERIVED)}
+        self._bundle_lock = threading.Lock()
+
+    def _open_bundle(self):
+        with self._bundle_lock:
+            if not self._bundle_opened:
+                from synchronotron.bundle import open_bundle
+                self._bundle = open_bundle(self.bundle_path, self.data_dir)
+                self._bundle_opened = True
+        return self._bundle
+
+    def _load(self, key):
+        bundle = self._open_bundle()
+        if bundle is not None and key in bundle and bundle.is_fresh(key):
+            self.sources[key] = "bundle"
+            return bundle.frame(key)
+        self.sources[key] = "csv"
+        self._schedule_rebuild()
+        return load_dataset(key, self.data_dir)
+
+    def _schedule_rebuild(self):
+        """資料包不存在或過期時在背景重建 (每個 registry 最多一次)；下次啟動即可使用"""
+        if not self.auto_rebuild or self._rebuilding is not None: return
+        if importlib.util.find_spec("pyarrow") is None: return  # 只檢查是否安裝，不實際載入
+
+        def run():
+            from synchronotron.bundle import build_bundle
+            try: build_bundle(self.data_dir, self.bundle_path)
+            except Exception as e: self.errors['bundle'] = repr(e)
+
+        self._rebuilding = threading.Thread(target=run, name="bundle-rebuild", daemon=True)
+        self._rebuilding.start()
+
+    def __getitem__(self, key):
+        try: return self._cache[key]
+        except KeyError: pass
+        if key not in self._locks: raise KeyError(key)
+        with self._locks[key]:
+            if key not in self._cache:
+                start = time.perf_counter()
+                try:
+                    value = DERIVED[key](self) if key in DERIVED else self._load(key)
+                except Exception as e:
+                    self.errors[key] = repr(e)
+                    value = None
+                self.timings[key] = time.perf_counter() - start
+                self._cache[key] = value
+        return self._cache[key]
+
+    def __iter__(self):
+        return iter(self._locks)
+
+    def __len__(self):
+        return len(self._locks)
+
+    def __contains__(self, key):
+        return key in self._locks
+
+    @property
+    def loaded(self):
+        return tuple(self._cache)
+
+    def preload(self, keys=None):
+        for key in keys or self: self[key]
+        return self
@@ -0,0 +1,183 @@
+"""通訊錄批次匯入：分塊讀取 CSV、向量化解析日期與計算 KIN、去除重複
+
+    report = import_contacts(uploaded_file, repo, progress=lambda r: print(r.rows_read))
+
+- 以 chunk_size 列為單位讀取，每塊解析後立即寫入 (ContactsRepository.append)，不會一次載入整個檔案。
+- 寫入前先逐段解碼整個檔案決定編碼 (UTF-8 / Big5)，不會匯入到一半才因後段無法解碼而中斷。
+- 日期規則與 core.parse_date_safe 相同：取空白前的部分，'/' 視同 '-'，年-月-日，不合法的日期 (2/30) 拒收。
+- 以 (姓名, 生日) 去重：已在通訊錄中的、以及同一檔案內重複的列都會略過。
+"""
+import codecs
+import contextlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from synchronotron.batch import kin_numbers
+from synchronotron.contacts import CONTACT_COLUMNS
+from synchronotron.csvio import ENCODINGS
+
+DEFAULT_CHUNK_SIZE = 10_000
+MAX_REJECTS_KEPT = 1000  # 報表最多保留的拒收明細筆數 (計數不受限)
+
+_DATE_RE = r"^(\d{1,4})-(\d{1,2})-(\d{1,2})$"
+
+
+def parse_dates(values):
+    """字串 / 日期序列 → datetime64[D] 陣列；無法解析的為 NaT"""
+    s = pd.Series(values, dtype=object).reset_index(drop=True)
+    text = s.map(lambda v: v.isoformat() if hasattr(v, "isoformat") else v).astype("string")
+    text = text.str.strip().str.split(" ", n=1).str[0].str.replace("/", "-", regex=False)
+    parts = text.str.extract(_DATE_RE)
+    ymd = parts.apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    year, month, day = ymd[:, 0], ymd[:, 1], ymd[:, 2]
+    valid = (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    month_len = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    valid &= day <= month_len
+    dates = months.astype("datetime64[D]") + np.where(valid, day - 1, 0)
+    return np.where(valid, dates, np.datetime64("NaT"))
+
+
+def prepare_contacts(df):
+    """整理 姓名 / 生日 欄位並重算 KIN；回傳 (有效列 DataFrame, 無效列的布林遮罩)
+
+    有效列保留原本的 index，生日統一成 YYYY-MM-DD。
+    """
+    names = df["姓名"].astype("string").str.strip()
+    dates = parse_dates(df["生日"])
+    ok = ~np.isnat(dates) & names.notna().to_numpy() & (names.fillna("") != "").to_numpy()
+    valid = pd.DataFrame({
+        "姓名": names[ok].astype(object),
+        "生日": np.datetime_as_string(dates[ok], unit="D"),
+        "KIN": kin_numbers(dates[ok]).astype(np.int64),
+    }, index=df.index[ok], columns=CONTACT_COLUMNS)
+    return valid, ~ok
+
+
+def contact_keys(df):
+    """(姓名, 正規化生日) 的集合；生日無法解析的以原字串為鍵"""
+    if df is None or df.empty: return set()
+    dates = parse_dates(df["生日"])
+    births = np.where(np.isnat(dates), df["生日"].astype(str).to_numpy(), np.datetime_as_string(dates, unit="D"))
+    return set(zip(df["姓名"].astype(str).str.strip(), births))
+
+
+class ImportReport:
+    """匯入結果：讀取 / 新增 / 重複 / 拒收筆數與拒收明細 (檔案列號, 姓名, 生日, 原因)"""
+    __slots__ = ("rows_read", "added", "duplicates", "rejected", "rejects", "bytes_read", "bytes_total")
+
+    def __init__(self, bytes_total=None):
+        self.rows_read = self.added = self.duplicates = self.rejected = 0
+        self.rejects = []
+        self.bytes_read = 0
+        self.bytes_total = bytes_total
+
+    @property
+    def fraction(self):
+        """估計進度 (0-1)；來源大小未知時為 None"""
+        if not self.bytes_total: return None
+        return min(1.0, self.bytes_read / self.bytes_total)
+
+    def reject(self, rows, reason):
+        self.rejected += len(rows)
+        room = MAX_REJECTS_KEPT - len(self.rejects)
+        for i, row in rows.head(max(room, 0)).iterrows():
+            self.rejects.append((int(i) + 2, row.get("姓名"), row.get("生日"), reason))  # +2：標題列與 1 起算
+
+    def summary(self):
+        return f"讀取 {self.rows_read} 筆：新增 {self.added}、重複略過 {self.duplicates}、拒收 {self.rejected}"
+
+    def rejects_frame(self):
+        return pd.DataFrame(self.rejects, columns=["列號", "姓名", "生日", "原因"])
+
+
+def _source_size(source):
+    size = getattr(source, "size", None)
+    if size: return size
+    try:
+        pos = source.seek(0, io.SEEK_END)
+        source.seek(0)
+        return pos
+    except (AttributeError, OSError, ValueError): return None
+
+
+@contextlib.contextmanager
+def _binary(source):
+    """檔案路徑另外開啟；檔案物件則回到開頭後直接使用 (不關閉)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f: yield f
+    else:
+        source.seek(0)
+        yield source
+
+
+def detect_encoding(source, block_size=1 << 20):
+    """逐段解碼整個來源，回傳第一個能完整解碼的編碼 (UTF-8 / Big5)；文字模式的來源回傳 None"""
+    last_error = None
+    for enc in ENCODINGS:
+        decoder = codecs.getincrementaldecoder(enc)()
+        try:
+            with _binary(source) as f:
+                while True:
+                    block = f.read(block_size)
+                    if isinstance(block, str): return None
+                    decoder.decode(block, final=not block)
+                    if not block: break
+        except UnicodeDecodeError as e:
+            last_error = e
+            continue
+        return enc
+    raise last_error
+
+
+def read_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """分塊讀取 姓名、生日 兩欄 (字串)；編碼在讀第一塊前就以整個檔案判斷"""
+    if not isinstance(source, (str, os.PathLike)) and not hasattr(source, "seek"):
+        source = io.BytesIO(source.read())  # 無法倒回的串流：先收進記憶體，才能判斷編碼後再讀一次
+    enc = detect_encoding(source)
+    if hasattr(source, "seek"): source.seek(0)
+    try:
+        reader = pd.read_csv(source, encoding=enc, dtype=str, keep_default_na=False, chunksize=chunk_size,
+                             usecols=lambda c: str(c).strip() in ("姓名", "生日"))
+        first = next(reader, None)
+    except ValueError as e:
+        raise ValueError("CSV 缺少 '姓名' 或 '生日' 欄位") from e
+    if first is None: return
+    first.columns = [str(c).strip() for c in first.columns]
+    if not {"姓名", "生日"} <= set(first.columns): raise ValueError("CSV 缺少 '姓名' 或 '生日' 欄位")
+    yield first
+    for chunk in reader:
+        chunk.columns = first.columns
+        yield chunk
+
+
+def iter_import(source, existing=None, chunk_size=DEFAULT_CHUNK_SIZE, report=None):
+    """逐塊產生要新增的列 (已去重、已算 KIN)；統計記錄在 report"""
+    report = report if report is not None else ImportReport(_source_size(source))
+    seen = contact_keys(existing)
+    for chunk in read_chunks(source, chunk_size):
+        report.rows_read += len(chunk)
+        valid, bad = prepare_contacts(chunk)
+        if bad.any(): report.reject(chunk[bad], "姓名空白或日期無效")
+        keys = list(zip(valid["姓名"], valid["生日"]))
+        fresh = np.ones(len(valid), dtype=bool)
+        for j, key in enumerate(keys):
+            if key in seen: fresh[j] = False
+            else: seen.add(key)
+        report.duplicates += int((~fresh).sum())
+        if hasattr(source, "tell"):
+            try: report.bytes_read = source.tell()
+            except (OSError, ValueError): pass
+        yield valid[fresh].reset_index(drop=True)
+
+
+def import_contacts(source, repo, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """把 CSV 串流匯入通訊錄：每塊只 append 新的列；progress(report) 在每塊完成後呼叫"""
+    report = ImportReport(_source_size(source))
+    for rows in iter_import(source, repo.all(), chunk_size, report):
+        report.added += repo.append(rows)
+        if progress: progress(report)
+    return report
@@ -0,0 +1,158 @@
+"""Kin 純算術引擎：任何公曆日期 → KIN / 調性 / 圖騰 / 13 月亮曆日期 (O(1)，只用標準函式庫)
+
+規則與 data/kin_start_year.csv + data/month_day_accum.csv 的查表法完全一致：
+- 每年 1/1 的起始 KIN 比前一年多 105 (365 % 260)，以 1912 年起始 KIN 12 為原點。
+- 2/29 沿用查表法的累積天數，與 3/1 同一個 KIN。
+- 13 月亮年由 7/26 起算，7/25 為無時間日 (Day Out of Time)，
+  2/29 為 0.0 Hunab Ku，不計入 13 個月亮。
+
+自我檢查：python -m synchronotron.kin_engine --self-check
+"""
+import datetime
+import os
+import sys
+
+EPOCH_YEAR = 1912
+EPOCH_START_KIN = 12
+YEAR_STEP = 365 % 260
+
+# 各月 1 日前的累積天數 (mod 260，同 month_day_accum.csv)
+MONTH_ACCUM = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 13, 44, 74)
+# 平年各月 1 日前的累積天數 (0 起算)，用於 13 月亮曆
+MONTH_DOY = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+MOON_NEW_YEAR_DOY = MONTH_DOY[7] + 25  # 7/26
+
+DOOT = "Day Out of Time"
+HUNAB_KU = "0.0 Hunab Ku"
+
+
+def start_kin(year):
+    """該年的起始 KIN (同 kin_start_year.csv 的「起始KIN」)"""
+    return (EPOCH_START_KIN + YEAR_STEP * (year - EPOCH_YEAR)) % 260
+
+
+def kin_num(year, month, day):
+    return (start_kin(year) + MONTH_ACCUM[month] + day - 1) % 260 + 1
+
+
+def kin_of(date_obj):
+    return kin_num(date_obj.year, date_obj.month, date_obj.day)
+
+
+def tone_of(kin):
+    return (kin - 1) % 13 + 1
+
+
+def seal_of(kin):
+    return (kin - 1) % 20 + 1
+
+
+def kin_from_tone_seal(tone, seal):
+    # 中國餘數定理：40 ≡ 1 (mod 13) 且 ≡ 0 (mod 20)；221 ≡ 0 (mod 13) 且 ≡ 1 (mod 20)
+    return (40 * (tone - 1) + 221 * (seal - 1)) % 260 + 1
+
+
+# 引導印記的圖騰位移 (依調性)
+GUIDE_SEAL_SHIFT = (0, 0, 12, 4, -4, 8, 0, 12, 4, -4, 8, 0, 12, 4)
+
+
+def oracle_kins(kin):
+    """五大神諭：回傳 (主印記, 支持, 挑戰, 隱藏, 指引) 的 KIN"""
+    t, s = tone_of(kin), seal_of(kin)
+    s_ana = (18 - s) % 20 + 1
+    s_anti = (s + 9) % 20 + 1
+    s_occ = (20 - s) % 20 + 1
+    s_guide = (s + GUIDE_SEAL_SHIFT[t] - 1) % 20 + 1
+    return (kin, kin_from_tone_seal(t, s_ana), kin_from_tone_seal(t, s_anti),
+            kin_from_tone_seal(14 - t, s_occ), kin_from_tone_seal(t, s_guide))
+
+
+def goddess_kin(kin):
+    """女神印記：五大神諭的調性與圖騰各自加總"""
+    kins = oracle_kins(kin)
+    return kin_from_tone_seal((sum(tone_of(k) for k in kins) - 1) % 13 + 1,
+                              (sum(seal_of(k) for k in kins) - 1) % 20 + 1)
+
+
+def relationship_kin(kin1, kin2):
+    return (kin1 + kin2 - 1) % 260 + 1
+
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def moon_date(year, month, day):
+    """回傳 (標籤, 月, 日, 七價週)；無時間日與 0.0 Hunab Ku 的月/日/週皆為 0"""
+    if month == 2 and day == 29: return HUNAB_KU, 0, 0, 0
+    delta = (MONTH_DOY[month] + day - 1 - MOON_NEW_YEAR_DOY) % 365
+    if delta == 364: return DOOT, 0, 0, 0
+    moon = delta // 28 + 1
+    d = delta % 28 + 1
+    return f"{moon}.{d}", moon, d, delta // 7 + 1
+
+
+def moon_date_of(date_obj):
+    return moon_date(date_obj.year, date_obj.month, date_obj.day)
+
+
+def flow_year(birth_date, ref_date=None):
+    """ref_date 所在的個人流年：(該流年起始的公曆年, 流年 KIN)；2/29 出生者平年以 3/1 起算"""
+    if ref_date is None: ref_date = datetime.date.today()
+    target = ref_date.year if (ref_date.month, ref_date.day) >= (birth_date.month, birth_date.day) else ref_date.year - 1
+    return target, kin_num(target, birth_date.month, birth_date.day)
+
+
+def moon_year_of(date_obj):
+    """該日期所屬 13 月亮年的起始公曆年 (7/26 起算)"""
+    if (date_obj.month, date_obj.day) >= (7, 26): return date_obj.year
+    return date_obj.year - 1
+
+
+# ==========================================
+# 自我檢查：與 CSV 查表法逐日比對
+# ==========================================
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def _read_pairs(filename):
+    import csv
+    with open(os.path.join(DATA_DIR, filename), encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader)
+        return {int(r[0]): int(r[1]) for r in reader if r}
+
+
+def self_check():
+    """逐日比對 kin_start_year.csv 涵蓋的每一天，回傳不一致清單"""
+    start_year = _read_pairs("kin_start_year.csv")
+    month_accum = _read_pairs("month_day_accum.csv")
+    mismatches = []
+    d = datetime.date(min(start_year), 1, 1)
+    end = datetime.date(max(start_year), 12, 31)
+    one = datetime.timedelta(days=1)
+    checked = 0
+    while d <= end:
+        total = start_year[d.year] + month_accum[d.month] + d.day
+        expected = total % 260 or 260
+        got = kin_of(d)
+        if got != expected: mismatches.append((d, expected, got))
+        checked += 1
+        d += one
+    return checked, mismatches
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--self-check" not in argv:
+        print(__doc__)
+        return 0
+    checked, mismatches = self_check()
+    for d, expected, got in mismatches[:20]:
+        print(f"✗ {d}: CSV {expected} ≠ 引擎 {got}")
+    print(f"已比對 {checked} 天，不一致 {len(mismatches)} 天")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""260 KIN 索引：啟動時一次建好，之後每次查詢都是 O(1) 的陣列存取
+
+每個 KIN 是一筆 __slots__ 唯讀記錄，包含 kin_basic_info.csv 的詳細資料、
+五大神諭、所屬波符的 13 個 KIN、城堡，以及 Telektonon 行星/電路。
+"""
+from synchronotron import kin_engine
+from synchronotron.constants import TONES_NAME, SEALS_NAME, TELEKTONON_MAP
+
+CASTLE_NAMES = ("紅色東方啟動城堡", "白色北方跨越城堡", "藍色西方蛻變城堡", "黃色南方給予城堡", "綠色中央魔法城堡")
+
+
+class KinRecord:
+    __slots__ = ("kin", "tone", "seal", "details", "oracle", "goddess",
+                 "wavespell", "wavespell_no", "castle", "castle_no", "planet", "flow", "circuit")
+
+    def __init__(self, kin, details, telektonon):
+        t, s = kin_engine.tone_of(kin), kin_engine.seal_of(kin)
+        start = kin - t + 1
+        values = {
+            "kin": kin, "tone": t, "seal": s, "details": details,
+            "oracle": kin_engine.oracle_kins(kin),
+            "goddess": kin_engine.goddess_kin(kin),
+            "wavespell": tuple(range(start, start + 13)),
+            "wavespell_no": (kin - 1) // 13 + 1,
+            "castle": details.get("城堡") or CASTLE_NAMES[(kin - 1) // 52],
+            "castle_no": (kin - 1) // 52 + 1,
+            "planet": telektonon.get("planet", ""),
+            "flow": telektonon.get("flow", ""),
+            "circuit": telektonon.get("circuit", ""),
+        }
+        for name, value in values.items(): object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KinRecord 為唯讀記錄")
+
+    def __reduce__(self):
+        # st.cache_data 會 pickle 回傳值，重建時重新計算衍生欄位
+        return (KinRecord, (self.kin, self.details, {"planet": self.planet, "flow": self.flow, "circuit": self.circuit}))
+
+    def __repr__(self):
+        return f"KinRecord(KIN {self.kin} {self.details.get('主印記', '')})"
+
+
+def fallback_details(kin):
+    t, s = kin_engine.tone_of(kin), kin_engine.seal_of(kin)
+    return {'KIN': kin, '主印記': f"{TONES_NAME[t]}{SEALS_NAME[s]}", '圖騰': SEALS_NAME[s], '波符': '', '城堡': ''}
+
+
+class KinIndex:
+    """以 KIN (1-260) 直接索引的唯讀記錄表"""
+    __slots__ = ("_records",)
+
+    def __init__(self, rows=None, telektonon_map=TELEKTONON_MAP):
+        by_kin = {}
+        for row in rows or ():
+            try: by_kin[int(row['KIN'])] = dict(row)
+            except (KeyError, TypeError, ValueError): continue
+        records = [None]
+        for k in range(1, 261):
+            details = by_kin.get(k) or fallback_details(k)
+            records.append(KinRecord(k, details, telektonon_map.get(kin_engine.seal_of(k), {})))
+        object.__setattr__(self, "_records", tuple(records))
+
+    @classmethod
+    def from_frame(cls, df, telektonon_map=TELEKTONON_MAP):
+        if df is None: return cls(None, telektonon_map)
+        return cls(df.to_dict('records'), telektonon_map)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KinIndex 為唯讀索引")
+
+    def __reduce__(self):
+        return (_rebuild_index, (tuple(r.details for r in self._records[1:]),))
+
+    def __getitem__(self, kin):
+        return self._records[int(kin)]
+
+    def __len__(self):
+        return 260
+
+    def __iter__(self):
+        return iter(self._records[1:])
+
+    def details(self, kin):
+        return self._records[int(kin)].details
+
+    def oracle(self, kin):
+        return self._records[int(kin)].oracle
+
+
+def _rebuild_index(details):
+    return KinIndex(details)
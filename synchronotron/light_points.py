@@ -0,0 +1,216 @@
+"""八個光點：七價路徑、三個母體矩陣、MCF、一週 MCF 累加、Hunab Ku 21、一週 Hunab Ku 21 累加
+
+規則依 data/八個光點計算.csv 與 data/光點計算參照表.csv (1994/8/10、KIN 4 的範例)：
+  1. 七價路徑之門：當天等離子的門 (HEPTAD_GATE_INFO 的 BMU 與座標)
+  2-4. 時間 / 空間 / 共時母體矩陣：座標與 Matrix441.synchronotron 相同，TFI 為三個矩陣在該座標的數值和，
+       BMU 為基本母體矩陣 (Base_Matrix_441.csv) 在該座標的編號
+  5. MCF = 2-4 的 TFI 和；BMU = MCF 扣掉 441 的倍數，對等印記 = 扣掉 260 的倍數
+  6. 本週 (DALI 起) 到當天每天 MCF 的累加
+  7. Hunab Ku 21 = 五大神諭心電感應頻率 (Tzolkin_Matrix.csv) + 七價路徑之門的 BMU
+  8. 本週到當天每天 Hunab Ku 21 的累加
+5-8 的座標是 BMU 在基本母體矩陣中的位置；音符查 Octave_Scale.csv。
+一週中前幾天的 KIN 依日期往前推 (KIN 為當天印記時即為那一天的印記)；無時間日與 2/29 沒有等離子，只算當天。
+
+所有和日期或 KIN 有關的部分 (含一週的累加) 都先算成整數查表陣列，一張完整的八光點只需幾十次陣列讀取：
+
+    lp = db['light_points']
+    lp.chart(datetime.date(1994, 8, 10), 4)       # 單人：8 個光點的座標 / BMU / 音符 / TFI
+    lp.chart_arrays(month, day, kins)             # 整批 (可廣播)：tfi / bmu / pos / note 陣列
+    lp.contact_charts(contacts_df, date)          # 通訊錄所有人在同一天的八光點 (DataFrame)
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from synchronotron.batch import moon_date_arrays, split_dates
+from synchronotron.bmu import NOTES
+from synchronotron.constants import HEPTAD_GATE_INFO
+from synchronotron.matrix441 import SPACE, SYNC, TIME, TZOLKIN, format_pos, parse_pos
+
+POINTS = (
+    ("heptad", "七價路徑"),
+    ("time", "時間母體矩陣"),
+    ("space", "空間母體矩陣"),
+    ("sync", "共時母體矩陣"),
+    ("mcf", "主校準頻率 (MCF)"),
+    ("mcf_week", "諧波頻率 (一週 MCF 累加)"),
+    ("hunab_ku", "HUNAB KU 21"),
+    ("hunab_ku_week", "諧波頻率 (一週 HUNAB KU 21 累加)"),
+)
+HEPTAD, TIME_P, SPACE_P, SYNC_P, MCF, MCF_WEEK, HUNAB_KU, HUNAB_KU_WEEK = range(len(POINTS))
+TELEPATHIC_COL = "五大神諭心電感應頻率"
+
+# chart_arrays 的結果；tfi / bmu / note 的最後一維是 8 個光點，pos 為 (..., 8, 2)
+LightPointArrays = namedtuple("LightPointArrays", "tfi bmu pos note kin_equiv plasma")
+
+
+def _moon_calendar():
+    """(月, 日) → 等離子，以及 (13 月亮月, 月內第幾天) → (月, 日)；以平年排列，2/29 不在任何一週內"""
+    days = np.arange(np.datetime64("2001-07-26"), np.datetime64("2002-07-25"))
+    _, month, day = split_dates(days)
+    moon, mday, _ = moon_date_arrays(month, day)
+    md_of_moon = np.zeros((14, 29, 2), dtype=np.int8)
+    md_of_moon[moon, mday] = np.stack([month, day], axis=-1)
+    plasma = np.zeros((13, 32), dtype=np.int8)
+    plasma[month, day] = (mday - 1) % 7 + 1
+    moon_of_md = np.zeros((13, 32, 2), dtype=np.int8)
+    moon_of_md[month, day] = np.stack([moon, mday], axis=-1)
+    return plasma, moon_of_md, md_of_moon
+
+
+class LightPoints:
+    """八個光點的查表陣列；由 Matrix441 與基本母體矩陣 / 八度音階 / 卓爾金曆矩陣建立"""
+
+    def __init__(self, matrix, base_frame=None, octave_frame=None, tzolkin_frame=None):
+        self.matrix = matrix
+        # 基本母體矩陣：座標 → 編號 (BMU)、編號 → 座標
+        self.base_number = np.zeros((22, 22), dtype=np.int16)
+        self.base_pos = np.zeros((442, 2), dtype=np.int8)
+        if base_frame is not None:
+            for pos_text, n in zip(base_frame['矩陣位置'], base_frame['KIN']):
+                pos = parse_pos(pos_text)
+                if pos and 1 <= n <= 441: self.base_number[pos], self.base_pos[n] = n, pos
+        self.note = np.zeros((22, 22), dtype=np.int8)
+        if octave_frame is not None:
+            for note, pos_text in zip(octave_frame['八度音符'], octave_frame['矩陣位置']):
+                pos = parse_pos(pos_text)
+                if pos and note in NOTES: self.note[pos] = NOTES.index(note)
+        self.telepathic = np.zeros(261, dtype=np.int32)
+        if tzolkin_frame is not None and TELEPATHIC_COL in tzolkin_frame:
+            for kin, f in zip(tzolkin_frame['KIN'], tzolkin_frame[TELEPATHIC_COL]):
+                if 1 <= kin <= 260 and f == f: self.telepathic[kin] = f
+        self._build()
+
+    @classmethod
+    def from_db(cls, db):
+        return cls(db['matrix441'], db['base_matrix'], db['octave_scale'], db['tzolkin_matrix'])
+
+    def _build(self):
+        val = self.matrix.values.astype(np.int32)
+        tfi_at = val[:3].sum(axis=0)          # (v, h) → 時間 + 空間 + 共時
+        # 七價路徑之門 (索引為等離子 1-7，0 為無時間日 / 2/29)
+        self.gate_bmu = np.zeros(8, dtype=np.int32)
+        self.gate_pos = np.zeros((8, 2), dtype=np.int8)
+        for plasma, info in HEPTAD_GATE_INFO.items():
+            self.gate_bmu[plasma], self.gate_pos[plasma] = info['bmu'], parse_pos(info['pos'])
+        # 日期 (月, 日) 的時間母體矩陣
+        self.plasma, self.moon_of_md, self.md_of_moon = _moon_calendar()
+        self.day_pos = self.matrix.date_pos.astype(np.int8)
+        self.day_tfi = tfi_at[self.day_pos[..., 0], self.day_pos[..., 1]]
+        self.day_tfi[self.day_pos[..., 0] == 0] = 0
+        # KIN 的空間 / 共時母體矩陣 (與 Matrix441.synchronotron 的第 2、3 步相同)
+        kins = np.arange(261)
+        self.kin_pos = self.matrix.positions[[SPACE, TZOLKIN], :261].astype(np.int8)
+        sp, tz = self.kin_pos[0], self.kin_pos[1]
+        self.kin_tfi = np.stack([val[TIME, sp[:, 0], sp[:, 1]] + kins + val[SYNC, sp[:, 0], sp[:, 1]],
+                                 val[TIME, tz[:, 0], tz[:, 1]] + val[SPACE, tz[:, 0], tz[:, 1]] + kins])
+        self.kin_tfi[:, 0] = 0
+        # 一週的累加：日期部分依 (月, 日)、KIN 部分依 (KIN, 等離子)；等離子 0 只算當天
+        days = np.maximum(self.plasma, 1)
+        moon, mday = self.moon_of_md[..., 0], self.moon_of_md[..., 1]
+        self.day_week = self.day_tfi.copy()
+        for j in range(1, 7):
+            back = self.md_of_moon[moon, np.maximum(mday - j, 0)]
+            self.day_week += np.where(days > j, self.day_tfi[back[..., 0], back[..., 1]], 0)
+        per_kin = self.kin_tfi.sum(axis=0)
+        back_kins = (kins[:, None] - 1 - np.arange(7)) % 260 + 1   # (KIN, j) → 往前 j 天的 KIN
+        n = np.maximum(np.arange(8), 1)                             # 等離子 → 累加天數
+        upto = np.arange(7) < n[:, None]                            # (等離子, j)
+        self.kin_week = (per_kin[back_kins][:, None, :] * upto).sum(axis=-1)
+        self.telepathic_week = (self.telepathic[back_kins][:, None, :] * upto).sum(axis=-1)
+        self.kin_week[0] = self.telepathic_week[0] = 0
+        self.gate_week = np.cumsum(self.gate_bmu)
+        # 單筆查詢用的 Python 串列 (NumPy 純量索引每次都有額外成本)
+        self._lists = {name: getattr(self, name).tolist() for name in (
+            "plasma", "moon_of_md", "md_of_moon", "day_pos", "day_tfi", "kin_pos", "kin_tfi", "telepathic",
+            "gate_bmu", "gate_pos", "base_number", "base_pos", "note")}
+        self._values = self.matrix.values.tolist()
+
+    # ---------- 整批 ----------
+    def chart_arrays(self, month, day, kins):
+        """八光點的向量化版本 (month / day / kins 可廣播)；無法定位的日期或無效 KIN 全部為 0"""
+        month, day = np.asarray(month), np.asarray(day)
+        kins = np.asarray(kins, dtype=np.int64)
+        month, day, kins = np.broadcast_arrays(month, day, kins)
+        ok = (self.day_pos[month, day, 0] > 0) & (kins >= 1) & (kins <= 260)
+        kins = np.where(ok, kins, 0)
+        plasma = self.plasma[month, day]
+        tfi = np.zeros(kins.shape + (8,), dtype=np.int32)
+        pos = np.zeros(kins.shape + (8, 2), dtype=np.int8)
+        tfi[..., HEPTAD], pos[..., HEPTAD, :] = self.gate_bmu[plasma], self.gate_pos[plasma]
+        tfi[..., TIME_P], pos[..., TIME_P, :] = self.day_tfi[month, day], self.day_pos[month, day]
+        tfi[..., SPACE_P], pos[..., SPACE_P, :] = self.kin_tfi[0, kins], self.kin_pos[0, kins]
+        tfi[..., SYNC_P], pos[..., SYNC_P, :] = self.kin_tfi[1, kins], self.kin_pos[1, kins]
+        tfi[..., MCF] = tfi[..., TIME_P] + tfi[..., SPACE_P] + tfi[..., SYNC_P]
+        tfi[..., MCF_WEEK] = self.day_week[month, day] + self.kin_week[kins, plasma]
+        tfi[..., HUNAB_KU] = self.telepathic[kins] + self.gate_bmu[plasma]
+        tfi[..., HUNAB_KU_WEEK] = self.telepathic_week[kins, plasma] + self.gate_week[plasma]
+        tfi[~ok] = 0
+        bmu = np.zeros(tfi.shape, dtype=np.int16)
+        bmu[..., :MCF] = self.base_number[pos[..., :MCF, 0], pos[..., :MCF, 1]]
+        sums = tfi[..., MCF:]
+        bmu[..., MCF:] = np.where(sums > 0, (sums - 1) % 441 + 1, 0)
+        pos[..., MCF:, :] = self.base_pos[bmu[..., MCF:]]
+        bmu[~ok], pos[~ok] = 0, 0
+        note = self.note[pos[..., 0], pos[..., 1]]
+        mcf = tfi[..., MCF]
+        kin_equiv = np.where(ok, (mcf - 1) % 260 + 1, 0).astype(np.int16)
+        return LightPointArrays(tfi, bmu, pos, note, kin_equiv, np.where(ok, plasma, 0))
+
+    def chart_dates(self, dates, kins):
+        """整批日期 (datetime64) × KIN"""
+        _, month, day = split_dates(dates)
+        return self.chart_arrays(month, day, kins)
+
+    def contact_charts(self, contacts, date_obj):
+        """通訊錄 (需有 KIN 欄) 每個人在 date_obj 的八光點；每個光點一組 BMU / 音符 / TFI 欄位"""
+        import pandas as pd
+        from synchronotron.contact_index import kin_codes
+        kins = kin_codes(contacts['KIN']) if len(contacts) else np.zeros(0, dtype=np.int16)
+        r = self.chart_arrays(date_obj.month, date_obj.day, kins)
+        out = {"姓名": contacts['姓名'].to_numpy() if '姓名' in contacts else np.arange(len(kins)), "KIN": kins}
+        notes = np.array(NOTES, dtype=object)
+        for i, (_, label) in enumerate(POINTS):
+            out[f"{i + 1} {label} BMU"] = r.bmu[:, i]
+            out[f"{i + 1} 音符"] = notes[r.note[:, i]]
+            if i != HEPTAD: out[f"{i + 1} TFI"] = r.tfi[:, i]
+        out["對等印記"] = r.kin_equiv
+        return pd.DataFrame(out, index=contacts.index if len(contacts) else None)
+
+    # ---------- 單筆 ----------
+    def chart(self, date_obj, kin):
+        """單一日期 × KIN 的八個光點 (chart_arrays 的純 Python 版本)；日期無法定位 (2/29) 或 KIN 無效時回傳 None"""
+        L, val = self._lists, self._values
+        m, d = date_obj.month, date_obj.day
+        v1, h1 = L['day_pos'][m][d]
+        if not v1 or not 1 <= kin <= 260: return None
+        plasma = L['plasma'][m][d]
+        moon, mday = L['moon_of_md'][m][d]
+        gate = L['gate_bmu'][plasma]
+        sp, tz = L['kin_pos'][0][kin], L['kin_pos'][1][kin]
+        terms = [(), tuple(val[t][v1][h1] for t in (TIME, SPACE, SYNC)),
+                 (val[TIME][sp[0]][sp[1]], kin, val[SYNC][sp[0]][sp[1]]),
+                 (val[TIME][tz[0]][tz[1]], val[SPACE][tz[0]][tz[1]], kin)]
+        terms.append(tuple(sum(t) for t in terms[1:]))
+        # 本週 DALI → 當天每一天的 MCF 與 Hunab Ku 21，前幾天的 KIN 往前推
+        mcf_days, hk_days = [], []
+        for j in range(max(plasma, 1) - 1, 0, -1):
+            bm, bd = L['md_of_moon'][moon][mday - j]
+            k = (kin - 1 - j) % 260 + 1
+            mcf_days.append(L['day_tfi'][bm][bd] + L['kin_tfi'][0][k] + L['kin_tfi'][1][k])
+            hk_days.append(L['telepathic'][k] + L['gate_bmu'][plasma - j])
+        mcf = sum(terms[MCF])
+        mcf_days.append(mcf)
+        hk_days.append(L['telepathic'][kin] + gate)
+        terms += [tuple(mcf_days), (L['telepathic'][kin], gate), tuple(hk_days)]
+        tfi = [gate, *terms[MCF], mcf, sum(mcf_days), hk_days[-1], sum(hk_days)]
+        bmu = [L['base_number'][v][h] for v, h in (L['gate_pos'][plasma], (v1, h1), sp, tz)]
+        bmu += [(t - 1) % 441 + 1 for t in tfi[MCF:]]
+        pos = [L['gate_pos'][plasma], (v1, h1), sp, tz] + [L['base_pos'][b] for b in bmu[MCF:]]
+        gate_info = HEPTAD_GATE_INFO.get(plasma, {})
+        labels = (f"{gate_info.get('plasma', '')} {gate_info.get('chakra', '')}".strip(),
+                  f"{moon:02d}.{mday:02d}" if moon else "", f"KIN {kin}", f"KIN {kin}", "", "", "", "")
+        points = [{"no": i + 1, "key": key, "name": name, "label": labels[i], "pos": format_pos(*pos[i]),
+                   "bmu": bmu[i], "note": NOTES[L['note'][pos[i][0]][pos[i][1]]], "tfi": tfi[i], "terms": terms[i]}
+                  for i, (key, name) in enumerate(POINTS)]
+        return {"plasma": plasma, "KIN": kin, "KIN_EQUIV": (mcf - 1) % 260 + 1, "points": points}
@@ -0,0 +1,125 @@
+"""441 矩陣儲存：把「Vn:Hm」座標一次解析成整數，MCF/BMU 只需陣列索引
+
+四個矩陣 (時間 / 空間 / 共時 / 卓爾金曆) 各存成 22×22 的整數陣列
+(第 0 列/欄保留為 0，代表查無座標)，另有 KIN→座標 的反查陣列，
+以及「國曆月日 → 時間矩陣座標」表。單一日期與整批日期共用同一套運算。
+"""
+import os
+import re
+
+import numpy as np
+
+from synchronotron import kin_engine
+
+MATRIX_KEYS = ('time_matrix', 'space_matrix', 'synchronic_matrix', 'tzolkin_matrix')
+TIME, SPACE, SYNC, TZOLKIN = range(4)
+MATRIX_FILES = {
+    'time_matrix': "Time_Matrix.csv",
+    'space_matrix': "Space_Matrix.csv",
+    'synchronic_matrix': "Synchronic_Matrix.csv",
+    'tzolkin_matrix': "Tzolkin_Matrix.csv",
+    'date_to_matrix': "瑪雅生日對時間矩陣對照表.csv",
+}
+DOOT_POS = (11, 11)  # 無時間日固定在 Hunab Ku 21 中心
+
+_POS_RE = re.compile(r'V\s*0*(\d+)\s*:\s*H\s*0*(\d+)', re.I)
+
+
+def parse_pos(text):
+    """「V11:H2」或「V01:H02」→ (11, 2)；無法解析回傳 None"""
+    m = _POS_RE.search(str(text))
+    if not m: return None
+    v, h = int(m.group(1)), int(m.group(2))
+    return (v, h) if 1 <= v <= 21 and 1 <= h <= 21 else None
+
+
+def format_pos(v, h):
+    return f"V{v}:H{h}" if v and h else None
+
+
+def _to_int(value):
+    try: return int(float(value))
+    except (TypeError, ValueError): return 0
+
+
+class Matrix441:
+    __slots__ = ("values", "positions", "date_pos")
+
+    def __init__(self, frames):
+        # values[m, v, h]：矩陣 m 在 (v, h) 的數值
+        self.values = np.zeros((4, 22, 22), dtype=np.int32)
+        # positions[m, n] = (v, h)：數值 n 在矩陣 m 中第一次出現的座標
+        self.positions = np.zeros((4, 442, 2), dtype=np.int16)
+        # date_pos[month, day] = 生日在時間矩陣的 (v, h)
+        self.date_pos = np.zeros((13, 32, 2), dtype=np.int16)
+        for m, key in enumerate(MATRIX_KEYS):
+            df = frames.get(key)
+            if df is None or '矩陣位置' not in df or 'KIN' not in df: continue
+            for pos_text, kin in reversed(list(zip(df['矩陣位置'], df['KIN']))):
+                pos, n = parse_pos(pos_text), _to_int(kin)
+                if not pos or not n: continue
+                self.values[m, pos[0], pos[1]] = n
+                if n < 442: self.positions[m, n] = pos
+        df = frames.get('date_to_matrix')
+        if df is not None:
+            for md, pos_text in zip(df['月日'], df['時間矩陣位置']):
+                pos = parse_pos(pos_text)
+                try: month, day = (int(x) for x in str(md).split('/'))
+                except ValueError: continue
+                if pos: self.date_pos[month, day] = pos
+        if not self.date_pos[7, 25].any(): self.date_pos[7, 25] = DOOT_POS
+
+    @classmethod
+    def from_db(cls, db):
+        return cls({key: db.get(key) for key in MATRIX_FILES})
+
+    @classmethod
+    def from_csv(cls, data_dir=kin_engine.DATA_DIR):
+        from synchronotron.csvio import read_csv
+        return cls({key: read_csv(os.path.join(data_dir, f)) for key, f in MATRIX_FILES.items()})
+
+    def value(self, matrix, v, h):
+        return int(self.values[matrix, v, h])
+
+    def position(self, matrix, n):
+        v, h = self.positions[matrix, n]
+        return int(v), int(h)
+
+    def synchronotron(self, month, day, main_kin):
+        """單一日期的三段 TFI 加總；生日無法定位時回傳 None"""
+        v1, h1 = (int(x) for x in self.date_pos[month, day])
+        if not v1: return None
+        val = self.values
+        steps = []
+        steps.append(((v1, h1), (val[TIME, v1, h1], val[SPACE, v1, h1], val[SYNC, v1, h1])))
+        v2, h2 = self.position(SPACE, main_kin)
+        steps.append(((v2, h2), (val[TIME, v2, h2], main_kin, val[SYNC, v2, h2])))
+        v3, h3 = self.position(TZOLKIN, main_kin)
+        steps.append(((v3, h3), (val[TIME, v3, h3], val[SPACE, v3, h3], main_kin)))
+        steps = [(pos, tuple(int(x) for x in terms)) for pos, terms in steps]
+        mcf = sum(sum(terms) for _, terms in steps)
+        return {'MCF': mcf, 'BMU': (mcf - 1) % 441 + 1, 'KIN_EQUIV': (mcf - 1) % 260 + 1, 'steps': steps}
+
+    def synchronotron_arrays(self, month, day, main_kins):
+        """synchronotron 的向量化版本：回傳 (MCF, BMU, 對等 KIN) 陣列，無法定位者皆為 0"""
+        month, day = np.asarray(month), np.asarray(day)
+        kins = np.asarray(main_kins, dtype=np.int64)
+        val = self.values.astype(np.int64)
+        p1 = self.date_pos[month, day]
+        v1, h1 = p1[..., 0], p1[..., 1]
+        sum_1 = val[TIME, v1, h1] + val[SPACE, v1, h1] + val[SYNC, v1, h1]
+        p2 = self.positions[SPACE, kins]
+        sum_2 = val[TIME, p2[..., 0], p2[..., 1]] + kins + val[SYNC, p2[..., 0], p2[..., 1]]
+        p3 = self.positions[TZOLKIN, kins]
+        sum_3 = val[TIME, p3[..., 0], p3[..., 1]] + val[SPACE, p3[..., 0], p3[..., 1]] + kins
+        ok = v1 > 0
+        mcf = np.where(ok, sum_1 + sum_2 + sum_3, 0)
+        bmu = np.where(ok, (mcf - 1) % 441 + 1, 0)
+        kin_equiv = np.where(ok, (mcf - 1) % 260 + 1, 0)
+        return mcf, bmu, kin_equiv
+
+    def synchronotron_dates(self, dates, main_kins):
+        """整批日期 (datetime64) × 對應主印記 KIN 的 MCF/BMU"""
+        from synchronotron.batch import split_dates
+        _, month, day = split_dates(dates)
+        return self.synchronotron_arrays(month, day, main_kins)
@@ -0,0 +1,266 @@
+"""效能量測：每次 rerun 的計時區段、計數器與快取命中，並可輸出成 JSONL 追蹤檔
+
+    trace = profiling.begin_trace()              # rerun 開頭
+    with profiling.span("load_contacts_db"): ...
+    load_data = profiling.timed("load_data")(load_data)
+    profiling.instrument(assets, "data_uri", "data_uri", size=len)   # 包裝既有函式 (計時 + 位元組數)
+    profiling.watch_cache("thumbnail", assets.thumbnail)            # lru_cache 本次 rerun 的命中數
+    profiling.end_trace(page=...)                 # rerun 結尾：設定 SYNC_TRACE_FILE 時附加一行 JSON
+
+每條執行緒 (Streamlit 每個 session 各自一條) 有自己的 trace；不在 trace 中時量測會被略過。
+程序啟動時的匯入與初始化只記錄第一次 (startup)，之後的 rerun 不再出現。
+
+比較不同部署版本：python -m synchronotron.profiling summary traces.jsonl
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+TRACE_FILE_ENV = "SYNC_TRACE_FILE"
+DEPLOY_ENV = "SYNC_DEPLOY_ID"
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_startup = {}
+_startup_lock = threading.Lock()
+
+
+class Trace:
+    """一次 rerun 的量測結果"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.elapsed = None
+        self.page = None
+        self.spans = defaultdict(lambda: [0.0, 0])   # 名稱 → [累計秒數, 次數]
+        self.counters = defaultdict(int)
+        self._caches = {}                            # 名稱 → (快取函式, 開始時的 (hits, misses))
+        self._open = {}
+
+    def add(self, name, seconds):
+        s = self.spans[name]
+        s[0] += seconds
+        s[1] += 1
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def start(self, name):
+        self._open[name] = time.perf_counter()
+
+    def stop(self, name):
+        t = self._open.pop(name, None)
+        if t is not None: self.add(name, time.perf_counter() - t)
+
+    def watch_cache(self, name, cached_fn):
+        if name not in self._caches:
+            info = cached_fn.cache_info()
+            self._caches[name] = (cached_fn, (info.hits, info.misses))
+
+    def cache_deltas(self):
+        out = {}
+        for name, (fn, (hits, misses)) in self._caches.items():
+            info = fn.cache_info()
+            out[name] = {"hits": info.hits - hits, "misses": info.misses - misses, "size": info.currsize}
+        return out
+
+    def finish(self, page=None):
+        if page is not None: self.page = page
+        for name in list(self._open): self.stop(name)
+        self.elapsed = time.perf_counter() - self._t0
+        return self
+
+    def to_dict(self):
+        return {
+            "ts": round(self.started, 3), "deploy": deploy_id(), "pid": os.getpid(), "page": self.page,
+            "total_ms": round((self.elapsed or 0) * 1000, 3),
+            "spans": {k: {"ms": round(v[0] * 1000, 3), "calls": v[1]} for k, v in self.spans.items()},
+            "counters": dict(self.counters), "caches": self.cache_deltas(),
+        }
+
+    def rows(self):
+        """給效能面板的表格：計時區段依耗時遞減"""
+        return [{"項目": k, "ms": round(v[0] * 1000, 2), "次數": v[1]}
+                for k, v in sorted(self.spans.items(), key=lambda kv: -kv[1][0])]
+
+
+def current():
+    return getattr(_local, "trace", None)
+
+
+def begin_trace():
+    _local.trace = Trace()
+    return _local.trace
+
+
+def end_trace(page=None, path=None):
+    """結束目前的 trace；path (或環境變數 SYNC_TRACE_FILE) 有設定時附加一行 JSON"""
+    trace = current()
+    if trace is None: return None
+    trace.finish(page)
+    _local.trace = None
+    path = path or os.environ.get(TRACE_FILE_ENV)
+    if path: write_trace(trace, path)
+    return trace
+
+
+def write_trace(trace, path):
+    record = trace.to_dict()
+    with _startup_lock:
+        if _startup and not _startup.get("_written"):
+            record["startup"] = {k: v for k, v in _startup.items() if not k.startswith("_")}
+            _startup["_written"] = True
+    line = json.dumps(record, ensure_ascii=False)
+    with _write_lock:
+        try:
+            with open(path, "a", encoding="utf-8") as f: f.write(line + "\n")
+        except OSError: pass
+
+
+# ---------- 量測 ----------
+class span:
+    """計時區段 (context manager)；不在 trace 中時不做任何事"""
+    __slots__ = ("name", "_t")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        trace = current()
+        if trace is not None: trace.add(self.name, time.perf_counter() - self._t)
+        return False
+
+
+def count(name, n=1):
+    trace = current()
+    if trace is not None: trace.count(name, n)
+
+
+def watch_cache(name, cached_fn):
+    trace = current()
+    if trace is not None: trace.watch_cache(name, cached_fn)
+
+
+def start(name):
+    """開始一段跨越多行程式的計時 (例如整個頁面)，以 stop(name) 結束"""
+    trace = current()
+    if trace is not None: trace.start(name)
+
+
+def stop(name):
+    trace = current()
+    if trace is not None: trace.stop(name)
+
+
+def timed(name, size=None):
+    """包裝函式：每次呼叫計時；size(結果) 有給時另記 name.bytes"""
+    def wrap(fn):
+        if getattr(fn, "__profiled__", None) == name: return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = current()
+            if trace is None: return fn(*args, **kwargs)
+            t = time.perf_counter()
+            try: result = fn(*args, **kwargs)
+            finally: trace.add(name, time.perf_counter() - t)
+            if size is not None and result is not None: trace.count(name + ".bytes", size(result))
+            return result
+        wrapper.__profiled__ = name
+        return wrapper
+    return wrap
+
+
+def instrument(owner, attr, name=None, size=None):
+    """把 owner (模組或類別) 上的既有函式換成計時版本；重複呼叫不會重複包裝"""
+    fn = getattr(owner, attr)
+    wrapped = timed(name or attr, size)(fn)
+    if wrapped is not fn: setattr(owner, attr, wrapped)
+    return wrapped
+
+
+@functools.lru_cache(maxsize=1)
+def deploy_id():
+    """部署版本：環境變數 SYNC_DEPLOY_ID，否則讀 .git 的 HEAD commit (不呼叫 git)"""
+    value = os.environ.get(DEPLOY_ENV)
+    if value: return value
+    try:
+        git_dir = os.path.join(ROOT_DIR, ".git")
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f: head = f.read().strip()
+        if not head.startswith("ref: "): return head[:12]
+        ref = head[5:]
+        ref_path = os.path.join(git_dir, ref)
+        if os.path.exists(ref_path):
+            with open(ref_path, encoding="utf-8") as f: return f.read().strip()[:12]
+        with open(os.path.join(git_dir, "packed-refs"), encoding="utf-8") as f:
+            for line in f:
+                if line.rstrip().endswith(" " + ref): return line[:12]
+    except OSError: pass
+    return ""
+
+
+# ---------- 程序啟動 (只記第一次) ----------
+class startup:
+    """程序啟動階段的計時 (例如匯入大型套件)；每個名稱只記第一次"""
+    __slots__ = ("name", "_t")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._t
+        with _startup_lock: _startup.setdefault(self.name, round(elapsed * 1000, 3))
+        return False
+
+
+def startup_timings():
+    return {k: v for k, v in _startup.items() if not k.startswith("_")}
+
+
+# ---------- 追蹤檔分析 ----------
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+def summarize(path, key="total_ms"):
+    """依 (部署版本, 頁面) 彙總 rerun 的 p50 / p95 耗時 (ms)"""
+    groups = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip(): continue
+            r = json.loads(line)
+            value = r.get(key) if key == "total_ms" else r.get("spans", {}).get(key, {}).get("ms")
+            if value is not None: groups[(r.get("deploy", ""), r.get("page"))].append(value)
+    return [{"deploy": d, "page": p, "n": len(v), "p50_ms": _percentile(v, 0.5), "p95_ms": _percentile(v, 0.95)}
+            for (d, p), v in sorted(groups.items(), key=lambda kv: (kv[0][0], str(kv[0][1])))]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] != "summary":
+        print(__doc__)
+        return 0
+    key = argv[2] if len(argv) > 2 else "total_ms"
+    print(f"{'deploy':<13} {'n':>5} {'p50 ms':>9} {'p95 ms':>9}  page ({key})")
+    for r in summarize(argv[1], key):
+        print(f"{r['deploy']:<13} {r['n']:>5} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f}  {r['page']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
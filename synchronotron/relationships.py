@@ -0,0 +1,136 @@
+"""通訊錄關係矩陣：所有人兩兩合盤的 KIN / 調性 / 圖騰，以及彼此的神諭關係
+
+合盤規則與 calculate_relationship 相同：KIN 相加 (超過 260 循環)，調性與圖騰也各自相加。
+神諭關係以圖騰判斷 (Y 的圖騰是否為 X 的支持 / 挑戰 / 隱藏 / 指引圖騰)；
+指引圖騰取決於 X 的調性，所以 指引 不一定是雙向的。
+
+    m = RelationshipMatrix(kins, names)
+    m.composite()                      # N×N 合盤 KIN (int16)
+    m.partners(i, "analog")            # 與第 i 人成支持關係的人 (依圖騰分組，只看結果本身)
+    m.pairs("antipode")                # 所有挑戰配對 (i, j)
+    m.top_k(i, 5)                      # 與第 i 人神諭關係最多的 5 人
+    m.team_kin([0, 3, 7])              # 任意子集合的團隊 KIN
+
+一萬人的完整 N×N 矩陣需要 200 MB，composite / relations 可只取部分列 (rows=...) 分塊計算。
+"""
+import numpy as np
+
+from synchronotron.batch import ORACLE_TABLE
+
+RELATIONS = ("analog", "antipode", "occult", "guide")
+RELATION_NAMES = {"analog": "支持", "antipode": "挑戰", "occult": "隱藏", "guide": "指引"}
+# relations() 的位元旗標
+RELATION_FLAGS = {name: 1 << i for i, name in enumerate(RELATIONS)}
+
+
+def _seal(kin):
+    return (kin.astype(np.int16) - 1) % 20 + 1
+
+
+def _tone(kin):
+    return (kin.astype(np.int16) - 1) % 13 + 1
+
+
+def composite_kin(a, b):
+    """calculate_relationship 的向量化版本 (可廣播)"""
+    return ((a.astype(np.int32) + b - 1) % 260 + 1).astype(np.int16)
+
+
+class RelationshipMatrix:
+    """kins 為 1-260 的 KIN 陣列 (無效的請先排除)；names 可選，供 frame 輸出使用"""
+
+    def __init__(self, kins, names=None):
+        self.kins = np.asarray(kins, dtype=np.int16)
+        if len(self.kins) and (self.kins.min() < 1 or self.kins.max() > 260): raise ValueError("KIN 需介於 1-260")
+        self.names = None if names is None else np.asarray(names, dtype=object)
+        self.tones = _tone(self.kins)
+        self.seals = _seal(self.kins)
+        # 每個人的 支持 / 挑戰 / 隱藏 / 指引 圖騰：shape (N, 4)
+        self.target_seals = _seal(ORACLE_TABLE[self.kins][:, 1:5])
+        # 依圖騰分組的列位置 (倒排索引)
+        order = np.argsort(self.seals, kind="stable")
+        bounds = np.searchsorted(self.seals[order], np.arange(1, 22))
+        self._by_seal = [None] + [order[bounds[s - 1]:bounds[s]] for s in range(1, 21)]
+
+    def __len__(self):
+        return len(self.kins)
+
+    def _slice(self, idx):
+        return slice(None) if idx is None else idx
+
+    # ---------- 矩陣 ----------
+    def composite(self, rows=None, cols=None):
+        """合盤 KIN 矩陣 [rows × cols]"""
+        r, c = self._slice(rows), self._slice(cols)
+        return composite_kin(self.kins[r][:, None], self.kins[c][None, :])
+
+    def composite_tone(self, rows=None, cols=None):
+        return _tone(self.composite(rows, cols))
+
+    def composite_seal(self, rows=None, cols=None):
+        return _seal(self.composite(rows, cols))
+
+    def relations(self, rows=None, cols=None):
+        """關係旗標矩陣 (uint8)：第 i 列第 j 欄的 bit 表示 j 是 i 的 支持 / 挑戰 / 隱藏 / 指引"""
+        r, c = self._slice(rows), self._slice(cols)
+        targets, seals = self.target_seals[r], self.seals[c]
+        out = np.zeros((len(targets), len(seals)), dtype=np.uint8)
+        for k, name in enumerate(RELATIONS):
+            out |= (targets[:, k:k + 1] == seals[None, :]).astype(np.uint8) * RELATION_FLAGS[name]
+        return out
+
+    # ---------- 查詢 (只看結果本身，不掃描 N×N) ----------
+    def partners(self, i, relation):
+        """與第 i 人有指定關係的人 (列位置，遞增)；不含本人"""
+        seal = self.target_seals[i, RELATIONS.index(relation)]
+        result = self._by_seal[seal]
+        return result[result != i]
+
+    def pairs(self, relation):
+        """所有 (i, j) 使 j 是 i 的指定關係；回傳兩個等長陣列"""
+        k = RELATIONS.index(relation)
+        firsts, seconds = [], []
+        for i_seal in range(1, 21):
+            group = self._by_seal[i_seal]
+            if not len(group): continue
+            # 支持 / 挑戰 / 隱藏 只由圖騰決定；指引還要看調性，所以依目標圖騰再細分
+            for target in np.unique(self.target_seals[group, k]):
+                members = group[self.target_seals[group, k] == target]
+                others = self._by_seal[target]
+                if not len(others): continue
+                i_idx, j_idx = np.repeat(members, len(others)), np.tile(others, len(members))
+                keep = i_idx != j_idx
+                firsts.append(i_idx[keep])
+                seconds.append(j_idx[keep])
+        if not firsts: return np.zeros(0, np.intp), np.zeros(0, np.intp)
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def scores(self, i):
+        """第 i 人與每個人之間 (雙向) 的神諭關係數 0-8"""
+        forward = self.relations([i])[0]
+        backward = (self.target_seals == self.seals[i]).sum(axis=1)
+        bits = np.unpackbits(forward[:, None], axis=1).sum(axis=1)
+        s = bits + backward
+        s[i] = 0
+        return s
+
+    def top_k(self, i, k=10):
+        """與第 i 人神諭關係最多的 k 人 (列位置, 關係數)，依關係數遞減"""
+        s = self.scores(i).astype(np.int16)
+        s[i] = -1  # 排除本人
+        k = min(k, len(s) - 1)
+        if k <= 0: return np.zeros(0, np.intp), np.zeros(0, s.dtype)
+        top = np.argpartition(-s, k - 1)[:k]
+        top = top[np.lexsort((top, -s[top]))]
+        return top, s[top]
+
+    def team_kin(self, indices):
+        """子集合所有人的 KIN 加總 (循環 1-260)；兩人時即為合盤 KIN"""
+        kins = self.kins[np.asarray(indices, dtype=np.intp)]
+        if not len(kins): return None
+        return int((kins.astype(np.int64).sum() - 1) % 260 + 1)
+
+    def relation_labels(self, i, cols=None):
+        """第 i 人對每個人的關係名稱 (以、分隔)，給表格顯示"""
+        flags = self.relations([i], cols)[0]
+        return ["、".join(RELATION_NAMES[n] for n in RELATIONS if f & RELATION_FLAGS[n]) for f in flags]
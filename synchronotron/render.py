@@ -0,0 +1,152 @@
+"""與 Streamlit 無關的 HTML 產生器：app.py 的卡片渲染只負責把這裡的字串交給 st.markdown
+
+神諭十字與 13 天波符各組成一整段 HTML，整段只需一次 st.markdown，
+不再為每張卡片 / 每一列各建立 columns、image、markdown；結果依 (KIN, 標示 KIN) 存在有上限的 LRU。
+快取的是 (HTML, 圖片統計)，命中時仍會把這段 HTML 的圖片位元組記入 assets.page_stats()。
+圖片：啟用靜態檔時是同一張 sprite 的 background-position (瀏覽器只抓一次)，否則為快取的縮圖 data URI。
+"""
+import functools
+
+from synchronotron import assets, kin_engine
+from synchronotron.constants import TONES_NAME, SEALS_NAME
+
+ANALYSIS_CACHE_SIZE = 128
+CROSS_COLORS = {"guide": "#F4F6F6", "antipode": "#F4F6F6", "main": "#FCF3CF", "analog": "#F4F6F6", "occult": "#F4F6F6"}
+# (神諭, 標題, 在 3×3 格線中的位置 (列, 欄))
+CROSS_LAYOUT = (
+    ("guide", "指引 (Guide)", (1, 2)),
+    ("antipode", "挑戰 (Antipode)", (2, 1)),
+    ("main", "主印記 (Main Kin)", (2, 2)),
+    ("analog", "支持 (Analog)", (2, 3)),
+    ("occult", "隱藏 (Occult)", (3, 2)),
+)
+ORACLE_ORDER = ("main", "analog", "antipode", "occult", "guide")  # kin_engine.oracle_kins 的順序
+
+
+def _cached(fn):
+    """有上限的 LRU，快取 (HTML, 用到的圖片統計)；每次呼叫 (含快取命中) 都把統計記入這次 rerun 的 page_stats"""
+    @functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+    def build(*args, **kwargs):
+        with assets.capture_stats() as stats:
+            html = fn(*args, **kwargs)
+        return html, stats
+
+    @functools.wraps(fn)
+    def cached(*args, **kwargs):
+        html, stats = build(*args, **kwargs)
+        assets.page_stats().add(stats)
+        return html
+    cached.cache_info, cached.cache_clear = build.cache_info, build.cache_clear
+    return cached
+
+
+def _compact(html):
+    """去掉縮排與換行：st.markdown 中縮排 4 格以上或空行會讓 HTML 區塊被當成程式碼 / 段落"""
+    return " ".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+def kin_card_html(title, kin_num, bg_color="#FFFFFF"):
+    """直式卡片的 HTML：[標題] [調性圖] [圖騰圖] [KIN 資訊]"""
+    seal_idx = (kin_num - 1) % 20 + 1
+    tone_idx = (kin_num - 1) % 13 + 1
+    
+    # sprite 的一格；未啟用靜態檔時為縮圖 data URI (依顯示寬度縮小並快取；副檔名由 resolve_asset 自動判斷)
+    sprite_tone = assets.sprite_style("tone", tone_idx, assets.TONE_CARD_WIDTH)
+    sprite_seal = assets.sprite_style("seal", seal_idx, assets.SEAL_CARD_WIDTH)
+    uri_seal = None if sprite_seal else assets.data_uri(assets.seal_path(seal_idx), assets.SEAL_CARD_WIDTH)
+    uri_tone = None if sprite_tone else assets.data_uri(assets.tone_path(tone_idx), assets.TONE_CARD_WIDTH)
+    
+    tone_name = TONES_NAME[tone_idx]
+    seal_name = SEALS_NAME[seal_idx]
+    
+    # 樣式設定
+    html = f"""
+    <div style="
+        background-color: {bg_color}; 
+        border: 1px solid #ddd; 
+        border-radius: 8px; 
+        padding: 10px; 
+        text-align: center; 
+        height: 100%;
+        display: flex; 
+        flex-direction: column; 
+        align_items: center;
+        justify_content: center;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    ">
+        <div style="font-size: 12px; font-weight: bold; color: #666; margin-bottom: 5px;">{title}</div>
+    """
+    
+    # 調性圖片
+    if sprite_tone:
+        html += f'<div role="img" aria-label="{tone_name}" style="{sprite_tone} margin: 0 auto 2px;"></div>'
+    elif uri_tone:
+        html += f'<img src="{uri_tone}" style="width: {assets.TONE_CARD_WIDTH}px; margin-bottom: 2px;">'
+    else:
+        html += f"<div style='font-size:12px; color:#555;'>({tone_name}調性)</div>"
+        
+    # 圖騰圖片
+    if sprite_seal:
+        html += f'<div role="img" aria-label="{seal_name}" style="{sprite_seal} border-radius: 5px; margin: 0 auto 5px;"></div>'
+    elif uri_seal:
+        html += f'<img src="{uri_seal}" style="width: {assets.SEAL_CARD_WIDTH}px; border-radius: 5px; margin-bottom: 5px;">'
+    else:
+        html += f"<div style='font-size:12px; color:#555;'>({seal_name}圖騰)</div>"
+        
+    # 文字資訊
+    html += f"""
+        <div style="font-size: 16px; font-weight: bold; color: #333;">KIN {kin_num}</div>
+        <div style="font-size: 12px; color: #666;">{tone_name}調性 {seal_name}</div>
+    </div>
+    """
+    return html
+
+
+@_cached
+def oracle_cross_html(kin_num):
+    """五大神諭十字佈陣 (指引在上、挑戰 / 主印記 / 支持在中、隱藏在下)"""
+    kins = dict(zip(ORACLE_ORDER, kin_engine.oracle_kins(kin_num)))
+    cells = [f'<div style="grid-row: {r}; grid-column: {c};">{_compact(kin_card_html(title, kins[key], CROSS_COLORS[key]))}</div>'
+             for key, title, (r, c) in CROSS_LAYOUT]
+    return f'<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; margin-bottom: 16px;">{"".join(cells)}</div>'
+
+
+@_cached
+def wavespell_html(kin_num, highlight=None):
+    """13 天波符路徑；highlight (預設為 kin_num 本身) 那一天加上金色外框"""
+    from synchronotron.core import get_wavespell_data
+    highlight = kin_num if highlight is None else highlight
+    ws_data = get_wavespell_data(kin_num)
+    rows = []
+    for w in ws_data:
+        hl = "border: 2px solid #FFD700; background: #FFFBE6;" if w['KIN'] == highlight else "border: 1px solid #eee;"
+        sprite = assets.sprite_style("seal", (w['KIN'] - 1) % 20 + 1, assets.WAVESPELL_THUMB_WIDTH)
+        uri = None if sprite else assets.data_uri(w['Image'], assets.WAVESPELL_THUMB_WIDTH)
+        img = (f'<div role="img" aria-label="{w["SealName"]}" style="{sprite} flex: none;"></div>' if sprite else
+               f'<img src="{uri}" style="width: {assets.WAVESPELL_THUMB_WIDTH}px; flex: none;">' if uri else "")
+        rows.append(
+            f'<div style="display: flex; align-items: center; gap: 12px; margin-bottom: 5px;">{img}'
+            f'<div style="{hl} padding: 8px; border-radius: 5px; flex: 1;">'
+            f"<b style='color:#D4AF37'>調性 {w['Tone']} ({w['ToneName']})：{w['Question']}</b><br>"
+            f"<span style='font-size:14px; color:#555;'>KIN {w['KIN']} {w['FullName']}</span></div></div>")
+    wave_name = ws_data[0]['SealName'] + "波符"
+    return (f"<h3>🌊 {wave_name} 波符旅程</h3>"
+            f'<details style="border: 1px solid #ddd; border-radius: 8px; padding: 8px 12px;">'
+            f"<summary style='cursor: pointer;'>查看完整 13 天波符路徑</summary>"
+            f'<div style="margin-top: 8px;">{"".join(rows)}</div></details>')
+
+
+@_cached
+def analysis_html(kin_num, highlight=None):
+    """完整分析區塊：神諭十字 + 分隔線 + 波符路徑，整段交給一次 st.markdown"""
+    return f'{oracle_cross_html(kin_num)}<hr>{wavespell_html(kin_num, highlight)}'
+
+
+def cache_info():
+    """各個 HTML 快取的命中情形 (給效能面板)"""
+    return {fn.__name__: fn.cache_info() for fn in (oracle_cross_html, wavespell_html, analysis_html)}
+
+
+def cache_clear():
+    """切換靜態檔 / data URI 後，已快取的 HTML 要重新產生"""
+    for fn in (oracle_cross_html, wavespell_html, analysis_html): fn.cache_clear()
@@ -0,0 +1,67 @@
+"""反查：找出區間內 KIN (或調性 / 圖騰 / 波符 / 城堡) 符合條件的所有公曆日期
+
+每年 1/1 的起始 KIN 已知 (kin_engine.start_kin)，平年第 doy 天的 KIN 為 (起始 + doy) % 260 + 1，
+所以某 KIN 在一年中只會出現在 doy ≡ KIN - 1 - 起始 (mod 260) 的一或兩天；
+2/29 與 3/1 同一個 KIN，3/1 符合時一併加入 2/29。
+計算量只和 年數 × 符合的 KIN 數 成正比 (≈ 結果筆數)，不逐日掃描。
+
+    find_dates("2026-01-01", "2026-12-31", kin=164)
+    find_dates(start, end, tone=8, seal=4)       # 條件同時成立
+    next_date(164, "2026-10-18")                 # 下一次銀河回歸
+"""
+import numpy as np
+
+from synchronotron import kin_engine
+
+ALL_KINS = np.arange(1, 261, dtype=np.int16)
+FEB29_DOY = kin_engine.MONTH_DOY[3]  # 平年 3/1 的 doy (0 起算)，2/29 與它同 KIN
+
+
+def kins_matching(kin=None, tone=None, seal=None, wavespell=None, castle=None):
+    """符合所有條件的 KIN (遞增)；每個條件可為單一值或多個值"""
+    k = ALL_KINS
+    mask = np.ones(260, dtype=bool)
+    for values, attr in ((kin, k), (tone, (k - 1) % 13 + 1), (seal, (k - 1) % 20 + 1),
+                         (wavespell, (k - 1) // 13 + 1), (castle, (k - 1) // 52 + 1)):
+        if values is None: continue
+        mask &= np.isin(attr, np.atleast_1d(values))
+    return k[mask]
+
+
+def _is_leap(years):
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def dates_for_kins(kins, start, end):
+    """[start, end] 內 KIN 屬於 kins 的所有日期 (datetime64[D]，遞增)"""
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    kins = np.atleast_1d(np.asarray(kins, dtype=np.int64))
+    if end < start or not len(kins): return np.zeros(0, dtype="datetime64[D]")
+    y0, y1 = (np.array([start, end]).astype("datetime64[Y]").astype(np.int64) + 1970)
+    years = np.arange(y0, y1 + 1)
+    base = (kin_engine.EPOCH_START_KIN + kin_engine.YEAR_STEP * (years - kin_engine.EPOCH_YEAR)) % 260
+    first = (kins[None, :] - 1 - base[:, None]) % 260          # (年, KIN) 第一次出現的 doy
+    doy = np.stack([first, first + 260], axis=-1)                # 一年 365 天，最多出現兩次
+    year_grid = np.broadcast_to(years[:, None, None], doy.shape)
+    leap = _is_leap(year_grid)
+    ok = doy < 365
+    jan1 = (year_grid - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+    dates = jan1 + doy + (leap & (doy >= FEB29_DOY))
+    extra = jan1[ok & leap & (doy == FEB29_DOY)] + FEB29_DOY    # 2/29
+    out = np.concatenate([dates[ok], extra])
+    out = out[(out >= start) & (out <= end)]
+    out.sort()
+    return out
+
+
+def find_dates(start, end, **conditions):
+    """[start, end] 內符合條件 (kin / tone / seal / wavespell / castle) 的日期"""
+    return dates_for_kins(kins_matching(**conditions), start, end)
+
+
+def next_date(kin, after, inclusive=False):
+    """after 之後 (inclusive=True 含當天) 第一個 KIN 為 kin 的日期；260 天內必定出現"""
+    after = np.datetime64(after, "D")
+    start = after if inclusive else after + 1
+    found = dates_for_kins([kin], start, start + 261)
+    return found[0] if len(found) else None
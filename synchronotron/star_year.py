@@ -0,0 +1,205 @@
+"""星際年與 52 年流年：年份 → 星際年標籤、年度印記 (年度持有者)、PSI 流月 KIN、52 年週期的城堡位置
+
+data/星際年.csv (Big5) 涵蓋 BS 1.0 (-3318) 至 NS 3.51 (2142)，載入後依年份排成陣列，查詢為 O(1)；
+表外的年份以同一套算術推算：年度印記是該年 7/26 的 KIN (每年 +105)，PSI 流月 KIN 每年 +13，
+52 年一輪、51 輪一個紀元 (BS → S → NS)。
+CSV 的「起始年」沒有西元 0 年 (-1 之後是 1)，內部一律換成天文年 (西元前 n 年 = 1 - n)。
+
+個人 52 年流年 (data/52流年印記.csv 是 1994/8/10 出生者的範例)：第 n 歲的流年 KIN 為 出生年 + n 年生日的 KIN，
+諧波、卦象與說明依 KIN 所屬的諧波查銀河易經編碼 (db['harmonic_map'])；每 13 年換一座城堡。
+
+    years = db['star_years']
+    years.year(2026)                    # StarYear(label='NS 1.39', kin=..., bearer=..., ...)
+    years.flow_year(birth, ref_date)    # (流年起始年, 流年 KIN)
+    life_chart(birth, db)               # 0-51 歲的流年表 (欄位同 52流年印記.csv)
+    life_chart_kins(birth_dates, 52)    # 多人 × 52 年的流年 KIN 矩陣
+
+自我檢查：python -m synchronotron.star_year --self-check
+"""
+import datetime
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from synchronotron import kin_engine
+from synchronotron.constants import CASTLES_INFO, SEALS_NAME, TONES_NAME
+
+ERAS = ("BS", "S", "NS")
+CYCLE_YEARS = 52
+ERA_CYCLES = 51
+ERA_YEARS = CYCLE_YEARS * ERA_CYCLES
+NS_START = 1987                                  # NS 1.0
+EPOCH_YEAR = NS_START - ERA_YEARS * (len(ERAS) - 1)  # BS 1.0 (天文年 -3317)
+PSI_EPOCH_KIN = 131                              # NS 1.0 的 PSI 流月 KIN
+PSI_STEP = 13
+NEW_YEAR_ACCUM = kin_engine.MONTH_ACCUM[7] + 25  # 7/26
+# 52 年週期每 13 年一座城堡 (紅 → 白 → 藍 → 黃)
+CYCLE_CASTLES = tuple(CASTLES_INFO)[:4]
+LIFE_CHART_COLUMNS = ["歲數", "起始年", "調性數字", "調性", "圖騰數字", "圖騰", "對應KIN", "主印記", "波符加印記",
+                      "起始日期", "結束日期", "城堡", "諧波", "對應卦象", "主題", "說明"]
+
+StarYear = namedtuple("StarYear", "year label kin tone seal bearer psi_kin era cycle cycle_year castle")
+
+
+def astronomical_year(csv_year):
+    """CSV 的年份 (無西元 0 年) → 天文年"""
+    y = np.asarray(csv_year)
+    return np.where(y < 0, y + 1, y)
+
+
+def year_kins(years):
+    """13 月亮年 (years 年 7/26 起) 的年度印記 KIN；可為任意整數陣列"""
+    start = (kin_engine.EPOCH_START_KIN + kin_engine.YEAR_STEP * (np.asarray(years, dtype=np.int64) - kin_engine.EPOCH_YEAR)) % 260
+    return ((start + NEW_YEAR_ACCUM) % 260 + 1).astype(np.int16)
+
+
+def psi_kins(years):
+    return ((PSI_EPOCH_KIN - 1 + PSI_STEP * (np.asarray(years, dtype=np.int64) - NS_START)) % 260 + 1).astype(np.int16)
+
+
+def cycle_position(years):
+    """(紀元索引, 第幾輪 1-51, 輪內第幾年 0-51)；紀元索引 0-2 對應 BS / S / NS，超出時為其他整數"""
+    offset = np.asarray(years, dtype=np.int64) - EPOCH_YEAR
+    return offset // ERA_YEARS, offset % ERA_YEARS // CYCLE_YEARS + 1, offset % CYCLE_YEARS
+
+
+def year_label(year):
+    era, cycle, cycle_year = (int(v) for v in cycle_position(year))
+    if not 0 <= era < len(ERAS): return ""
+    return f"{ERAS[era]} {cycle}.{cycle_year}"
+
+
+class StarYearTable:
+    """以天文年索引的星際年陣列；表外年份改用算術 (標籤只在 BS / S / NS 三個紀元內)"""
+
+    def __init__(self, first_year, kins, psi, labels):
+        self.first_year = int(first_year)
+        self.kins = np.asarray(kins, dtype=np.int16)
+        self.psi = np.asarray(psi, dtype=np.int16)
+        self.labels = tuple(labels)
+
+    @classmethod
+    def from_frame(cls, df):
+        if df is None or df.empty: return cls(0, [], [], [])
+        df = df.assign(_year=astronomical_year(df['起始年'].to_numpy())).sort_values('_year')
+        years = df['_year'].to_numpy()
+        if (np.diff(years) != 1).any(): raise ValueError("星際年.csv 的年份不連續")
+        return cls(years[0], df['對應KIN'].to_numpy(), df['PSI流月KIN'].to_numpy(), df['對應星際年'].tolist())
+
+    def __len__(self):
+        return len(self.kins)
+
+    @property
+    def years(self):
+        return np.arange(self.first_year, self.first_year + len(self.kins))
+
+    def __contains__(self, year):
+        return 0 <= year - self.first_year < len(self.kins)
+
+    def year(self, year):
+        """該年 7/26 起的星際年；year 為天文年"""
+        i = year - self.first_year
+        if 0 <= i < len(self.kins): kin, psi, label = int(self.kins[i]), int(self.psi[i]), self.labels[i]
+        else: kin, psi, label = int(year_kins(year)), int(psi_kins(year)), year_label(year)
+        era, cycle, cycle_year = (int(v) for v in cycle_position(year))
+        seal = kin_engine.seal_of(kin)
+        return StarYear(year, label, kin, kin_engine.tone_of(kin), seal, SEALS_NAME[seal], psi,
+                        ERAS[era] if 0 <= era < len(ERAS) else "", cycle, cycle_year,
+                        CYCLE_CASTLES[cycle_year // 13])
+
+    def of_date(self, date_obj):
+        return self.year(kin_engine.moon_year_of(date_obj))
+
+    def range_kins(self, start, end):
+        """[start, end] 每一年的年度印記 KIN (表內為切片，表外以算術補齊)"""
+        years = np.arange(start, end + 1)
+        out = year_kins(years)
+        lo, hi = max(start, self.first_year), min(end, self.first_year + len(self.kins) - 1)
+        if lo <= hi: out[lo - start:hi - start + 1] = self.kins[lo - self.first_year:hi - self.first_year + 1]
+        return out
+
+    def flow_year(self, birth_date, ref_date=None):
+        return flow_year(birth_date, ref_date)
+
+
+flow_year = kin_engine.flow_year
+
+
+def life_chart_kins(birth_dates, ages=CYCLE_YEARS):
+    """多人的流年 KIN 矩陣 (人數 × ages)，第 n 欄為 n 歲；birth_dates 為日期序列或 datetime64 陣列"""
+    from synchronotron.batch import kin_array, split_dates
+    year, month, day = split_dates(np.asarray(birth_dates, dtype="datetime64[D]"))
+    n = np.arange(ages)
+    return kin_array(year[:, None] + n, month[:, None], day[:, None])
+
+
+def _birthday(year, birth_date):
+    if birth_date.month == 2 and birth_date.day == 29 and not kin_engine.is_leap_year(year):
+        return datetime.date(year, 3, 1)
+    return datetime.date(year, birth_date.month, birth_date.day)
+
+
+def life_chart(birth_date, db=None, ages=CYCLE_YEARS):
+    """個人 0 至 ages-1 歲的流年表 (DataFrame)，欄位同 data/52流年印記.csv，另加 52 年週期的城堡"""
+    import pandas as pd
+    kins = life_chart_kins([birth_date], ages)[0].astype(np.int64)
+    tones, seals = (kins - 1) % 13 + 1, (kins - 1) % 20 + 1
+    tone_names, seal_names = np.array(TONES_NAME)[tones], np.array(SEALS_NAME)[seals]
+    wavespells = np.array(SEALS_NAME)[(kins - tones) % 20 + 1]
+    starts = [_birthday(birth_date.year + n, birth_date) for n in range(ages + 1)]
+    harmonics = db['harmonic_map'] if db is not None else {}
+    texts = [harmonics.get((k - 1) // 4 + 1, {}) for k in kins]
+    main = np.char.add(tone_names, seal_names)
+    labels = np.char.add(np.char.add(wavespells, "波符"), main)
+    if db is not None and db['kin_index'] is not None:
+        # 印記名稱以 kin_basic_info.csv 為準 (第 7 調性為「共振」)
+        details = [db['kin_index'].details(int(k)) for k in kins]
+        main, labels = [d['主印記'] for d in details], [d['波符加印記'] for d in details]
+    return pd.DataFrame({
+        "歲數": np.arange(ages), "起始年": birth_date.year + np.arange(ages),
+        "調性數字": tones, "調性": tone_names, "圖騰數字": seals, "圖騰": seal_names,
+        "對應KIN": kins, "主印記": main, "波符加印記": labels,
+        "起始日期": [d.strftime("%Y/%m/%d") for d in starts[:-1]],
+        "結束日期": [(d - datetime.timedelta(days=1)).strftime("%Y/%m/%d") for d in starts[1:]],
+        "城堡": [CYCLE_CASTLES[n % CYCLE_YEARS // 13] for n in range(ages)],
+        "諧波": [t.get('諧波') for t in texts], "對應卦象": [t.get('卦象') for t in texts],
+        "主題": [t.get('意涵') for t in texts], "說明": [t.get('說明') for t in texts],
+    }, columns=LIFE_CHART_COLUMNS)
+
+
+# ==========================================
+# 自我檢查：算術與兩份 CSV 逐列比對
+# ==========================================
+def self_check(data_dir=kin_engine.DATA_DIR):
+    from synchronotron.csvio import read_csv
+    from synchronotron.data import DataRegistry
+    mismatches = []
+    table = read_csv(os.path.join(data_dir, "星際年.csv"), encoding="big5")
+    years = astronomical_year(table['起始年'].to_numpy())
+    for y, label, kin, psi in zip(years, table['對應星際年'], table['對應KIN'], table['PSI流月KIN']):
+        got = (year_label(y), int(year_kins(y)), int(psi_kins(y)))
+        if got != (label, kin, psi): mismatches.append((f"星際年 {y}", (label, kin, psi), got))
+    sample = read_csv(os.path.join(data_dir, "52流年印記.csv"), encoding="big5")
+    chart = life_chart(datetime.date(int(sample['起始年'][0]), 8, 10), DataRegistry(data_dir), len(sample))
+    for col in ("對應KIN", "調性數字", "圖騰數字", "主印記", "波符加印記", "對應卦象", "主題"):
+        for age, expected, got in zip(sample['歲數'], sample[col], chart[col]):
+            if expected == expected and expected != got: mismatches.append((f"{age} 歲 {col}", expected, got))
+    return len(table) + len(sample), mismatches
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--self-check" not in argv:
+        print(__doc__)
+        return 0
+    checked, mismatches = self_check()
+    for where, expected, got in mismatches[:20]:
+        print(f"✗ {where}: CSV {expected} ≠ 引擎 {got}")
+    print(f"已比對 {checked} 列，不一致 {len(mismatches)} 列")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""MCF/BMU 掃描：多人 × 多日的共時化數據，以分塊方式串流輸出
+
+與 🧠 441 頁面相同的規則 (calculate_synchronotron_data)：
+當日的國曆月日定位時間矩陣座標，出生 KIN 定位空間/卓爾金曆矩陣座標；
+另附當日的 13 月亮日期與七價路徑等離子 (HEPTAD_GATE_INFO)。
+
+    from synchronotron.sweep import synchronotron_sweep
+    for chunk in synchronotron_sweep(["1985-10-24"], ("2025-07-26", "2026-07-25")):
+        ...  # 每塊是結構化陣列，as_frame=True 則為 DataFrame
+
+人數 × 天數很大時可設定 processes=N，以多行程平行計算 (輸出順序不變)。
+"""
+import functools
+
+import numpy as np
+
+from synchronotron.batch import kin_numbers, moon_date_arrays, split_dates
+from synchronotron.constants import HEPTAD_GATE_INFO
+from synchronotron.matrix441 import Matrix441
+
+SWEEP_DTYPE = np.dtype([
+    ("birth_date", "datetime64[D]"), ("date", "datetime64[D]"), ("kin", np.int16),
+    ("moon", np.int8), ("moon_day", np.int8), ("heptad_week", np.int8), ("plasma", "U8"),
+    ("MCF", np.int32), ("BMU", np.int16), ("KIN_EQUIV", np.int16),
+])
+
+# PLASMA_NAMES[第幾個等離子]；0 代表無時間日 / 0.0 Hunab Ku (不在七價週期內)
+PLASMA_NAMES = np.array([""] + [HEPTAD_GATE_INFO[i]["plasma"] for i in range(1, 8)], dtype="U8")
+
+
+@functools.lru_cache(maxsize=1)
+def default_matrix():
+    return Matrix441.from_csv()
+
+
+def to_dates(values):
+    return np.atleast_1d(np.asarray(values, dtype="datetime64[D]"))
+
+
+def date_span(start, end):
+    """含頭含尾的連續日期陣列"""
+    return np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+
+
+def sweep_block(birth_dates, dates, matrix=None):
+    """計算一塊 (出生日 × 日期) 的完整網格，出生日為外層迴圈"""
+    matrix = matrix or default_matrix()
+    birth_dates, dates = to_dates(birth_dates), to_dates(dates)
+    n_people, n_days = len(birth_dates), len(dates)
+    _, month, day = split_dates(dates)
+    moon, moon_day, week = moon_date_arrays(month, day)
+    plasma = PLASMA_NAMES[np.where(moon_day > 0, (moon_day - 1) % 7 + 1, 0)]
+    kins = np.repeat(kin_numbers(birth_dates), n_days)
+    month_g, day_g = np.tile(month, n_people), np.tile(day, n_people)
+    mcf, bmu, kin_equiv = matrix.synchronotron_arrays(month_g, day_g, kins)
+    out = np.empty(n_people * n_days, dtype=SWEEP_DTYPE)
+    out["birth_date"] = np.repeat(birth_dates, n_days)
+    out["date"] = np.tile(dates, n_people)
+    out["kin"] = kins
+    out["moon"] = np.tile(moon, n_people)
+    out["moon_day"] = np.tile(moon_day, n_people)
+    out["heptad_week"] = np.tile(week, n_people)
+    out["plasma"] = np.tile(plasma, n_people)
+    out["MCF"], out["BMU"], out["KIN_EQUIV"] = mcf, bmu, kin_equiv
+    return out
+
+
+def _people_blocks(birth_dates, dates, chunk_size):
+    per_block = max(1, chunk_size // max(len(dates), 1))
+    for i in range(0, len(birth_dates), per_block):
+        yield birth_dates[i:i + per_block]
+
+
+def _worker_block(args):
+    birth_dates, dates = args
+    return sweep_block(birth_dates, dates)
+
+
+def synchronotron_sweep(birth_dates, date_range, chunk_size=100_000, processes=None, as_frame=False):
+    """串流輸出 出生日 × 日期 的 MCF/BMU；date_range 可為 (起, 迄) 或日期陣列
+
+    每塊約 chunk_size 列 (至少一個人的所有日期)。processes > 1 時以 ProcessPoolExecutor 平行計算，
+    最多同時排入 2 × processes 塊並依序輸出；提早關閉產生器會取消尚未開始的區塊。
+    """
+    birth_dates = to_dates(birth_dates)
+    if isinstance(date_range, tuple) and len(date_range) == 2:
+        dates = date_span(*date_range)
+    else:
+        dates = to_dates(date_range)
+    blocks = _people_blocks(birth_dates, dates, chunk_size)
+    if processes and processes > 1:
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=processes)
+        pending = deque()
+        try:
+            for b in blocks:
+                pending.append(pool.submit(_worker_block, (b, dates)))
+                if len(pending) >= 2 * processes: yield _emit(pending.popleft().result(), as_frame)
+            while pending: yield _emit(pending.popleft().result(), as_frame)
+        finally:
+            # 正常結束時佇列已空；提早 close() / 例外時丟掉還沒開始的區塊，不等它們算完
+            pool.shutdown(wait=not pending, cancel_futures=True)
+    else:
+        matrix = default_matrix()
+        for b in blocks:
+            yield _emit(sweep_block(b, dates, matrix), as_frame)
+
+
+def _emit(chunk, as_frame):
+    if not as_frame: return chunk
+    import pandas as pd
+    df = pd.DataFrame(chunk)
+    df["plasma"] = df["plasma"].astype("category")
+    return df
@@ -0,0 +1,102 @@
+"""ContactsRepository 對 FakeSheetBackend 的差異同步"""
+import pandas as pd
+import pytest
+
+from synchronotron.contacts import ContactsConflict, ContactsRepository, FakeSheetBackend
+
+
+def make_repo(rows):
+    fake = FakeSheetBackend(pd.DataFrame(rows, columns=["姓名", "生日", "KIN"]))
+    return fake, ContactsRepository(fake)
+
+
+def names(fake):
+    return [r[0] for r in fake.rows]
+
+
+ROWS = [["A", "2000-01-01", 1], ["B", "2000-01-02", 2], ["C", "2000-01-03", 3], ["D", "2000-01-04", 4]]
+
+
+def test_add_only():
+    fake, repo = make_repo(ROWS)
+    shown = repo.all().loc[[1, 2, 3]]  # 篩選後只顯示 B-D
+    new = pd.DataFrame([{"姓名": "E", "生日": "2000-01-05", "KIN": 5}], index=[0])  # 編輯器新增列的 index 可能與未顯示的列重複
+    assert repo.apply_edits(shown, pd.concat([shown, new])) == (1, 0, 0)
+    assert fake.rows[-1] == ["E", "2000-01-05", 5]
+    assert [c for c in fake.calls if c[0] != "read_all"] == [("append_rows", 1)]
+    assert repo.all()["姓名"].tolist() == ["A", "B", "C", "D", "E"]
+
+
+def test_update_only():
+    fake, repo = make_repo(ROWS)
+    shown = repo.all()
+    edited = shown.copy()
+    edited.loc[1, "KIN"] = 99
+    assert repo.apply_edits(shown, edited) == (0, 1, 0)
+    assert fake.rows[1] == ["B", "2000-01-02", 99]
+    assert [c for c in fake.calls if c[0] != "read_all"] == [("update_rows", 1)]
+
+
+def test_delete_only():
+    fake, repo = make_repo(ROWS)
+    shown = repo.all()
+    assert repo.apply_edits(shown, shown.drop(index=[0, 2])) == (0, 0, 2)
+    assert names(fake) == ["B", "D"]
+    assert repo.all().index.tolist() == [0, 1]  # 與試算表一樣往上移
+
+
+def test_blank_row_in_middle_keeps_sheet_positions():
+    fake, repo = make_repo([["A", "2000-01-01", 1], ["", "", ""], ["B", "2000-01-02", 2]])
+    shown = repo.all()
+    assert shown.index.tolist() == [0, 2]
+    edited = shown.copy()
+    edited.loc[2, "KIN"] = 99
+    repo.apply_edits(shown, edited)
+    assert fake.rows == [["A", "2000-01-01", 1], ["", "", ""], ["B", "2000-01-02", 99]]
+
+    shown = repo.all()
+    repo.apply_edits(shown, shown.drop(index=[0]))
+    assert fake.rows == [["", "", ""], ["B", "2000-01-02", 99]]
+    assert repo.all().index.tolist() == [1]
+
+    shown = repo.all()
+    repo.apply_edits(shown, pd.concat([shown, pd.DataFrame([{"姓名": "C", "生日": "2000-01-03", "KIN": 3}], index=[0])]))
+    assert fake.rows == [["", "", ""], ["B", "2000-01-02", 99], ["C", "2000-01-03", 3]]
+    repo.invalidate()
+    assert repo.all().index.tolist() == [1, 2]
+
+
+def test_rows_shifted_by_another_writer_are_located_by_key():
+    fake, repo = make_repo(ROWS)
+    shown = repo.all()
+    del fake.rows[0]  # 其他人刪掉 A
+    edited = shown.drop(index=[2]).copy()
+    edited.loc[1, "姓名"] = "B2"
+    assert repo.apply_edits(shown, edited) == (0, 1, 1)
+    assert names(fake) == ["B2", "D"]
+    assert repo.all()["姓名"].tolist() == ["B2", "D"]
+
+
+def test_concurrent_edit_raises_conflict_and_writes_nothing():
+    fake, repo = make_repo(ROWS)
+    shown = repo.all()
+    fake.rows[2] = ["C2", "2000-01-03", 3]  # 其他人改了 C
+    edited = shown.drop(index=[2]).copy()
+    edited.loc[1, "KIN"] = 99
+    with pytest.raises(ContactsConflict):
+        repo.apply_edits(shown, edited)
+    assert fake.rows == [ROWS[0], ROWS[1], ["C2", "2000-01-03", 3], ROWS[3]]
+    assert fake.rows_sent == 0
+    assert repo.all()["姓名"].tolist() == ["A", "B", "C2", "D"]
+
+
+def test_rows_sent_counts_only_changed_rows():
+    fake, repo = make_repo(ROWS)
+    shown = repo.all()
+    edited = shown.drop(index=[3]).copy()
+    edited.loc[0, "KIN"] = 11
+    new = pd.DataFrame([{"姓名": "E", "生日": "2000-01-05", "KIN": 5}], index=[10])
+    assert repo.apply_edits(shown, pd.concat([edited, new])) == (1, 1, 1)
+    assert fake.rows_sent == repo.rows_sent == 2  # 1 修改 + 1 新增；刪除不送出列內容
+    assert repo.apply_edits(repo.all(), repo.all()) == (0, 0, 0)
+    assert fake.rows_sent == 2
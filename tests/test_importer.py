@@ -0,0 +1,34 @@
+"""通訊錄 CSV 匯入：編碼判斷與分塊寫入"""
+import io
+
+import pytest
+
+from synchronotron.contacts import ContactsRepository, FakeSheetBackend
+from synchronotron.importer import detect_encoding, import_contacts
+
+
+def csv_bytes(names, encoding):
+    lines = ["姓名,生日"] + [f"{n},1990-01-{i % 28 + 1:02d}" for i, n in enumerate(names)]
+    return ("\n".join(lines) + "\n").encode(encoding)
+
+
+def test_big5_only_in_a_later_chunk_is_detected_before_writing():
+    # 前 50 列是 ASCII (UTF-8 / Big5 都能解)，最後一列才有 Big5 中文
+    data = csv_bytes([f"p{i}" for i in range(50)] + ["王小明"], "big5")
+    fake = FakeSheetBackend()
+    report = import_contacts(io.BytesIO(data), ContactsRepository(fake), chunk_size=10)
+    assert report.added == 51
+    assert fake.rows[-1][0] == "王小明"
+
+
+def test_undecodable_upload_writes_nothing():
+    data = csv_bytes([f"p{i}" for i in range(50)], "utf-8") + b"\xff\xfe\xff,1990-01-01\n"
+    fake = FakeSheetBackend()
+    with pytest.raises(UnicodeDecodeError):
+        import_contacts(io.BytesIO(data), ContactsRepository(fake), chunk_size=10)
+    assert fake.rows == [] and fake.rows_sent == 0
+
+
+def test_detect_encoding_prefers_utf8():
+    assert detect_encoding(io.BytesIO(csv_bytes(["王小明"], "utf-8"))) == "utf-8-sig"
+    assert detect_encoding(io.BytesIO(csv_bytes(["王小明"], "big5"))) == "big5"